@@ -0,0 +1,6 @@
+"""Benchmarks for the OceanBase checkpointers.
+
+The benchmarks run against the same local MySQL-compatible server as the test
+suite (see `make start-mysql`). Point them at another server with the
+`BENCH_MYSQL_URI` environment variable.
+"""
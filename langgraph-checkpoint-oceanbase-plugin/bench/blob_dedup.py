@@ -0,0 +1,98 @@
+"""Storage used by the plain and the content-addressed blob layouts.
+
+Replays a chat-like workload: every step appends a message to a growing
+message list and re-saves a few large, mostly unchanged context channels (a
+system prompt, retrieved documents, a tool catalog). The same workload is
+written once per layout and the size of the blob tables is reported.
+
+    python -m bench.blob_dedup --threads 20 --steps 50
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Any
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from bench.utils import next_checkpoint, payload, temporary_database
+from langgraph.checkpoint.oceanbase.pyoceanbase import PyOceanBaseSaver
+
+BLOB_TABLES = ("checkpoint_blobs", "checkpoint_blob_contents")
+
+
+def _replay(saver: PyOceanBaseSaver, threads: int, steps: int) -> None:
+    documents = [payload(32 * 1024) + [str(n)] for n in range(4)]
+    for thread in range(threads):
+        config: Any = {
+            "configurable": {"thread_id": f"thread-{thread}", "checkpoint_ns": ""}
+        }
+        checkpoint = empty_checkpoint()
+        messages: list[str] = []
+        for step in range(steps):
+            messages = [*messages, f"message {step} " + "x" * 200]
+            checkpoint, versions = next_checkpoint(
+                saver,
+                checkpoint,
+                step=step,
+                values={
+                    "messages": messages,
+                    "system": documents[0],
+                    "tools": documents[1],
+                    "context": documents[2 + (step // 10) % 2],
+                },
+            )
+            config = saver.put(config, checkpoint, {"step": step}, versions)
+
+
+def _table_sizes(saver: PyOceanBaseSaver) -> dict[str, int]:
+    with saver._cursor() as cur:
+        cur.execute("ANALYZE TABLE " + ", ".join(BLOB_TABLES))
+        cur.fetchall()
+        cur.execute(
+            "SELECT table_name AS name, data_length + index_length AS size "
+            "FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name IN (%s, %s)",
+            BLOB_TABLES,
+        )
+        return {row["name"]: int(row["size"]) for row in cur.fetchall()}
+
+
+def _payload_bytes(saver: PyOceanBaseSaver) -> int:
+    with saver._cursor() as cur:
+        cur.execute(
+            "SELECT (SELECT coalesce(sum(length(`blob`)), 0) FROM checkpoint_blobs)"
+            " + (SELECT coalesce(sum(length(`blob`)), 0)"
+            " FROM checkpoint_blob_contents) AS n"
+        )
+        row = cur.fetchone()
+    return int(row["n"]) if row else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=20)
+    parser.add_argument("--steps", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'layout':>18} {'payload MiB':>12} {'on disk MiB':>12}")
+    results = {}
+    for dedup in (False, True):
+        with temporary_database() as uri:
+            with PyOceanBaseSaver.from_conn_string(
+                uri, content_addressed_blobs=dedup
+            ) as saver:
+                saver.setup()
+                _replay(saver, args.threads, args.steps)
+                stored = _payload_bytes(saver)
+                on_disk = sum(_table_sizes(saver).values())
+        layout = "content-addressed" if dedup else "plain"
+        results[layout] = stored
+        print(f"{layout:>18} {stored / 2**20:>12.1f} {on_disk / 2**20:>12.1f}")
+    print(
+        f"saved {1 - results['content-addressed'] / results['plain']:.0%} of blob bytes"
+    )
+
+
+if __name__ == "__main__":
+    main()
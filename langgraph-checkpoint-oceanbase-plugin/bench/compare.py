@@ -0,0 +1,62 @@
+"""Compare two `bench.suite` result files and report regressions.
+
+Results are matched by saver, workload shape and operation. A case regresses
+when its p50 latency in the new run exceeds the baseline by more than
+`--threshold`; the command then exits with status 1.
+
+    python -m bench.compare bench-results/base.json bench-results/head.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections.abc import Sequence
+from typing import Any
+
+KEY_FIELDS = ("saver", "channels", "blob_size", "depth", "concurrency", "operation")
+
+
+def _load(path: str) -> dict[tuple[Any, ...], dict[str, Any]]:
+    with open(path) as f:
+        report = json.load(f)
+    return {
+        tuple(result[field] for field in KEY_FIELDS): result
+        for result in report["results"]
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    base, head = _load(args.base), _load(args.head)
+    regressions = 0
+    print(
+        f"{'saver':>12} {'ch':>3} {'blob':>7} {'depth':>5} {'conc':>4}"
+        f" {'operation':>16} {'base ms':>9} {'head ms':>9} {'change':>8}"
+    )
+    for key in sorted(base.keys() & head.keys()):
+        before, after = base[key]["p50_ms"], head[key]["p50_ms"]
+        change = after / before - 1 if before else 0.0
+        regressed = change > args.threshold
+        regressions += regressed
+        saver, channels, blob_size, depth, concurrency, operation = key
+        print(
+            f"{saver:>12} {channels:>3} {blob_size:>7} {depth:>5} {concurrency:>4}"
+            f" {operation:>16} {before:>9.2f} {after:>9.2f} {change:>+8.1%}"
+            + ("  REGRESSION" if regressed else "")
+        )
+    if missing := base.keys() ^ head.keys():
+        print(f"{len(missing)} cases only ran in one of the two files", file=sys.stderr)
+    if regressions:
+        print(f"{regressions} cases regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Storage, network and latency cost of the blob compression codecs.
+
+For every codec a thread is replayed with a growing message-history channel.
+The benchmark reports the bytes stored in the blob tables, the bytes sent to
+and received from the server, and `put` / `get_tuple` latency.
+
+    python -m bench.compression --codecs none zlib lzma zstd --steps 100
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Any
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from bench.utils import Timer, next_checkpoint, temporary_database
+from langgraph.checkpoint.oceanbase.pyoceanbase import PyOceanBaseSaver
+from langgraph.checkpoint.oceanbase.serde import CompressedSerializer
+
+
+def _status(saver: PyOceanBaseSaver, name: str) -> int:
+    with saver.conn.cursor() as cur:
+        cur.execute(f"SHOW SESSION STATUS LIKE '{name}'")
+        row = cur.fetchone()
+    return int(row[1]) if row else 0
+
+
+def _stored_bytes(saver: PyOceanBaseSaver) -> int:
+    with saver._cursor() as cur:
+        cur.execute(
+            "SELECT (SELECT coalesce(sum(length(`blob`)), 0) FROM checkpoint_blobs)"
+            " + (SELECT coalesce(sum(length(`blob`)), 0) FROM checkpoint_writes)"
+            " AS n"
+        )
+        row = cur.fetchone()
+    return int(row["n"]) if row else 0
+
+
+def run(uri: str, codec: str, steps: int, message_size: int) -> dict[str, float]:
+    serde = None if codec == "none" else CompressedSerializer(codec)
+    with PyOceanBaseSaver.from_conn_string(uri, serde=serde) as saver:
+        saver.setup()
+        config: Any = {"configurable": {"thread_id": codec, "checkpoint_ns": ""}}
+        checkpoint = empty_checkpoint()
+        messages: list[dict[str, Any]] = []
+        puts, gets = Timer(), Timer()
+        received = _status(saver, "Bytes_received")
+        sent = _status(saver, "Bytes_sent")
+        for step in range(steps):
+            messages = [
+                *messages,
+                {"role": "user", "content": f"step {step} " + "lorem " * message_size},
+            ]
+            checkpoint, versions = next_checkpoint(
+                saver, checkpoint, step=step, values={"messages": messages}
+            )
+            with puts.measure():
+                config = saver.put(config, checkpoint, {"step": step}, versions)
+            saver.put_writes(config, [("messages", messages[-1:])], "task")
+            with gets.measure():
+                saver.get_tuple(config)
+        return {
+            "stored": _stored_bytes(saver),
+            "received": _status(saver, "Bytes_received") - received,
+            "sent": _status(saver, "Bytes_sent") - sent,
+            "put": puts.percentile(0.5),
+            "get": gets.percentile(0.5),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--codecs", nargs="+", default=["none", "zlib", "lzma", "zstd", "lz4"]
+    )
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--message-size", type=int, default=200)
+    args = parser.parse_args()
+
+    print(
+        f"{'codec':>6} {'stored MiB':>11} {'up MiB':>8} {'down MiB':>9}"
+        f" {'put p50 ms':>11} {'get p50 ms':>11}"
+    )
+    for codec in args.codecs:
+        with temporary_database() as uri:
+            try:
+                result = run(uri, codec, args.steps, args.message_size)
+            except ImportError as exc:
+                print(f"{codec:>6} skipped: {exc}")
+                continue
+        print(
+            f"{codec:>6} {result['stored'] / 2**20:>11.2f}"
+            f" {result['received'] / 2**20:>8.2f} {result['sent'] / 2**20:>9.2f}"
+            f" {result['put'] * 1e3:>11.2f} {result['get'] * 1e3:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
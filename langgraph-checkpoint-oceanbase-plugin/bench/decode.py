@@ -0,0 +1,121 @@
+"""Latency of listing histories of multi-megabyte channels with parallel decoding.
+
+A thread is filled with `--depth` checkpoints whose `--channels` message-list
+channels each serialize to about `--blob-size` bytes. The whole history is
+then listed without a `decode_executor`, on a thread pool and on a process
+pool of `--workers` workers.
+
+The async saver lists the same history while a ticker task measures how late
+the event loop wakes it up, which shows how long deserialization blocks it.
+
+    python -m bench.decode --depth 20 --blob-size 4194304 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Any
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from bench.utils import Timer, next_checkpoint, payload, temporary_database
+from langgraph.checkpoint.oceanbase.aio import AIOMySQLSaver
+from langgraph.checkpoint.oceanbase.pyoceanbase import PyOceanBaseSaver
+
+CONFIG: Any = {"configurable": {"thread_id": "bench", "checkpoint_ns": ""}}
+
+
+def _fill(saver: PyOceanBaseSaver, depth: int, channels: int, blob_size: int) -> None:
+    config = CONFIG
+    checkpoint = empty_checkpoint()
+    for step in range(depth):
+        checkpoint, versions = next_checkpoint(
+            saver,
+            checkpoint,
+            step=step,
+            values={f"channel_{n}": payload(blob_size) for n in range(channels)},
+        )
+        config = saver.put(config, checkpoint, {"step": step}, versions)
+
+
+def _executors(workers: int) -> dict[str, Callable[[], Any]]:
+    return {
+        "serial": nullcontext,
+        "threads": lambda: ThreadPoolExecutor(max_workers=workers),
+        "processes": lambda: ProcessPoolExecutor(max_workers=workers),
+    }
+
+
+async def _alist(
+    uri: str, executor: Executor | None, repeat: int
+) -> tuple[Timer, float]:
+    """List the history `repeat` times, returning the list latencies and the
+    worst event loop lag observed meanwhile."""
+    lag = 0.0
+    done = False
+
+    async def ticker() -> None:
+        nonlocal lag
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lag = max(lag, time.perf_counter() - start - 0.001)
+
+    timer = Timer()
+    async with AIOMySQLSaver.from_conn_string(uri, decode_executor=executor) as saver:
+        task = asyncio.create_task(ticker())
+        for _ in range(repeat):
+            with timer.measure():
+                async for _ in saver.alist(CONFIG):
+                    pass
+        done = True
+        await task
+    return timer, lag
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=20)
+    parser.add_argument("--channels", type=int, default=2)
+    parser.add_argument("--blob-size", type=int, default=4 * 1024 * 1024)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with temporary_database() as uri:
+        with PyOceanBaseSaver.from_conn_string(uri) as saver:
+            saver.setup()
+            _fill(saver, args.depth, args.channels, args.blob_size)
+
+        print(
+            f"{'saver':>6} {'executor':>10} {'p50 ms':>9} {'p99 ms':>9}"
+            f" {'max loop lag ms':>16}"
+        )
+        for name, make_executor in _executors(args.workers).items():
+            with make_executor() as executor:
+                timer = Timer()
+                with PyOceanBaseSaver.from_conn_string(
+                    uri, decode_executor=executor
+                ) as saver:
+                    for _ in range(args.repeat):
+                        with timer.measure():
+                            for _ in saver.list(CONFIG):
+                                pass
+                print(
+                    f"{'sync':>6} {name:>10} {timer.percentile(0.5) * 1e3:>9.1f}"
+                    f" {timer.percentile(0.99) * 1e3:>9.1f} {'':>16}"
+                )
+                timer, lag = asyncio.run(_alist(uri, executor, args.repeat))
+                print(
+                    f"{'async':>6} {name:>10} {timer.percentile(0.5) * 1e3:>9.1f}"
+                    f" {timer.percentile(0.99) * 1e3:>9.1f} {lag * 1e3:>16.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Latency of reading the latest checkpoint of many threads at once.
+
+`--threads` threads are filled with `--depth` checkpoints each. The latest
+checkpoint of the first N of them, for every N in `--batch`, is then read by N
+sequential `get_tuple` calls and by a single `get_tuples` call.
+
+    python -m bench.get_tuples --threads 500 --batch 10 100 500
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Any
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from bench.utils import Timer, next_checkpoint, payload, temporary_database
+from langgraph.checkpoint.oceanbase.pyoceanbase import PyOceanBaseSaver
+
+
+def _config(thread: int) -> Any:
+    return {"configurable": {"thread_id": f"thread-{thread}", "checkpoint_ns": ""}}
+
+
+def _fill(saver: PyOceanBaseSaver, threads: int, depth: int, blob_size: int) -> None:
+    for thread in range(threads):
+        config = _config(thread)
+        checkpoint = empty_checkpoint()
+        for step in range(depth):
+            checkpoint, versions = next_checkpoint(
+                saver, checkpoint, step=step, values={"messages": payload(blob_size)}
+            )
+            config = saver.put(config, checkpoint, {"step": step}, versions)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=500)
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--blob-size", type=int, default=1024)
+    parser.add_argument("--batch", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with temporary_database() as uri:
+        with PyOceanBaseSaver.from_conn_string(uri) as saver:
+            saver.setup()
+            _fill(saver, args.threads, args.depth, args.blob_size)
+
+            print(f"{'batch':>6} {'method':>10} {'p50 ms':>9} {'p99 ms':>9}")
+            for batch in args.batch:
+                configs = [_config(thread) for thread in range(batch)]
+                sequential, batched = Timer(), Timer()
+                for _ in range(args.repeat):
+                    with sequential.measure():
+                        expected = [saver.get_tuple(config) for config in configs]
+                    with batched.measure():
+                        assert saver.get_tuples(configs) == expected
+                for name, timer in (("get_tuple", sequential), ("get_tuples", batched)):
+                    print(
+                        f"{batch:>6} {name:>10} {timer.percentile(0.5) * 1e3:>9.2f}"
+                        f" {timer.percentile(0.99) * 1e3:>9.2f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Latency of the JSON codecs on the documents the savers and stores encode.
+
+Every codec encodes and decodes, `--repeat` times each:
+
+- a checkpoint of `--channels` channels, with the versions seen by as many
+  tasks, like `put` stores and every read parses;
+- checkpoint metadata, like `put` stores and metadata filters send;
+- the channel values and pending writes a read aggregates with
+  `json_arrayagg`, whose blobs are about `--blob-size` bytes, decoded only;
+- a store value of about `--blob-size` bytes.
+
+No database is needed.
+
+    python -m bench.json_codec --channels 8 32 --blob-size 1024 65536
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+from typing import Any
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from bench.utils import Timer, payload
+from langgraph.checkpoint.oceanbase.jsoncodec import (
+    JsonCodec,
+    orjson_codec,
+    stdlib_codec,
+)
+
+
+def _checkpoint(channels: int) -> dict[str, Any]:
+    checkpoint: Any = empty_checkpoint()
+    versions = {f"channel_{n}": f"{n + 1:032}.{0.5:016}" for n in range(channels)}
+    checkpoint["channel_versions"] = versions
+    checkpoint["versions_seen"] = {f"task_{n}": dict(versions) for n in range(channels)}
+    checkpoint.pop("channel_values")
+    return checkpoint
+
+
+def _metadata() -> dict[str, Any]:
+    return {
+        "source": "loop",
+        "step": 42,
+        "parents": {"": "1ef4f797-8335-6428-8001-8a1503f9b875"},
+        "run_id": "1ef4f797-8335-6428-8001-8a1503f9b875",
+        "user_id": "user-1",
+        "tags": ["production", "café"],
+    }
+
+
+def _channel_values(channels: int, blob_size: int) -> str:
+    blob = "base64:type251:" + base64.b64encode(b"x" * blob_size).decode()
+    return stdlib_codec().dumps(
+        [[f"channel_{n}", "msgpack", blob] for n in range(channels)]
+    )
+
+
+def _pending_writes(channels: int, blob_size: int) -> str:
+    blob = "base64:type251:" + base64.b64encode(b"x" * blob_size).decode()
+    return stdlib_codec().dumps(
+        [["task", f"channel_{n}", "msgpack", blob, n] for n in range(channels)]
+    )
+
+
+def _measure(codec: JsonCodec, value: Any, text: str, repeat: int) -> list[Timer]:
+    """Time `dumps` of `value` unless it is None, then `loads` of the encoded
+    value, or of `text`."""
+    timers = []
+    if value is not None:
+        timer = Timer()
+        for _ in range(repeat):
+            with timer.measure():
+                text = codec.dumps(value)
+        timers.append(timer)
+    timer = Timer()
+    for _ in range(repeat):
+        with timer.measure():
+            codec.loads(text)
+    return timers + [timer]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--channels", type=int, nargs="+", default=[8, 32])
+    parser.add_argument("--blob-size", type=int, nargs="+", default=[1024, 65536])
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    codecs: list[JsonCodec] = [stdlib_codec(), orjson_codec()]
+    print(
+        f"{'ch':>3} {'blob':>7} {'document':>15} {'codec':>6}"
+        f" {'dumps p50 us':>13} {'loads p50 us':>13}"
+    )
+    for channels in args.channels:
+        for blob_size in args.blob_size:
+            documents: dict[str, tuple[Any, str]] = {
+                "checkpoint": (_checkpoint(channels), ""),
+                "metadata": (_metadata(), ""),
+                "channel_values": (None, _channel_values(channels, blob_size)),
+                "pending_writes": (None, _pending_writes(channels, blob_size)),
+                "store_value": ({"messages": payload(blob_size)}, ""),
+            }
+            for name, (value, text) in documents.items():
+                for codec in codecs:
+                    *dumps, loads = _measure(codec, value, text, args.repeat)
+                    dumps_us = f"{dumps[0].percentile(0.5) * 1e6:.1f}" if dumps else ""
+                    print(
+                        f"{channels:>3} {blob_size:>7} {name:>15} {codec.name:>6}"
+                        f" {dumps_us:>13} {loads.percentile(0.5) * 1e6:>13.1f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Latency of `get_tuple` without a checkpoint id on deep threads.
+
+A thread is filled with `--depth` checkpoints, then the latest checkpoint is
+read with and without the `checkpoint_heads` pointer table.
+
+    python -m bench.latest_checkpoint --depth 10000 --repeat 200
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Any
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from bench.utils import Timer, next_checkpoint, payload, temporary_database
+from langgraph.checkpoint.oceanbase.pyoceanbase import PyOceanBaseSaver
+
+
+def _fill(saver: PyOceanBaseSaver, depth: int, blob_size: int) -> None:
+    config: Any = {"configurable": {"thread_id": "bench", "checkpoint_ns": ""}}
+    checkpoint = empty_checkpoint()
+    for step in range(depth):
+        checkpoint, versions = next_checkpoint(
+            saver, checkpoint, step=step, values={"messages": payload(blob_size)}
+        )
+        config = saver.put(config, checkpoint, {"step": step}, versions)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=10000)
+    parser.add_argument("--blob-size", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    latest = {"configurable": {"thread_id": "bench", "checkpoint_ns": ""}}
+    with temporary_database() as uri:
+        with PyOceanBaseSaver.from_conn_string(uri, checkpoint_heads=True) as saver:
+            saver.setup()
+            _fill(saver, args.depth, args.blob_size)
+
+        print(f"{'heads':>6} {'p50 ms':>9} {'p99 ms':>9}")
+        for heads in (False, True):
+            with PyOceanBaseSaver.from_conn_string(
+                uri, checkpoint_heads=heads
+            ) as saver:
+                timer = Timer()
+                for _ in range(args.repeat):
+                    with timer.measure():
+                        saver.get_tuple(latest)
+                print(
+                    f"{str(heads):>6} {timer.percentile(0.5) * 1e3:>9.2f}"
+                    f" {timer.percentile(0.99) * 1e3:>9.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""CPU time of listing history with eager and lazy deserialization.
+
+A thread is filled with checkpoints that each carry `--channels` blob channels
+and a few pending writes. Pages of its history are then listed the way a
+history view would, reading only configs and metadata, with and without
+`lazy_load`. The benchmark reports the process CPU time per `list` call, which
+excludes the time spent waiting on the server.
+
+    python -m bench.lazy_load --channels 8 --blob-size 16384
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from bench.utils import next_checkpoint, payload, temporary_database
+from langgraph.checkpoint.oceanbase.pyoceanbase import PyOceanBaseSaver
+
+
+def _fill(saver: PyOceanBaseSaver, depth: int, channels: int, blob_size: int) -> None:
+    config: Any = {"configurable": {"thread_id": "bench", "checkpoint_ns": ""}}
+    checkpoint = empty_checkpoint()
+    for step in range(depth):
+        checkpoint, versions = next_checkpoint(
+            saver,
+            checkpoint,
+            step=step,
+            values={f"channel_{n}": payload(blob_size) for n in range(channels)},
+        )
+        config = saver.put(config, checkpoint, {"step": step}, versions)
+        saver.put_writes(
+            config, [(f"channel_{n}", payload(256)) for n in range(3)], "task"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=200)
+    parser.add_argument("--channels", type=int, default=8)
+    parser.add_argument("--blob-size", type=int, default=16384)
+    parser.add_argument("--page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with temporary_database() as uri:
+        with PyOceanBaseSaver.from_conn_string(uri) as saver:
+            saver.setup()
+            _fill(saver, args.depth, args.channels, args.blob_size)
+
+        config: Any = {"configurable": {"thread_id": "bench", "checkpoint_ns": ""}}
+        print(f"{'mode':>6} {'cpu ms/list':>12} {'wall ms/list':>13}")
+        for lazy in (False, True):
+            with PyOceanBaseSaver.from_conn_string(uri, lazy_load=lazy) as saver:
+                cpu = wall = 0.0
+                for _ in range(args.repeat):
+                    cpu_start, wall_start = time.process_time(), time.perf_counter()
+                    steps = [
+                        saved.metadata["step"]
+                        for saved in saver.list(config, limit=args.page)
+                    ]
+                    cpu += time.process_time() - cpu_start
+                    wall += time.perf_counter() - wall_start
+                    assert len(steps) == min(args.page, args.depth)
+            print(
+                f"{'lazy' if lazy else 'eager':>6} {cpu / args.repeat * 1e3:>12.2f}"
+                f" {wall / args.repeat * 1e3:>13.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Latency of metadata filtered `list` calls with and without indexed keys.
+
+A checkpoints table of `--threads` threads with `--depth` checkpoints each is
+filled directly, every checkpoint carrying a `source`, a `step` and a `run_id`
+shared by the checkpoints of one run. The same filters are then listed without
+`indexed_metadata`, and again after `setup` has added generated columns for
+those keys, both across all threads and within a single thread.
+
+    python -m bench.metadata_filter --threads 1000 --depth 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from bench.utils import Timer, temporary_database
+from langgraph.checkpoint.oceanbase.pyoceanbase import PyOceanBaseSaver
+
+INDEXED_KEYS = ("source", "step", "run_id")
+
+
+def _fill(saver: PyOceanBaseSaver, threads: int, depth: int, run_length: int) -> None:
+    checkpoint = json.dumps(empty_checkpoint())
+    for thread in range(threads):
+        rows = []
+        for step in range(depth):
+            metadata = {
+                "source": "input" if step % run_length == 0 else "loop",
+                "step": step,
+                "run_id": f"run-{thread}-{step // run_length}",
+            }
+            rows.append(
+                (
+                    f"thread-{thread}",
+                    "",
+                    "",
+                    f"{step:08d}",
+                    None,
+                    checkpoint,
+                    json.dumps(metadata),
+                )
+            )
+        with saver._cursor(pipeline=True) as cur:
+            cur.executemany(saver.UPSERT_CHECKPOINTS_SQL, rows)
+
+
+def _measure(
+    saver: PyOceanBaseSaver,
+    config: Any,
+    filter: dict[str, Any],
+    repeat: int,
+) -> Timer:
+    timer = Timer()
+    for _ in range(repeat):
+        with timer.measure():
+            for _ in saver.list(config, filter=filter, limit=100):
+                pass
+    return timer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=1000)
+    parser.add_argument("--depth", type=int, default=200)
+    parser.add_argument("--run-length", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    thread = args.threads // 2
+    queries: list[tuple[str, Any, dict[str, Any]]] = [
+        ("run_id, all threads", None, {"run_id": f"run-{thread}-3"}),
+        ("source, all threads", None, {"source": "input", "step": 0}),
+        (
+            "source, one thread",
+            {"configurable": {"thread_id": f"thread-{thread}", "checkpoint_ns": ""}},
+            {"source": "input"},
+        ),
+    ]
+
+    with temporary_database() as uri:
+        with PyOceanBaseSaver.from_conn_string(uri) as saver:
+            saver.setup()
+            _fill(saver, args.threads, args.depth, args.run_length)
+
+        print(f"{'query':>22} {'indexed':>8} {'p50 ms':>9} {'p99 ms':>9}")
+        for indexed in (False, True):
+            with PyOceanBaseSaver.from_conn_string(
+                uri, indexed_metadata=INDEXED_KEYS if indexed else ()
+            ) as saver:
+                start = time.perf_counter()
+                saver.setup()
+                if indexed:
+                    print(
+                        f"built {len(INDEXED_KEYS)} indexes over"
+                        f" {args.threads * args.depth} checkpoints in"
+                        f" {time.perf_counter() - start:.1f} s"
+                    )
+                for name, config, filter in queries:
+                    timer = _measure(saver, config, filter, args.repeat)
+                    print(
+                        f"{name:>22} {'yes' if indexed else 'no':>8}"
+                        f" {timer.percentile(0.5) * 1e3:>9.2f}"
+                        f" {timer.percentile(0.99) * 1e3:>9.2f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Event loop lag of concurrent graphs saving and reading large checkpoints.
+
+`--graphs` tasks share an `AIOMySQLSaver` over a pool of as many connections.
+Each runs `--steps` steps of `aput` of a checkpoint with a small channel and a
+channel serializing to about `--blob-size` bytes, `aput_writes` of a value as
+large, and `aget_tuple` of the new checkpoint. A ticker task meanwhile measures
+how late the event loop wakes it up.
+
+This runs once for every `offload_threshold` of `--threshold`, with
+serialization on a thread pool of `--workers` workers. 0 offloads everything,
+while a threshold above `--blob-size` (de)serializes everything on the event
+loop.
+
+    python -m bench.offload --graphs 16 --blob-size 1048576 --threshold 0 65536
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any
+
+import aiomysql  # type: ignore
+from langgraph.checkpoint.base import empty_checkpoint
+
+from bench.utils import Timer, next_checkpoint, payload, temporary_database
+from langgraph.checkpoint.oceanbase.aio import AIOMySQLSaver
+
+
+async def _graph(
+    saver: AIOMySQLSaver, thread_id: str, steps: int, blob_size: int, timer: Timer
+) -> None:
+    config: Any = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    checkpoint = empty_checkpoint()
+    for step in range(steps):
+        with timer.measure():
+            checkpoint, versions = next_checkpoint(
+                saver,
+                checkpoint,
+                step=step,
+                values={"step": [step], "messages": payload(blob_size)},
+            )
+            config = await saver.aput(config, checkpoint, {"step": step}, versions)
+            await saver.aput_writes(
+                config, [("messages", payload(blob_size))], f"task-{step}"
+            )
+            assert await saver.aget_tuple(config) is not None
+
+
+async def _setup(uri: str) -> None:
+    async with AIOMySQLSaver.from_conn_string(uri) as saver:
+        await saver.setup()
+
+
+async def _run(
+    uri: str,
+    threshold: int,
+    executor: Executor,
+    graphs: int,
+    steps: int,
+    blob_size: int,
+) -> tuple[Timer, Timer]:
+    """Run the graphs, returning the step latencies and the event loop lags."""
+    steps_timer, lags = Timer(), Timer()
+    done = False
+
+    async def ticker() -> None:
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.samples.append(max(0.0, time.perf_counter() - start - 0.001))
+
+    pool = await aiomysql.create_pool(
+        **AIOMySQLSaver.parse_conn_string(uri), maxsize=graphs, autocommit=True
+    )
+    try:
+        saver = AIOMySQLSaver(
+            pool,
+            encode_executor=executor,
+            decode_executor=executor,
+            offload_threshold=threshold,
+        )
+        task = asyncio.create_task(ticker())
+        await asyncio.gather(
+            *(
+                _graph(saver, f"{threshold}-{n}", steps, blob_size, steps_timer)
+                for n in range(graphs)
+            )
+        )
+        done = True
+        await task
+    finally:
+        pool.close()
+        await pool.wait_closed()
+    return steps_timer, lags
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--graphs", type=int, default=16)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--blob-size", type=int, default=1024 * 1024)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--threshold", type=int, nargs="+", default=[0, 64 * 1024, 1 << 62]
+    )
+    args = parser.parse_args()
+
+    with temporary_database() as uri:
+        asyncio.run(_setup(uri))
+        print(
+            f"{'threshold':>20} {'step p50 ms':>12} {'step p99 ms':>12}"
+            f" {'lag p99 ms':>11} {'max lag ms':>11}"
+        )
+        for threshold in args.threshold:
+            with ThreadPoolExecutor(max_workers=args.workers) as executor:
+                steps, lags = asyncio.run(
+                    _run(
+                        uri,
+                        threshold,
+                        executor,
+                        args.graphs,
+                        args.steps,
+                        args.blob_size,
+                    )
+                )
+            print(
+                f"{threshold:>20} {steps.percentile(0.5) * 1e3:>12.1f}"
+                f" {steps.percentile(0.99) * 1e3:>12.1f}"
+                f" {lags.percentile(0.99) * 1e3:>11.1f}"
+                f" {lags.percentile(1.0) * 1e3:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
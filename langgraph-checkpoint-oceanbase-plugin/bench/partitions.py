@@ -0,0 +1,94 @@
+"""Concurrent thread throughput of PyOceanBaseSaver against partition count.
+
+For every partition count, a fresh database is set up with the checkpoint
+tables hash partitioned by thread_id (0 keeps them unpartitioned). Worker
+threads, each owning a thread_id, then alternate `put`, `put_writes` and
+`get_tuple` through a connection pool. On a multi-node OceanBase cluster the
+partitions spread over several tablet leaders, which is where throughput
+should grow with the partition count.
+
+    python -m bench.partitions --partitions 0 4 16 64 --workers 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from langgraph.checkpoint.base import empty_checkpoint
+from sqlalchemy import create_pool_from_url
+
+from bench.utils import Timer, next_checkpoint, payload, temporary_database
+from langgraph.checkpoint.oceanbase.pyoceanbase import PyOceanBaseSaver
+
+
+def _worker(saver: PyOceanBaseSaver, thread_id: str, ops: int, timer: Timer) -> None:
+    config: Any = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    checkpoint = empty_checkpoint()
+    for step in range(ops):
+        with timer.measure():
+            checkpoint, versions = next_checkpoint(
+                saver, checkpoint, step=step, values={"messages": payload(1024)}
+            )
+            config = saver.put(config, checkpoint, {"step": step}, versions)
+            saver.put_writes(config, [("messages", payload(256))], "task")
+            saver.get_tuple(config)
+
+
+def run(
+    uri: str, partitions: int, workers: int, ops: int, pool_size: int
+) -> tuple[float, Timer]:
+    """Return the achieved operations per second and the per-step latencies."""
+    pool = create_pool_from_url(
+        uri.replace("mysql://", "mysql+pymysql://"),
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+    timer = Timer()
+    try:
+        saver = PyOceanBaseSaver(
+            pool.connect,
+            concurrency="pool",
+            max_inflight=pool_size,
+            partitions=partitions or None,
+        )
+        saver.setup()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_worker, saver, f"thread-{n}", ops, timer)
+                for n in range(workers)
+            ]
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.dispose()
+    return 3 * workers * ops / elapsed, timer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--partitions", type=int, nargs="+", default=[0, 4, 16, 64])
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--ops", type=int, default=100)
+    parser.add_argument("--pool-size", type=int, default=32)
+    args = parser.parse_args()
+
+    print(f"{'partitions':>10} {'ops/s':>10} {'p50 ms':>9} {'p99 ms':>9}")
+    for partitions in args.partitions:
+        with temporary_database() as uri:
+            throughput, timer = run(
+                uri, partitions, args.workers, args.ops, args.pool_size
+            )
+        print(
+            f"{partitions:>10} {throughput:>10.1f}"
+            f" {timer.percentile(0.5) * 1e3:>9.2f}"
+            f" {timer.percentile(0.99) * 1e3:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
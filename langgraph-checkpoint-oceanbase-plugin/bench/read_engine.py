@@ -0,0 +1,100 @@
+"""Compare the "json" and "binary" read engines of PyOceanBaseSaver.
+
+A thread is filled with checkpoints that each carry `--channels` blob channels
+of `--blob-size` bytes plus a few pending writes. Both engines then read the
+latest checkpoint and a page of history. Besides latency, the benchmark reports
+the bytes the server sent for each call (`Bytes_sent` session status).
+
+    python -m bench.read_engine --channels 8 --blob-size 65536
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+from typing import Any
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from bench.utils import Timer, next_checkpoint, payload, temporary_database
+from langgraph.checkpoint.oceanbase.base import ReadEngine
+from langgraph.checkpoint.oceanbase.pyoceanbase import PyOceanBaseSaver
+
+
+def _bytes_sent(saver: PyOceanBaseSaver) -> int:
+    with saver.conn.cursor() as cur:
+        cur.execute("SHOW SESSION STATUS LIKE 'Bytes_sent'")
+        row = cur.fetchone()
+    return int(row[1]) if row else 0
+
+
+def _fill(saver: PyOceanBaseSaver, depth: int, channels: int, blob_size: int) -> Any:
+    config: Any = {"configurable": {"thread_id": "bench", "checkpoint_ns": ""}}
+    checkpoint = empty_checkpoint()
+    for step in range(depth):
+        checkpoint, versions = next_checkpoint(
+            saver,
+            checkpoint,
+            step=step,
+            values={f"channel_{n}": payload(blob_size) for n in range(channels)},
+        )
+        config = saver.put(config, checkpoint, {"step": step}, versions)
+        saver.put_writes(
+            config, [(f"channel_{n}", payload(256)) for n in range(3)], "task"
+        )
+    return config
+
+
+def _measure(
+    saver: PyOceanBaseSaver, call: Callable[[], Any], repeat: int
+) -> tuple[Timer, float]:
+    timer = Timer()
+    sent = 0
+    for _ in range(repeat):
+        before = _bytes_sent(saver)
+        with timer.measure():
+            call()
+        sent += _bytes_sent(saver) - before
+    return timer, sent / repeat
+
+
+def _calls(
+    saver: PyOceanBaseSaver, config: Any, page: int
+) -> dict[str, Callable[[], Any]]:
+    return {
+        "get_tuple": lambda: saver.get_tuple(config),
+        "list": lambda: list(saver.list(config, limit=page)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=50)
+    parser.add_argument("--channels", type=int, default=8)
+    parser.add_argument("--blob-size", type=int, default=16384)
+    parser.add_argument("--page", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with temporary_database() as uri:
+        with PyOceanBaseSaver.from_conn_string(uri) as saver:
+            saver.setup()
+            _fill(saver, args.depth, args.channels, args.blob_size)
+
+        latest = {"configurable": {"thread_id": "bench", "checkpoint_ns": ""}}
+        print(
+            f"{'engine':>8} {'call':>10} {'p50 ms':>9} {'p99 ms':>9} {'KiB/call':>10}"
+        )
+        engines: tuple[ReadEngine, ...] = ("json", "binary")
+        for engine in engines:
+            with PyOceanBaseSaver.from_conn_string(uri, read_engine=engine) as saver:
+                for name, call in _calls(saver, latest, args.page).items():
+                    timer, sent = _measure(saver, call, args.repeat)
+                    print(
+                        f"{engine:>8} {name:>10} {timer.percentile(0.5) * 1e3:>9.2f}"
+                        f" {timer.percentile(0.99) * 1e3:>9.2f} {sent / 1024:>10.1f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Peak memory of listing a long thread with and without `stream_list`.
+
+A thread is filled with `--depth` checkpoints, then its whole history is
+listed once per mode, each in a fresh interpreter so that the peak resident
+set size (`ru_maxrss`) of one mode does not hide the other.
+
+    python -m bench.stream_list --depth 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import resource
+import subprocess
+import sys
+import time
+from typing import Any
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from bench.utils import next_checkpoint, payload, temporary_database
+from langgraph.checkpoint.oceanbase.pyoceanbase import PyOceanBaseSaver
+
+
+def _fill(uri: str, depth: int, blob_size: int) -> None:
+    with PyOceanBaseSaver.from_conn_string(uri) as saver:
+        saver.setup()
+        config: Any = {"configurable": {"thread_id": "bench", "checkpoint_ns": ""}}
+        checkpoint = empty_checkpoint()
+        for step in range(depth):
+            checkpoint, versions = next_checkpoint(
+                saver, checkpoint, step=step, values={"messages": payload(blob_size)}
+            )
+            config = saver.put(config, checkpoint, {"step": step}, versions)
+
+
+def _measure(uri: str, stream: bool) -> None:
+    """Run in a child process: list the thread and print count, time, peak RSS."""
+    config: Any = {"configurable": {"thread_id": "bench", "checkpoint_ns": ""}}
+    with PyOceanBaseSaver.from_conn_string(uri, stream_list=stream) as saver:
+        start = time.perf_counter()
+        count = sum(1 for _ in saver.list(config))
+        elapsed = time.perf_counter() - start
+    # kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak //= 1024
+    print(count, elapsed, peak)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=100_000)
+    parser.add_argument("--blob-size", type=int, default=2048)
+    parser.add_argument("--measure", metavar="URI", help=argparse.SUPPRESS)
+    parser.add_argument("--stream", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        _measure(args.measure, args.stream)
+        return
+
+    with temporary_database() as uri:
+        _fill(uri, args.depth, args.blob_size)
+        print(f"{'mode':>9} {'checkpoints':>12} {'seconds':>8} {'peak RSS MiB':>13}")
+        for stream in (False, True):
+            command = [sys.executable, "-m", "bench.stream_list", "--measure", uri]
+            if stream:
+                command.append("--stream")
+            output = subprocess.run(
+                command, check=True, capture_output=True, text=True
+            ).stdout
+            count, elapsed, peak = output.split()
+            mode = "stream" if stream else "buffered"
+            print(
+                f"{mode:>9} {count:>12} {float(elapsed):>8.1f}"
+                f" {int(peak) / 1024:>13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""Latency of every checkpointer operation across savers and workload shapes.
+
+For every combination of saver, channel count, blob size, history depth and
+concurrency, a fresh database is set up and `--concurrency` workers, each
+owning a thread_id, run the same workload:
+
+- `put` and `put_writes` for `--depth` checkpoints. The first checkpoint sets
+  every channel, later ones update one channel each, like a graph step would.
+- `get_tuple` of the latest checkpoint and of a random earlier one by id,
+  `--reads` times each.
+- `list` of the thread's history, `--reads` times, up to `--list-limit`.
+- `delete_thread`.
+
+Workers run on threads over a connection pool for `PyOceanBaseSaver`, and as
+tasks over a pool of the driver for `AIOMySQLSaver` and `AsyncMySaver`. The
+results are printed as a table and, with `--output`, written as JSON that
+`bench.compare` reads to find regressions between two runs.
+
+    python -m bench.suite --channels 1 8 --blob-size 1024 65536 --output head.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, NamedTuple
+
+import aiomysql  # type: ignore
+import asyncmy
+import pymysql
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, Checkpoint, empty_checkpoint
+from sqlalchemy import create_pool_from_url
+
+from bench.utils import (
+    BENCH_BASE_URI,
+    Timer,
+    next_checkpoint,
+    payload,
+    temporary_database,
+)
+from langgraph.checkpoint.oceanbase.aio import AIOMySQLSaver
+from langgraph.checkpoint.oceanbase.asyncmy import AsyncMySaver
+from langgraph.checkpoint.oceanbase.pyoceanbase import PyOceanBaseSaver
+
+SAVERS = ("pyoceanbase", "aiomysql", "asyncmy")
+
+OPERATIONS = (
+    "put",
+    "put_writes",
+    "get_tuple_latest",
+    "get_tuple_by_id",
+    "list",
+    "delete_thread",
+)
+
+
+class Case(NamedTuple):
+    saver: str
+    channels: int
+    blob_size: int
+    depth: int
+    concurrency: int
+
+
+class Workload(NamedTuple):
+    reads: int
+    list_limit: int | None
+
+
+def _step_values(step: int, channels: int, blob_size: int) -> dict[str, Any]:
+    if step == 0:
+        return {f"channel_{n}": payload(blob_size) for n in range(channels)}
+    return {f"channel_{step % channels}": payload(blob_size)}
+
+
+def _thread_config(thread_id: str) -> RunnableConfig:
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+
+
+def _next(
+    saver: BaseCheckpointSaver, checkpoint: Checkpoint, step: int, case: Case
+) -> tuple[Checkpoint, Any]:
+    return next_checkpoint(
+        saver,
+        checkpoint,
+        step=step,
+        values=_step_values(step, case.channels, case.blob_size),
+    )
+
+
+def _sync_worker(
+    saver: PyOceanBaseSaver,
+    thread_id: str,
+    case: Case,
+    workload: Workload,
+    timers: dict[str, Timer],
+) -> None:
+    config = _thread_config(thread_id)
+    checkpoint = empty_checkpoint()
+    configs = []
+    for step in range(case.depth):
+        checkpoint, versions = _next(saver, checkpoint, step, case)
+        with timers["put"].measure():
+            config = saver.put(config, checkpoint, {"step": step}, versions)
+        with timers["put_writes"].measure():
+            saver.put_writes(config, [("channel_0", payload(256))], "task")
+        configs.append(config)
+
+    latest = _thread_config(thread_id)
+    for _ in range(workload.reads):
+        with timers["get_tuple_latest"].measure():
+            saver.get_tuple(latest)
+        with timers["get_tuple_by_id"].measure():
+            saver.get_tuple(random.choice(configs))
+        with timers["list"].measure():
+            for _ in saver.list(latest, limit=workload.list_limit):
+                pass
+    with timers["delete_thread"].measure():
+        saver.delete_thread(thread_id)
+
+
+def _run_sync(uri: str, case: Case, workload: Workload) -> dict[str, Timer]:
+    timers = {operation: Timer() for operation in OPERATIONS}
+    pool = create_pool_from_url(
+        uri.replace("mysql://", "mysql+pymysql://"),
+        pool_size=case.concurrency,
+        max_overflow=0,
+    )
+    try:
+        saver = PyOceanBaseSaver(
+            pool.connect, concurrency="pool", max_inflight=case.concurrency
+        )
+        saver.setup()
+        with ThreadPoolExecutor(max_workers=case.concurrency) as executor:
+            futures = [
+                executor.submit(
+                    _sync_worker, saver, f"thread-{n}", case, workload, timers
+                )
+                for n in range(case.concurrency)
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        pool.dispose()
+    return timers
+
+
+async def _async_worker(
+    saver: AIOMySQLSaver | AsyncMySaver,
+    thread_id: str,
+    case: Case,
+    workload: Workload,
+    timers: dict[str, Timer],
+) -> None:
+    config = _thread_config(thread_id)
+    checkpoint = empty_checkpoint()
+    configs = []
+    for step in range(case.depth):
+        checkpoint, versions = _next(saver, checkpoint, step, case)
+        with timers["put"].measure():
+            config = await saver.aput(config, checkpoint, {"step": step}, versions)
+        with timers["put_writes"].measure():
+            await saver.aput_writes(config, [("channel_0", payload(256))], "task")
+        configs.append(config)
+
+    latest = _thread_config(thread_id)
+    for _ in range(workload.reads):
+        with timers["get_tuple_latest"].measure():
+            await saver.aget_tuple(latest)
+        with timers["get_tuple_by_id"].measure():
+            await saver.aget_tuple(random.choice(configs))
+        with timers["list"].measure():
+            async for _ in saver.alist(latest, limit=workload.list_limit):
+                pass
+    with timers["delete_thread"].measure():
+        await saver.adelete_thread(thread_id)
+
+
+async def _run_async(uri: str, case: Case, workload: Workload) -> dict[str, Timer]:
+    timers = {operation: Timer() for operation in OPERATIONS}
+    saver: AIOMySQLSaver | AsyncMySaver
+    if case.saver == "aiomysql":
+        pool = await aiomysql.create_pool(
+            **AIOMySQLSaver.parse_conn_string(uri),
+            maxsize=case.concurrency,
+            autocommit=True,
+        )
+        saver = AIOMySQLSaver(pool)
+    else:
+        pool = await asyncmy.create_pool(
+            **AsyncMySaver.parse_conn_string(uri),
+            maxsize=case.concurrency,
+            autocommit=True,
+        )
+        saver = AsyncMySaver(pool)  # type: ignore[arg-type]
+    try:
+        await saver.setup()
+        await asyncio.gather(
+            *(
+                _async_worker(saver, f"thread-{n}", case, workload, timers)
+                for n in range(case.concurrency)
+            )
+        )
+    finally:
+        pool.close()
+        await pool.wait_closed()
+    return timers
+
+
+def run(case: Case, workload: Workload) -> list[dict[str, Any]]:
+    """Run one case on a fresh database, returning a result per operation."""
+    with temporary_database() as uri:
+        if case.saver == "pyoceanbase":
+            timers = _run_sync(uri, case, workload)
+        else:
+            timers = asyncio.run(_run_async(uri, case, workload))
+    return [
+        {
+            **case._asdict(),
+            "operation": operation,
+            "samples": len(timer.samples),
+            "mean_ms": timer.total / len(timer.samples) * 1e3,
+            "p50_ms": timer.percentile(0.5) * 1e3,
+            "p90_ms": timer.percentile(0.9) * 1e3,
+            "p99_ms": timer.percentile(0.99) * 1e3,
+        }
+        for operation, timer in timers.items()
+        if timer.samples
+    ]
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _server_version() -> str:
+    params = PyOceanBaseSaver.parse_conn_string(BENCH_BASE_URI)
+    with pymysql.connect(**params) as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT VERSION()")
+            row = cur.fetchone()
+    return row[0] if row else ""
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--savers", nargs="+", choices=SAVERS, default=list(SAVERS))
+    parser.add_argument("--channels", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--blob-size", type=int, nargs="+", default=[1024, 65536])
+    parser.add_argument("--depth", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--reads", type=int, default=20)
+    parser.add_argument("--list-limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    workload = Workload(args.reads, args.list_limit)
+    report: dict[str, Any] = {
+        "commit": _commit(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "server": _server_version(),
+        "workload": workload._asdict(),
+        "results": [],
+    }
+
+    print(
+        f"{'saver':>12} {'ch':>3} {'blob':>7} {'depth':>5} {'conc':>4}"
+        f" {'operation':>16} {'p50 ms':>9} {'p99 ms':>9}"
+    )
+    for values in itertools.product(
+        args.savers, args.channels, args.blob_size, args.depth, args.concurrency
+    ):
+        case = Case(*values)
+        start = time.perf_counter()
+        results = run(case, workload)
+        for result in results:
+            print(
+                f"{case.saver:>12} {case.channels:>3} {case.blob_size:>7}"
+                f" {case.depth:>5} {case.concurrency:>4}"
+                f" {result['operation']:>16} {result['p50_ms']:>9.2f}"
+                f" {result['p99_ms']:>9.2f}"
+            )
+        print(
+            f"{'':>12} case took {time.perf_counter() - start:.1f} s", file=sys.stderr
+        )
+        report["results"].extend(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Throughput of a pool-backed PyOceanBaseSaver as worker threads are added.
+
+Each worker owns a thread_id and alternates `put` and `get_tuple`. With
+`concurrency="serial"` every call goes through the saver's lock, so throughput
+stays flat; with `concurrency="pool"` it should rise with the worker count up
+to the pool size.
+
+    python -m bench.thread_scaling --workers 1 2 4 8 16 --ops 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langgraph.checkpoint.base import empty_checkpoint
+from sqlalchemy import create_pool_from_url
+
+from bench.utils import next_checkpoint, payload, temporary_database
+from langgraph.checkpoint.oceanbase import ConcurrencyMode
+from langgraph.checkpoint.oceanbase.pyoceanbase import PyOceanBaseSaver
+
+
+def _worker(saver: PyOceanBaseSaver, thread_id: str, ops: int) -> None:
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    checkpoint = empty_checkpoint()
+    for step in range(ops):
+        checkpoint, versions = next_checkpoint(
+            saver, checkpoint, step=step, values={"messages": payload(1024)}
+        )
+        config = saver.put(config, checkpoint, {"step": step}, versions)
+        saver.get_tuple(config)
+
+
+def run(
+    uri: str, mode: ConcurrencyMode, workers: int, ops: int, pool_size: int
+) -> float:
+    """Return the achieved operations per second."""
+    pool = create_pool_from_url(
+        uri.replace("mysql://", "mysql+pymysql://"),
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+    try:
+        saver = PyOceanBaseSaver(pool.connect, concurrency=mode, max_inflight=pool_size)
+        saver.setup()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_worker, saver, f"{mode}-{workers}-{n}", ops)
+                for n in range(workers)
+            ]
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.dispose()
+    return 2 * workers * ops / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--ops", type=int, default=100)
+    parser.add_argument("--pool-size", type=int, default=16)
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'serial ops/s':>14} {'pool ops/s':>14} {'speedup':>8}")
+    with temporary_database() as uri:
+        for workers in args.workers:
+            serial = run(uri, "serial", workers, args.ops, args.pool_size)
+            pooled = run(uri, "pool", workers, args.ops, args.pool_size)
+            print(
+                f"{workers:>8} {serial:>14.1f} {pooled:>14.1f} {pooled / serial:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import json
 import threading
+import time
 from collections import defaultdict
-from collections.abc import Iterator, Sequence
-from contextlib import contextmanager
-from typing import Any, Generic
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Executor
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from typing import Any, Generic, Literal
 
 from langchain_core.runnables import RunnableConfig
 
@@ -19,79 +20,412 @@ from langgraph.checkpoint.base import (
     get_checkpoint_metadata,
 )
 from langgraph.checkpoint.oceanbase import _internal
-from langgraph.checkpoint.oceanbase.base import BaseMySQLSaver
+from langgraph.checkpoint.oceanbase._coalesce import WriteBatch, WriteCoalescer
+from langgraph.checkpoint.oceanbase.base import (
+    BaseMySQLSaver,
+    ChannelVersionIndex,
+    CheckpointPage,
+    CopyResult,
+    ReadEngine,
+    UpgradeResult,
+)
+from langgraph.checkpoint.oceanbase.cache import CheckpointCache
+from langgraph.checkpoint.oceanbase.instrumentation import (
+    SpanCallback,
+    current_span,
+    instrument_cursor,
+    instrumented,
+)
+from langgraph.checkpoint.oceanbase.jsoncodec import JsonCodec
+from langgraph.checkpoint.oceanbase.retention import PruneResult, RetentionPolicy
 from langgraph.checkpoint.oceanbase.utils import (
-    deserialize_channel_values,
     deserialize_pending_sends,
-    deserialize_pending_writes,
+    keyset_params,
 )
 from langgraph.checkpoint.serde.base import SerializerProtocol
 
 Conn = _internal.Conn  # For backward compatibility
 
+ConcurrencyMode = Literal["serial", "pool"]
+
 
 class BaseSyncMySQLSaver(BaseMySQLSaver, Generic[_internal.C, _internal.R]):
     lock: threading.Lock
+    inflight: threading.BoundedSemaphore | None
+    write_coalescer: WriteCoalescer | None
 
     def __init__(
         self,
         conn: _internal.Conn[_internal.C],
         serde: SerializerProtocol | None = None,
+        *,
+        concurrency: ConcurrencyMode = "serial",
+        max_inflight: int | None = None,
+        read_engine: ReadEngine = "json",
+        channel_version_index: ChannelVersionIndex = "off",
+        checkpoint_heads: bool = False,
+        write_batch_window: float | None = None,
+        write_batch_max_rows: int = 1000,
+        content_addressed_blobs: bool = False,
+        stream_list: bool = False,
+        lazy_load: bool = False,
+        delete_batch_size: int | None = None,
+        partitions: int | None = None,
+        cache: CheckpointCache | None = None,
+        indexed_metadata: Sequence[str] = (),
+        instrument: SpanCallback | None = None,
+        legacy_checkpoints: bool = True,
+        decode_executor: Executor | None = None,
+        blob_chunk_size: int | None = None,
+        json_codec: JsonCodec | None = None,
     ) -> None:
-        super().__init__(serde=serde)
+        """Create a saver on top of a connection, connection factory or pool.
+
+        Args:
+            conn: A connection, a connection factory or a SQLAlchemy pool.
+            serde: The serializer used for channel values and pending writes.
+            concurrency: "serial" (the default) runs one query at a time per
+                saver. "pool" only serializes access to a single shared
+                connection and lets connection factories and pools run queries
+                from several threads in parallel.
+            max_inflight: In "pool" mode, the maximum number of queries a
+                factory or pool backed saver runs at the same time. Unbounded
+                if None.
+            read_engine: "json" (the default) aggregates channel values and
+                pending writes on the server. "binary" fetches them as raw
+                result sets in one multi-statement round trip, which requires a
+                connection opened with CLIENT.MULTI_STATEMENTS.
+            channel_version_index: "off" (the default) resolves the channel
+                blobs of a checkpoint from its JSON. "write" also records the
+                channel versions of every saved checkpoint in
+                checkpoint_channel_versions, and "read" additionally looks blobs
+                up through that table. Checkpoints saved before the index was
+                enabled need `backfill_channel_versions` before switching to
+                "read".
+            checkpoint_heads: Whether to keep a pointer to the latest
+                checkpoint of every thread in checkpoint_heads and resolve
+                `get_tuple` without a checkpoint id through it. Threads
+                without a head fall back to the newest checkpoint id. Every
+                saver writing to the same database must enable it, otherwise
+                heads go stale; `rebuild_checkpoint_heads` repairs them.
+            write_batch_window: If set, `put_writes` calls arriving within this
+                many seconds of each other are written in one transaction with
+                multi-row statements. Each call still returns only after that
+                transaction has committed, and fails if it fails. Disabled if
+                None.
+            write_batch_max_rows: The number of pending write rows that flushes
+                a batch before its window has passed, and the maximum number of
+                rows per statement.
+            content_addressed_blobs: Whether to store each distinct serialized
+                channel value once in checkpoint_blob_contents, keyed by the
+                SHA-256 of its type and bytes, and only reference it from
+                checkpoint_blobs. Values whose bytes are already stored are not
+                sent again. Blobs in either layout can always be read.
+            stream_list: Whether `list` reads checkpoints through an unbuffered
+                cursor and yields them as they arrive instead of loading the
+                whole result first. Streaming always uses the "json" read
+                engine.
+            lazy_load: Whether channel values and pending writes of loaded
+                checkpoints are deserialized when first accessed instead of
+                when the checkpoint is read. Useful when callers of `list`
+                mostly look at configs and metadata.
+            delete_batch_size: If set, `delete_thread` and `delete_threads`
+                delete at most this many rows per statement and commit after
+                each one instead of deleting threads in a single transaction.
+                Checkpoints are deleted oldest first, so a thread keeps its
+                latest checkpoint until the deletion is nearly complete.
+            partitions: If set, the checkpoint tables are hash partitioned by
+                thread_id into this many partitions, so that the threads of a
+                multi-node OceanBase cluster are spread over several tablet
+                leaders. `setup` partitions the tables it creates, and only
+                warns about existing tables with another partition count.
+                `repartition` rebuilds those, once.
+            cache: A `CheckpointCache` serving `get_tuple` from memory for
+                checkpoints recently saved or read through this saver.
+            indexed_metadata: Metadata keys frequently used in `filter`. `setup`
+                adds an indexed generated column of checkpoints for each of
+                them, which `list` then uses for equality filters on string,
+                integer and boolean values.
+            instrument: A callback receiving a `Span` with the round trips,
+                rows, payload bytes, serde time and lock wait of every
+                `put`, `get_tuple`, `list`, ... call, e.g. a `SpanAggregator`.
+            legacy_checkpoints: Whether the database may hold checkpoints saved
+                before the v4 layout, whose pending sends are read from their
+                parent's writes. Set it to False once
+                `upgrade_legacy_checkpoints` has run without skipping any, so
+                that reads never issue that extra query.
+            decode_executor: A thread or process pool on which `list`
+                deserializes the channel blobs and pending writes of the
+                checkpoints it returns in parallel, in order. A process pool
+                requires a picklable serializer.
+            blob_chunk_size: If set, serialized channel values larger than
+                this many bytes are stored in chunks of that size in
+                checkpoint_blob_chunks and reassembled when read, so that a
+                single value never has to fit in one `max_allowed_packet`.
+                Smaller values stay inline. Chunked values can always be read.
+            json_codec: The codec of the checkpoint and metadata JSON, and of
+                the channel values and pending writes aggregated by reads.
+                Defaults to `orjson_codec()`.
+        """
+        super().__init__(
+            serde=serde,
+            read_engine=read_engine,
+            channel_version_index=channel_version_index,
+            checkpoint_heads=checkpoint_heads,
+            write_batch_window=write_batch_window,
+            write_batch_max_rows=write_batch_max_rows,
+            content_addressed_blobs=content_addressed_blobs,
+            stream_list=stream_list,
+            lazy_load=lazy_load,
+            delete_batch_size=delete_batch_size,
+            partitions=partitions,
+            cache=cache,
+            indexed_metadata=indexed_metadata,
+            instrument=instrument,
+            legacy_checkpoints=legacy_checkpoints,
+            decode_executor=decode_executor,
+            blob_chunk_size=blob_chunk_size,
+            json_codec=json_codec,
+        )
+
+        if concurrency not in ("serial", "pool"):
+            raise ValueError(f"Unknown concurrency mode: {concurrency}")
+        if max_inflight is not None and max_inflight < 1:
+            raise ValueError("max_inflight must be a positive integer")
 
         self.conn = conn
+        self.concurrency = concurrency
         self.lock = threading.Lock()
+        self.inflight = (
+            threading.BoundedSemaphore(max_inflight)
+            if max_inflight is not None
+            else None
+        )
+        self.write_coalescer = (
+            WriteCoalescer(
+                self._flush_writes,
+                window=write_batch_window,
+                max_rows=write_batch_max_rows,
+            )
+            if write_batch_window is not None
+            else None
+        )
+
+    def _guard(self) -> AbstractContextManager:
+        """Return the context manager that protects a single database call.
+
+        The shared lock is always taken in "serial" mode and for a single shared
+        connection. Factories and pools in "pool" mode are only bounded by
+        `max_inflight`.
+        """
+        if self.concurrency == "serial" or _internal.is_shared_connection(self.conn):
+            return self.lock
+        if self.inflight is not None:
+            return self.inflight
+        return nullcontext()
 
     @staticmethod
     def _get_cursor_from_connection(conn: _internal.C) -> _internal.R:
         raise NotImplementedError
 
+    @staticmethod
+    def _get_streaming_cursor_from_connection(conn: _internal.C) -> _internal.R:
+        raise NotImplementedError
+
     @contextmanager
-    def _cursor(self, *, pipeline: bool = False) -> Iterator[_internal.R]:
+    def _cursor(
+        self, *, pipeline: bool = False, streaming: bool = False
+    ) -> Iterator[_internal.R]:
         """Create a database cursor as a context manager.
 
         Args:
             pipeline: whether to use transaction context manager and handle concurrency
+            streaming: whether to use an unbuffered cursor that fetches rows
+                from the server as they are read
         """
-        with _internal.get_connection(self.conn) as conn:
+        span = current_span() if self.instrument is not None else None
+        started = time.perf_counter()
+        with self._guard(), _internal.get_connection(self.conn) as conn:
+            if span is not None:
+                span.lock_wait += time.perf_counter() - started
             if pipeline:
-                with self.lock:
-                    conn.begin()
-                    try:
-                        with self._get_cursor_from_connection(conn) as cur:
-                            yield cur
-                        conn.commit()
-                    except:
-                        conn.rollback()
-                        raise
+                conn.begin()
+                try:
+                    with self._get_cursor_from_connection(conn) as cur:
+                        yield instrument_cursor(cur, span)
+                    conn.commit()
+                except:
+                    conn.rollback()
+                    raise
+            elif streaming:
+                with self._get_streaming_cursor_from_connection(conn) as cur:
+                    yield instrument_cursor(cur, span)
             else:
-                with self.lock, self._get_cursor_from_connection(conn) as cur:
-                    yield cur
+                with self._get_cursor_from_connection(conn) as cur:
+                    yield instrument_cursor(cur, span)
+
+    def _fetch_rows(
+        self, cur: _internal.R, where: str, args: dict[str, Any], suffix: str = ""
+    ) -> list[dict[str, Any]]:
+        """Select checkpoints with their channel values and pending writes.
+
+        Chunked blobs are reassembled from a single query for all of them.
+
+        Args:
+            cur: The cursor to run the query on.
+            where: The WHERE clause selecting the checkpoints.
+            args: The parameters referenced by `where`.
+            suffix: ORDER BY / LIMIT clauses applied to the checkpoints.
+        """
+        if self.read_engine == "binary":
+            cur.execute(self._select_binary_sql(where, suffix), args)
+            checkpoints = cur.fetchall()
+            cur.nextset()
+            blobs = cur.fetchall()
+            cur.nextset()
+            writes = cur.fetchall()
+            cur.nextset()
+            values = self._join_binary_rows(checkpoints, blobs, writes)
+        else:
+            cur.execute(self._select_sql(where) + suffix, args)
+            values = [self._decode_json_row(value) for value in cur.fetchall()]
+        if refs := self._blob_chunk_refs(values):
+            cur.execute(*self._select_blob_chunks_sql(refs))
+            chunks = self._group_blob_chunks(refs, cur.fetchall())
+            self._join_blob_chunks(values, chunks)
+        return values
 
     def setup(self) -> None:
-        """Set up the checkpoint database asynchronously.
+        """Set up the checkpoint database.
 
         This method creates the necessary tables in the MySQL database if they don't
         already exist and runs database migrations. It MUST be called directly by the user
         the first time checkpointer is used.
+
+        The schema version of a database is read in a single query and
+        remembered for the rest of the process, like its partition counts and
+        metadata columns, so later calls for the same database skip them.
+        Pending migrations run while holding a named lock, so that processes
+        starting at the same time migrate the database once. Each migration is
+        recorded as soon as it is applied, so an interrupted setup resumes
+        after the last one.
+        """
+        with self._cursor() as cur:
+            state = self._schema_state(cur)
+            if not self._schema_current(state):
+                version = self._read_schema_version(cur)
+                if version < len(self.MIGRATIONS) - 1:
+                    version = self._migrate(cur)
+                self._check_schema_version(state, version)
+            if self.partitions is not None:
+                if state.partition_counts is None:
+                    cur.execute(self.SELECT_PARTITION_COUNTS_SQL)
+                    state.partition_counts = {
+                        row["name"]: row["n"] for row in cur.fetchall()
+                    }
+                self._check_partitions(state.partition_counts)
+            if self.indexed_metadata:
+                if state.metadata_columns is None:
+                    cur.execute(self.SELECT_METADATA_COLUMNS_SQL)
+                    state.metadata_columns = {
+                        row["name"].lower() for row in cur.fetchall()
+                    }
+                for sql in self._add_metadata_columns_sql(state.metadata_columns):
+                    cur.execute(sql)
+                state.metadata_columns.update(
+                    f"metadata_{key}".lower() for key in self.indexed_metadata
+                )
+
+    def assert_schema_current(self) -> None:
+        """Raise a RuntimeError if the database needs migrations `setup` would run.
+
+        A cheaper alternative to `setup` for processes that use a database
+        migrated elsewhere, e.g. on cold starts of autoscaled workers: it runs
+        at most one query per database and process, and never takes the
+        migration lock.
         """
         with self._cursor() as cur:
+            state = self._schema_state(cur)
+            if self._schema_current(state):
+                return
+            version = self._read_schema_version(cur)
+        self._check_schema_version(state, version)
+
+    def _read_schema_version(self, cur: _internal.R) -> int:
+        """The latest migration applied to the database, -1 if none."""
+        try:
+            cur.execute(self.SELECT_SCHEMA_VERSION_SQL)
+        except Exception as e:
+            if not self._is_missing_table(e):
+                raise
+            return -1
+        return self._schema_version(cur.fetchone())
+
+    def _migrate(self, cur: _internal.R) -> int:
+        """Run the pending migrations under the migration lock, returning the
+        new schema version."""
+        with self._migration_lock(cur):
             cur.execute(self.MIGRATIONS[0])
-            cur.execute("SELECT v FROM checkpoint_migrations ORDER BY v DESC LIMIT 1")
-            row = cur.fetchone()
-            if row is None:
-                version = -1
-            else:
-                version = row["v"]
-            for v, migration in zip(
-                range(version + 1, len(self.MIGRATIONS)),
-                self.MIGRATIONS[version + 1 :],
-            ):
-                cur.execute(migration)
-                cur.execute(f"INSERT INTO checkpoint_migrations (v) VALUES ({v})")
+            # another process may have migrated while we waited for the lock
+            version = self._read_schema_version(cur)
+            created = version < 0
+            for v in range(version + 1, len(self.MIGRATIONS)):
+                cur.execute(self.MIGRATIONS[v])
+                cur.execute(self.INSERT_MIGRATION_SQL, (v,))
                 cur.execute("COMMIT")
+                version = v
+            if created and self.partitions is not None:
+                # the tables were just created empty, so this rewrites nothing
+                for table in self.PARTITIONED_TABLES:
+                    cur.execute(self._partition_table_sql(table, self.partitions))
+            return version
+
+    @contextmanager
+    def _migration_lock(self, cur: _internal.R) -> Iterator[None]:
+        """Hold the named lock serializing schema changes across processes."""
+        cur.execute(self.ACQUIRE_MIGRATION_LOCK_SQL, (self.MIGRATION_LOCK_TIMEOUT,))
+        row = cur.fetchone()
+        if not row or not row["acquired"]:
+            raise TimeoutError(
+                "Timed out waiting for another process to migrate the checkpoint schema"
+            )
+        try:
+            yield
+        finally:
+            cur.execute(self.RELEASE_MIGRATION_LOCK_SQL)
+            cur.fetchone()
+
+    def repartition(self, partitions: int | None = None) -> list[str]:
+        """Rebuild the checkpoint tables hash partitioned by thread_id.
+
+        This is the migration path between the unpartitioned layout and any
+        partition count, run once, e.g. from a deploy job. Each table that
+        does not have `partitions` partitions yet is rebuilt with ALTER TABLE
+        ... PARTITION BY KEY, which rewrites all of its rows. `setup` never
+        does this to existing tables, it only warns about them.
+
+        Args:
+            partitions: The number of partitions. Defaults to the `partitions`
+                of the saver.
+
+        Returns:
+            list[str]: The tables that were rebuilt.
+        """
+        partitions = self._repartition_target(partitions)
+        rebuilt: list[str] = []
+        with self._cursor() as cur, self._migration_lock(cur):
+            for table in self.PARTITIONED_TABLES:
+                cur.execute(self.SELECT_PARTITION_COUNT_SQL, (table,))
+                row = cur.fetchone()
+                if (row["n"] if row else 0) != partitions:
+                    cur.execute(self._partition_table_sql(table, partitions))
+                    rebuilt.append(table)
+            self._schema_state(cur).partition_counts = dict.fromkeys(
+                self.PARTITIONED_TABLES, partitions
+            )
+        return rebuilt
 
+    @instrumented
     def list(
         self,
         config: RunnableConfig | None,
@@ -133,26 +467,24 @@ class BaseSyncMySQLSaver(BaseMySQLSaver, Generic[_internal.C, _internal.R]):
             [CheckpointTuple(...), ...]
         """
         where, args = self._search_where(config, filter, before)
-        query = self._select_sql(where) + " ORDER BY checkpoint_id DESC"
+        suffix = " ORDER BY checkpoint_id DESC"
         if limit:
-            query += f" LIMIT {limit}"
-        # if we change this to use .stream() we need to make sure to close the cursor
+            suffix += f" LIMIT {limit}"
+        if self.stream_list:
+            yield from self._stream(where, args, suffix)
+            return
         with self._cursor() as cur:
-            cur.execute(query, args)
-            values = cur.fetchall()
+            values = self._fetch_rows(cur, where, args, suffix)
             if not values:
                 return
-            for value in values:
-                value["checkpoint"] = json.loads(value["checkpoint"])
-                value["channel_values"] = deserialize_channel_values(
-                    value["channel_values"]
-                )
             # migrate pending sends if necessary
-            if to_migrate := [
-                v
-                for v in values
-                if v["checkpoint"]["v"] < 4 and v["parent_checkpoint_id"]
-            ]:
+            if self.legacy_checkpoints and (
+                to_migrate := [
+                    v
+                    for v in values
+                    if v["checkpoint"]["v"] < 4 and v["parent_checkpoint_id"]
+                ]
+            ):
                 cur.execute(
                     self._select_pending_sends_sql(len(to_migrate)),
                     (
@@ -160,22 +492,66 @@ class BaseSyncMySQLSaver(BaseMySQLSaver, Generic[_internal.C, _internal.R]):
                         *[v["parent_checkpoint_id"] for v in to_migrate],
                     ),
                 )
-            pending_sends = cur.fetchall()
-            grouped_by_parent = defaultdict(list)
-            for value in to_migrate:
-                grouped_by_parent[value["parent_checkpoint_id"]].append(value)
-            for sends in pending_sends:
-                for value in grouped_by_parent[sends["checkpoint_id"]]:
-                    if value["channel_values"] is None:
-                        value["channel_values"] = []
-                    self._migrate_pending_sends(
-                        deserialize_pending_sends(sends["sends"]),
-                        value["checkpoint"],
-                        value["channel_values"],
-                    )
-            for value in values:
-                yield self._load_checkpoint_tuple(value)
+                pending_sends = cur.fetchall()
+                grouped_by_parent = defaultdict(list)
+                for value in to_migrate:
+                    grouped_by_parent[value["parent_checkpoint_id"]].append(value)
+                for sends in pending_sends:
+                    for value in grouped_by_parent[sends["checkpoint_id"]]:
+                        if value["channel_values"] is None:
+                            value["channel_values"] = []
+                        self._migrate_pending_sends(
+                            deserialize_pending_sends(
+                                sends["sends"], self.json_codec.loads
+                            ),
+                            value["checkpoint"],
+                            value["channel_values"],
+                        )
+            for value, decoded in zip(values, self._decode_rows(values)):
+                yield self._make_checkpoint_tuple(value, decoded)
+
+    def _stream(
+        self, where: str, args: dict[str, Any], suffix: str
+    ) -> Iterator[CheckpointTuple]:
+        """Yield checkpoint tuples as they arrive from an unbuffered cursor.
 
+        The pending sends of legacy checkpoints are fetched up front, in
+        windows, since no other query can run on the connection while the
+        stream is open. For the same reason, threads with chunked blobs are
+        read buffered. The connection stays in use until the iterator is
+        exhausted or closed.
+        """
+        sends_by_parent: dict[tuple[str, str], list[tuple[str, bytes]]] = {}
+        values: list[dict[str, Any]] = []
+        with self._cursor() as cur:
+            cur.execute(*self._any_blob_chunk_sql(args))
+            buffered = cur.fetchone() is not None
+            if self.legacy_checkpoints:
+                cur.execute(self._select_legacy_parents_sql(where, suffix), args)
+                for query, params in self._pending_sends_windows(cur.fetchall()):
+                    cur.execute(query, params)
+                    for sends in cur.fetchall():
+                        sends_by_parent[(params[0], sends["checkpoint_id"])] = (
+                            deserialize_pending_sends(
+                                sends["sends"], self.json_codec.loads
+                            )
+                        )
+            if buffered:
+                values = self._fetch_rows(cur, where, args, suffix)
+        if buffered:
+            self._migrate_legacy_rows(values, sends_by_parent)
+            for value, decoded in zip(values, self._decode_rows(values)):
+                yield self._make_checkpoint_tuple(value, decoded)
+            return
+        with self._cursor(streaming=True) as cur:
+            cur.execute(self._select_sql(where) + suffix, args)
+            while rows := cur.fetchmany(self.STREAM_FETCH_SIZE):
+                values = [self._decode_json_row(row) for row in rows]
+                self._migrate_legacy_rows(values, sends_by_parent)
+                for value, decoded in zip(values, self._decode_rows(values)):
+                    yield self._make_checkpoint_tuple(value, decoded)
+
+    @instrumented
     def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
         """Get a checkpoint tuple from the database.
 
@@ -221,31 +597,29 @@ class BaseSyncMySQLSaver(BaseMySQLSaver, Generic[_internal.C, _internal.R]):
                 "checkpoint_id": checkpoint_id,
             }
             where = "WHERE thread_id = %(thread_id)s AND checkpoint_ns_hash = UNHEX(MD5(%(checkpoint_ns)s)) AND checkpoint_id = %(checkpoint_id)s"
+            suffix = ""
         else:
             args = {
                 "thread_id": thread_id,
                 "checkpoint_ns": checkpoint_ns,
             }
-            where = "WHERE thread_id = %(thread_id)s AND checkpoint_ns_hash = UNHEX(MD5(%(checkpoint_ns)s))"
-
-        query = self._select_sql(where)
-        if not checkpoint_id:
-            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+            where, suffix = self._latest_checkpoint_query()
+        if self.cache is not None and (
+            cached := self.cache.get(thread_id, checkpoint_ns, checkpoint_id or None)
+        ):
+            return self._load_checkpoint_tuple(cached)
         with self._cursor() as cur:
-            cur.execute(
-                query,
-                args,
-            )
-            value = cur.fetchone()
-            if value is None:
+            values = self._fetch_rows(cur, where, args, suffix)
+            if not values:
                 return None
-            value["checkpoint"] = json.loads(value["checkpoint"])
-            value["channel_values"] = deserialize_channel_values(
-                value["channel_values"]
-            )
+            value = values[0]
 
             # migrate pending sends if necessary
-            if value["checkpoint"]["v"] < 4 and value["parent_checkpoint_id"]:
+            if (
+                self.legacy_checkpoints
+                and value["checkpoint"]["v"] < 4
+                and value["parent_checkpoint_id"]
+            ):
                 cur.execute(
                     self._select_pending_sends_sql(1),
                     (thread_id, value["parent_checkpoint_id"]),
@@ -254,13 +628,166 @@ class BaseSyncMySQLSaver(BaseMySQLSaver, Generic[_internal.C, _internal.R]):
                     if value["channel_values"] is None:
                         value["channel_values"] = []
                     self._migrate_pending_sends(
-                        deserialize_pending_sends(sends["sends"]),
+                        deserialize_pending_sends(
+                            sends["sends"], self.json_codec.loads
+                        ),
                         value["checkpoint"],
                         value["channel_values"],
                     )
 
+            if self.cache is not None:
+                self.cache.add_row(value, latest=not checkpoint_id)
             return self._load_checkpoint_tuple(value)
 
+    @instrumented
+    def get_tuples(
+        self, configs: Sequence[RunnableConfig]
+    ) -> Sequence[CheckpointTuple | None]:
+        """Get the checkpoint tuples of several configs at once.
+
+        Each config selects a checkpoint like in `get_tuple`: the one with its
+        checkpoint_id, or else the latest one of its thread and namespace.
+        Instead of a query per config, the latest checkpoint ids of up to
+        `GET_TUPLES_WINDOW` threads are resolved by one grouped query, and up
+        to that many checkpoints are then read by another.
+
+        Args:
+            configs: The configs to retrieve the checkpoints of.
+
+        Returns:
+            Sequence[Optional[CheckpointTuple]]: The checkpoint tuple of every
+            config, in order, or None where no matching checkpoint was found.
+        """
+        keys = [self._checkpoint_key(config) for config in configs]
+        rows: dict[tuple[str, str, str], dict[str, Any]] = {}
+        latest_ids: dict[tuple[str, str], str] = {}
+        missing_latest: list[tuple[str, str]] = []
+        missing: list[tuple[str, str, str]] = []
+        for thread_id, checkpoint_ns, checkpoint_id in dict.fromkeys(keys):
+            if self.cache is not None and (
+                cached := self.cache.get(thread_id, checkpoint_ns, checkpoint_id)
+            ):
+                if checkpoint_id is None:
+                    latest_ids[(thread_id, checkpoint_ns)] = cached["checkpoint_id"]
+                rows[(thread_id, checkpoint_ns, cached["checkpoint_id"])] = cached
+            elif checkpoint_id is None:
+                missing_latest.append((thread_id, checkpoint_ns))
+            else:
+                missing.append((thread_id, checkpoint_ns, checkpoint_id))
+        if missing or missing_latest:
+            fetched: list[dict[str, Any]] = []
+            with self._cursor() as cur:
+                resolved: dict[tuple[str, str], str] = {}
+                for query, params in self._latest_checkpoint_ids_windows(
+                    missing_latest
+                ):
+                    cur.execute(query, params)
+                    resolved.update(
+                        self._match_latest_checkpoint_ids(
+                            missing_latest, cur.fetchall()
+                        )
+                    )
+                missing.extend(
+                    (*pair, latest_id) for pair, latest_id in resolved.items()
+                )
+                for where, args in self._checkpoint_keys_windows(missing):
+                    fetched.extend(self._fetch_rows(cur, where, args))
+                self._migrate_fetched_rows(cur, fetched)
+            latest_ids.update(resolved)
+            for value in fetched:
+                thread_id, checkpoint_ns = value["thread_id"], value["checkpoint_ns"]
+                rows[(thread_id, checkpoint_ns, value["checkpoint_id"])] = value
+                if self.cache is not None:
+                    self.cache.add_row(
+                        value,
+                        latest=resolved.get((thread_id, checkpoint_ns))
+                        == value["checkpoint_id"],
+                    )
+        values = list(rows.values())
+        tuples = {
+            key: self._make_checkpoint_tuple(value, decoded)
+            for (key, value), decoded in zip(rows.items(), self._decode_rows(values))
+        }
+        return [
+            tuples.get(
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint_id or latest_ids.get((thread_id, checkpoint_ns), ""),
+                )
+            )
+            for thread_id, checkpoint_ns, checkpoint_id in keys
+        ]
+
+    def _migrate_fetched_rows(
+        self, cur: _internal.R, values: Sequence[dict[str, Any]]
+    ) -> None:
+        """Migrate the pending sends of the legacy checkpoints among rows
+        returned by `_fetch_rows` in place."""
+        if not self.legacy_checkpoints:
+            return
+        to_migrate = [
+            v for v in values if v["checkpoint"]["v"] < 4 and v["parent_checkpoint_id"]
+        ]
+        sends_by_parent: dict[tuple[str, str], list[tuple[str, bytes]]] = {}
+        for query, params in self._pending_sends_windows(to_migrate):
+            cur.execute(query, params)
+            for sends in cur.fetchall():
+                sends_by_parent[(params[0], sends["checkpoint_id"])] = (
+                    deserialize_pending_sends(sends["sends"], self.json_codec.loads)
+                )
+        self._migrate_legacy_rows(to_migrate, sends_by_parent)
+
+    @instrumented
+    def list_page(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> CheckpointPage:
+        """List checkpoints a page at a time.
+
+        Checkpoints are listed in primary key order, newest first within each
+        thread and namespace, across all threads when `config` is None. Each
+        page resumes after the last checkpoint of the previous one through an
+        index range scan, so it costs the same however deep it is, and is not
+        affected by checkpoints written since.
+
+        Args:
+            config: The thread, and optionally namespace, to list the
+                checkpoints of, or None to list the checkpoints of every
+                thread.
+            filter: Additional filtering criteria for metadata.
+            limit: The maximum number of checkpoints in the page.
+            cursor: The `next_cursor` of the previous page, made by the same
+                `config` and `filter`, or None for the first page.
+
+        Returns:
+            CheckpointPage: The checkpoints of the page and the cursor of the
+            next one, which is None after the last page.
+        """
+        if limit < 1:
+            raise ValueError("limit must be a positive integer")
+        where, args = self._page_where(config, filter, cursor)
+        values: list[dict[str, Any]] = []
+        with self._cursor() as cur:
+            cur.execute(self._select_page_keys_sql(where), {**args, "limit": limit + 1})
+            keys, next_cursor = self._page_keys(cur.fetchall(), limit)
+            for where, args in self._checkpoint_keys_windows(keys):
+                values.extend(self._fetch_rows(cur, where, args))
+            self._migrate_fetched_rows(cur, values)
+        values = self._order_page_rows(keys, values)
+        return CheckpointPage(
+            [
+                self._make_checkpoint_tuple(value, decoded)
+                for value, decoded in zip(values, self._decode_rows(values))
+            ],
+            next_cursor,
+        )
+
+    @instrumented
     def put(
         self,
         config: RunnableConfig,
@@ -316,19 +843,20 @@ class BaseSyncMySQLSaver(BaseMySQLSaver, Generic[_internal.C, _internal.R]):
             else:
                 blob_values[k] = copy["channel_values"].pop(k)
 
+        checkpoint_json = self.json_codec.dumps(copy)
+        metadata_json = self._dump_metadata(get_checkpoint_metadata(config, metadata))
+        blobs: Sequence[tuple[str, str, str, str, str, str, bytes | None]] = []
         with self._cursor(pipeline=True) as cur:
             if blob_versions := {
                 k: v for k, v in new_versions.items() if k in blob_values
             }:
-                cur.executemany(
-                    self.UPSERT_CHECKPOINT_BLOBS_SQL,
-                    self._dump_blobs(
-                        thread_id,
-                        checkpoint_ns,
-                        blob_values,
-                        blob_versions,
-                    ),
+                blobs = self._dump_blobs(
+                    thread_id,
+                    checkpoint_ns,
+                    blob_values,
+                    blob_versions,
                 )
+                self._write_blobs(cur, blobs)
             cur.execute(
                 self.UPSERT_CHECKPOINTS_SQL,
                 (
@@ -337,12 +865,72 @@ class BaseSyncMySQLSaver(BaseMySQLSaver, Generic[_internal.C, _internal.R]):
                     checkpoint_ns,
                     checkpoint["id"],
                     checkpoint_id,
-                    json.dumps(copy),
-                    self._dump_metadata(get_checkpoint_metadata(config, metadata)),
+                    checkpoint_json,
+                    metadata_json,
                 ),
             )
+            if upsert := self._upsert_channel_versions(
+                thread_id,
+                checkpoint_ns,
+                checkpoint["id"],
+                checkpoint["channel_versions"],
+            ):
+                cur.execute(*upsert)
+            if self.checkpoint_heads:
+                cur.execute(
+                    self.UPSERT_CHECKPOINT_HEADS_SQL,
+                    (thread_id, checkpoint_ns, checkpoint["id"]),
+                )
+        self._cache_checkpoint(
+            thread_id,
+            checkpoint_ns,
+            checkpoint,
+            checkpoint_id,
+            checkpoint_json,
+            metadata_json,
+            blobs,
+            blob_values,
+        )
         return next_config
 
+    def _write_blobs(
+        self,
+        cur: _internal.R,
+        blobs: Sequence[tuple[str, str, str, str, str, str, bytes | None]],
+    ) -> None:
+        """Store channel blobs, splitting the values larger than
+        `blob_chunk_size` into chunks and skipping contents that are already
+        stored when `content_addressed_blobs` is enabled.
+
+        Skipped contents are locked until the transaction commits, so `prune`
+        cannot delete them before the rows referencing them exist."""
+        if self.blob_chunk_size is not None:
+            blobs, chunks = self._dump_blob_chunks(blobs)
+            if chunks:
+                cur.executemany(self.INSERT_BLOB_CHUNKS_SQL, chunks)
+        if not self.content_addressed_blobs:
+            cur.executemany(self.UPSERT_CHECKPOINT_BLOBS_SQL, blobs)
+            return
+        contents, refs = self._dump_blob_contents(blobs)
+        if contents:
+            cur.execute(
+                self._select_blob_content_hashes_sql(len(contents)),
+                [content[0] for content in contents],
+            )
+            stored = {row["content_hash"] for row in cur.fetchall()}
+            if stored:
+                # Only stored contents are locked, as locking the lookup of
+                # missing ones makes writers of the same new content deadlock.
+                cur.execute(
+                    self._select_blob_content_hashes_sql(len(stored), lock=True),
+                    list(stored),
+                )
+                stored = {row["content_hash"] for row in cur.fetchall()}
+            if missing := [c for c in contents if c[0] not in stored]:
+                cur.executemany(self.INSERT_BLOB_CONTENTS_SQL, missing)
+        cur.executemany(self.UPSERT_CHECKPOINT_BLOB_REFS_SQL, refs)
+
+    @instrumented
     def put_writes(
         self,
         config: RunnableConfig,
@@ -359,23 +947,32 @@ class BaseSyncMySQLSaver(BaseMySQLSaver, Generic[_internal.C, _internal.R]):
             writes: List of writes to store.
             task_id: Identifier for the task creating the writes.
         """
+        upsert = all(w[0] in WRITES_IDX_MAP for w in writes)
         query = (
             self.UPSERT_CHECKPOINT_WRITES_SQL
-            if all(w[0] in WRITES_IDX_MAP for w in writes)
+            if upsert
             else self.INSERT_CHECKPOINT_WRITES_SQL
         )
+        params = self._dump_writes(
+            config["configurable"]["thread_id"],
+            config["configurable"]["checkpoint_ns"],
+            config["configurable"]["checkpoint_id"],
+            task_id,
+            task_path,
+            writes,
+        )
+        if self.write_coalescer is not None:
+            self.write_coalescer.submit(upsert, params)
+        else:
+            with self._cursor(pipeline=True) as cur:
+                cur.executemany(query, params)
+        self._cache_writes(upsert, params)
+
+    def _flush_writes(self, batches: Sequence[WriteBatch]) -> None:
+        """Write coalesced `put_writes` calls in a single transaction."""
         with self._cursor(pipeline=True) as cur:
-            cur.executemany(
-                query,
-                self._dump_writes(
-                    config["configurable"]["thread_id"],
-                    config["configurable"]["checkpoint_ns"],
-                    config["configurable"]["checkpoint_id"],
-                    task_id,
-                    task_path,
-                    writes,
-                ),
-            )
+            for query, params in self._batched_writes_sql(batches):
+                cur.execute(query, params)
 
     def delete_thread(self, thread_id: str) -> None:
         """Delete all checkpoints and writes associated with a thread ID.
@@ -384,20 +981,358 @@ class BaseSyncMySQLSaver(BaseMySQLSaver, Generic[_internal.C, _internal.R]):
         Returns:
             None
         """
+        self.delete_threads([thread_id])
+
+    @instrumented
+    def delete_threads(self, thread_ids: Sequence[str]) -> None:
+        """Delete all checkpoints and writes associated with several thread IDs.
+
+        Up to `DELETE_THREADS_WINDOW` threads are deleted by the same
+        statements. Without a `delete_batch_size`, each group of threads is
+        deleted in one transaction; with one, the rows are deleted in chunks
+        that are committed one at a time.
+
+        Args:
+            thread_ids: The thread IDs to delete.
+        """
+        try:
+            for window in self._thread_windows(thread_ids):
+                statements = self._delete_threads_sql(len(window))
+                if self.delete_batch_size is None:
+                    with self._cursor(pipeline=True) as cur:
+                        for query in statements:
+                            cur.execute(query, window)
+                    continue
+                for query in statements:
+                    while True:
+                        with self._cursor(pipeline=True) as cur:
+                            cur.execute(query, (*window, self.delete_batch_size))
+                            deleted = cur.rowcount
+                        if deleted < self.delete_batch_size:
+                            break
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate_threads(thread_ids)
+
+    def rebuild_checkpoint_heads(self) -> None:
+        """Recompute the latest checkpoint pointer of every thread.
+
+        Use this after enabling `checkpoint_heads` on a database that already
+        holds checkpoints, or after savers without it have written to it.
+        """
         with self._cursor(pipeline=True) as cur:
-            cur.execute(
-                "DELETE FROM checkpoints WHERE thread_id = %s",
-                (str(thread_id),),
-            )
-            cur.execute(
-                "DELETE FROM checkpoint_blobs WHERE thread_id = %s",
-                (str(thread_id),),
+            cur.execute("DELETE FROM checkpoint_heads")
+            cur.execute(self.REBUILD_CHECKPOINT_HEADS_SQL)
+
+    @instrumented
+    def copy_thread(
+        self,
+        source_thread_id: str,
+        target_thread_id: str,
+        up_to_checkpoint_id: str | None = None,
+        batch_size: int = 1000,
+    ) -> CopyResult:
+        """Copy the checkpoints of a thread, with their channel blobs and
+        pending writes, to another thread inside the database.
+
+        Nothing goes through the serializer: source checkpoints are walked in
+        primary key order, `batch_size` at a time, and each batch is copied
+        by `INSERT ... SELECT` statements in a transaction of its own.
+        Chunked blobs are copied with their chunks, and content-addressed
+        blobs only get a new reference to their contents.
+        Rows the target thread already has are left untouched, so an
+        interrupted copy is completed by running it again. The target thread
+        should not be written to while it is copied.
+
+        Args:
+            source_thread_id: The thread to copy.
+            target_thread_id: The thread to copy it to.
+            up_to_checkpoint_id: Only copy the checkpoints up to this one, in
+                every namespace, to fork the thread from a past checkpoint.
+            batch_size: The number of checkpoints copied per transaction.
+
+        Returns:
+            CopyResult: The number of inserted rows per table.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        source, target = str(source_thread_id), str(target_thread_id)
+        if source == target:
+            raise ValueError("cannot copy a thread onto itself")
+        bound = [up_to_checkpoint_id] if up_to_checkpoint_id is not None else []
+        inserted = [0, 0, 0, 0, 0]
+        after: tuple[Any, ...] | None = None
+        try:
+            while True:
+                keys_sql, copy_sql = self._copy_thread_sql(after is None, bool(bound))
+                after_params = keyset_params(after) if after is not None else []
+                with self._cursor(pipeline=True) as cur:
+                    cur.execute(keys_sql, (source, *bound, *after_params, batch_size))
+                    keys = cur.fetchall()
+                    if not keys:
+                        break
+                    last = (keys[-1]["checkpoint_ns_hash"], keys[-1]["checkpoint_id"])
+                    params = (
+                        target,
+                        source,
+                        *bound,
+                        *after_params,
+                        *keyset_params(last),
+                    )
+                    for n, query in enumerate(copy_sql):
+                        cur.execute(query, params)
+                        inserted[n] += cur.rowcount
+                if len(keys) < batch_size:
+                    break
+                after = last
+            if self.checkpoint_heads:
+                with self._cursor(pipeline=True) as cur:
+                    cur.execute(self.DELETE_THREAD_HEADS_SQL, (target,))
+                    cur.execute(self.REBUILD_THREAD_HEADS_SQL, (target,))
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate_threads([target])
+        checkpoints, writes, _, blobs, _ = inserted
+        return CopyResult(checkpoints=checkpoints, writes=writes, blobs=blobs)
+
+    def backfill_channel_versions(self, batch_size: int = 1000) -> int:
+        """Index the channel versions of checkpoints saved before the channel
+        version index was enabled.
+
+        Checkpoints are walked in primary key order, `batch_size` at a time,
+        and each batch is committed on its own, so the backfill can run next
+        to live traffic and be resumed after an interruption. Already indexed
+        checkpoints are left untouched.
+
+        Args:
+            batch_size: The number of checkpoints indexed per transaction.
+
+        Returns:
+            int: The number of checkpoints visited.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        visited = 0
+        after: tuple[Any, ...] | None = None
+        while True:
+            keys_sql, backfill_sql = self._backfill_channel_versions_sql(after is None)
+            after_params = keyset_params(after) if after is not None else []
+            with self._cursor(pipeline=True) as cur:
+                cur.execute(keys_sql, (*after_params, batch_size))
+                keys = cur.fetchall()
+                if not keys:
+                    return visited
+                last = keys[-1]
+                last_key = (
+                    last["thread_id"],
+                    last["checkpoint_ns_hash"],
+                    last["checkpoint_id"],
+                )
+                cur.execute(backfill_sql, (*after_params, *keyset_params(last_key)))
+            visited += len(keys)
+            if len(keys) < batch_size:
+                return visited
+            after = last_key
+
+    def upgrade_legacy_checkpoints(
+        self,
+        batch_size: int = 1000,
+        progress: Callable[[UpgradeResult], None] | None = None,
+    ) -> UpgradeResult:
+        """Rewrite checkpoints saved before the v4 layout, so that reading
+        them no longer needs the pending sends of their parent.
+
+        The pending sends of every legacy checkpoint are moved from its
+        parent's writes into a TASKS channel blob, and version 3 checkpoints
+        are bumped to version 4. Checkpoints are walked in primary key order,
+        `batch_size` at a time, and each batch is committed on its own, so the
+        upgrade can run next to live traffic and be resumed after an
+        interruption. Once a run reports no skipped checkpoints, savers can be
+        created with `legacy_checkpoints=False`.
+
+        Args:
+            batch_size: The number of checkpoints visited per transaction.
+            progress: Called with the running totals after every batch.
+
+        Returns:
+            UpgradeResult: The number of visited, upgraded and skipped
+            checkpoints.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        result = UpgradeResult()
+        claimed: dict[tuple[str, str, str], bytes | None] = {}
+        after: tuple[Any, ...] | None = None
+        try:
+            while True:
+                after_params = keyset_params(after) if after is not None else []
+                with self._cursor(pipeline=True) as cur:
+                    cur.execute(
+                        self._legacy_checkpoints_sql(after is None),
+                        (*after_params, batch_size),
+                    )
+                    rows = cur.fetchall()
+                    if not rows:
+                        return result
+                    legacy = [row for row in rows if row["checkpoint"] is not None]
+                    sends_by_parent: dict[tuple[str, str], list[tuple[str, bytes]]] = {}
+                    for query, params in self._pending_sends_windows(
+                        [row for row in legacy if row["parent_checkpoint_id"]]
+                    ):
+                        cur.execute(query, params)
+                        for sends in cur.fetchall():
+                            sends_by_parent[(params[0], sends["checkpoint_id"])] = (
+                                deserialize_pending_sends(
+                                    sends["sends"], self.json_codec.loads
+                                )
+                            )
+                    updates, blobs, versions, skipped = self._upgrade_legacy_rows(
+                        legacy, sends_by_parent, claimed
+                    )
+                    if blobs:
+                        self._write_blobs(cur, blobs)
+                    for statement in versions:
+                        cur.execute(*statement)
+                    if updates:
+                        cur.executemany(self.UPGRADE_CHECKPOINT_SQL, updates)
+                result = UpgradeResult(
+                    visited=result.visited + len(rows),
+                    upgraded=result.upgraded + len(updates),
+                    skipped=result.skipped + skipped,
+                )
+                if progress is not None:
+                    progress(result)
+                if len(rows) < batch_size:
+                    return result
+                last = rows[-1]
+                after = (
+                    last["thread_id"],
+                    last["checkpoint_ns_hash"],
+                    last["checkpoint_id"],
+                )
+        finally:
+            if self.cache is not None:
+                self.cache.clear()
+
+    @instrumented
+    def prune(self, policy: RetentionPolicy, batch_size: int = 1000) -> PruneResult:
+        """Delete the checkpoints a retention policy does not keep.
+
+        Checkpoints are walked in primary key order, `batch_size` at a time,
+        and the expired checkpoints of each batch are deleted with their
+        pending writes in a transaction of their own. Channel blobs, their
+        chunks and content-addressed blob contents no longer referenced by any
+        remaining checkpoint are then collected the same way. Pruning can run
+        next to live traffic, and an interrupted run is completed by the next one.
+
+        Args:
+            policy: Which checkpoints to keep.
+            batch_size: The number of rows visited per transaction.
+
+        Returns:
+            PruneResult: The number of deleted rows per table.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        try:
+            checkpoints, writes = self._prune_checkpoints(policy, batch_size)
+        finally:
+            if self.cache is not None:
+                self.cache.clear()
+        return PruneResult(
+            checkpoints=checkpoints,
+            writes=writes,
+            blobs=self._delete_unreferenced(
+                self._unreferenced_blobs_sql, batch_size, self._blob_gc_threads
+            ),
+            blob_chunks=self._delete_unreferenced(
+                self._unreferenced_blob_chunks_sql, batch_size
+            ),
+            blob_contents=self._delete_unreferenced(
+                self._unreferenced_blob_contents_sql, batch_size
+            ),
+        )
+
+    def _prune_checkpoints(
+        self, policy: RetentionPolicy, batch_size: int
+    ) -> tuple[int, int]:
+        checkpoints = writes = 0
+        after: tuple[Any, ...] | None = None
+        while True:
+            keys_sql, expired_params = self._prunable_checkpoints_sql(
+                policy, after is None
             )
-            cur.execute(
-                "DELETE FROM checkpoint_writes WHERE thread_id = %s",
-                (str(thread_id),),
+            after_params = keyset_params(after) if after is not None else []
+            with self._cursor(pipeline=True) as cur:
+                cur.execute(keys_sql, (*expired_params, *after_params, batch_size))
+                keys = cur.fetchall()
+                if not keys:
+                    return checkpoints, writes
+                expired = [
+                    param
+                    for key in keys
+                    if key["expired"]
+                    for param in (
+                        key["thread_id"],
+                        key["checkpoint_ns_hash"],
+                        key["checkpoint_id"],
+                    )
+                ]
+                if expired:
+                    num_keys = len(expired) // 3
+                    cur.execute(
+                        self._delete_checkpoint_keys_sql("checkpoints", num_keys),
+                        expired,
+                    )
+                    checkpoints += cur.rowcount
+                    cur.execute(
+                        self._delete_checkpoint_keys_sql("checkpoint_writes", num_keys),
+                        expired,
+                    )
+                    writes += cur.rowcount
+                    for table in ("checkpoint_channel_versions", "checkpoint_heads"):
+                        cur.execute(
+                            self._delete_checkpoint_keys_sql(table, num_keys), expired
+                        )
+            if len(keys) < batch_size:
+                return checkpoints, writes
+            last = keys[-1]
+            after = (
+                last["thread_id"],
+                last["checkpoint_ns_hash"],
+                last["checkpoint_id"],
             )
 
+    def _delete_unreferenced(
+        self,
+        statements: Callable[[bool], tuple[str, str]],
+        batch_size: int,
+        bounds: Callable[[Sequence[Any] | None, Sequence[Any]], Sequence[Any]]
+        | None = None,
+    ) -> int:
+        """Walk a table in key order, deleting unreferenced rows per batch.
+
+        `bounds` gives the parameters the delete takes after its keyset ones,
+        from the keys the batch starts after and ends at.
+        """
+        deleted = 0
+        after: Sequence[Any] | None = None
+        while True:
+            keys_sql, delete_sql = statements(after is None)
+            after_params = keyset_params(after) if after is not None else []
+            with self._cursor(pipeline=True) as cur:
+                cur.execute(keys_sql, (*after_params, batch_size))
+                keys = cur.fetchall()
+                if not keys:
+                    return deleted
+                last = tuple(keys[-1].values())
+                extra = bounds(after, last) if bounds is not None else []
+                cur.execute(delete_sql, (*after_params, *keyset_params(last), *extra))
+                deleted += cur.rowcount
+            if len(keys) < batch_size:
+                return deleted
+            after = last
+
     def _load_checkpoint_tuple(self, value: dict[str, Any]) -> CheckpointTuple:
         """
         Convert a database row into a CheckpointTuple object.
@@ -410,32 +1345,4 @@ class BaseSyncMySQLSaver(BaseMySQLSaver, Generic[_internal.C, _internal.R]):
             including its configuration, metadata, parent checkpoint (if any),
             and pending writes.
         """
-        return CheckpointTuple(
-            {
-                "configurable": {
-                    "thread_id": value["thread_id"],
-                    "checkpoint_ns": value["checkpoint_ns"],
-                    "checkpoint_id": value["checkpoint_id"],
-                }
-            },
-            {
-                **value["checkpoint"],
-                "channel_values": {
-                    **value["checkpoint"].get("channel_values"),
-                    **self._load_blobs(value["channel_values"]),
-                },
-            },
-            self._load_metadata(value["metadata"]),
-            (
-                {
-                    "configurable": {
-                        "thread_id": value["thread_id"],
-                        "checkpoint_ns": value["checkpoint_ns"],
-                        "checkpoint_id": value["parent_checkpoint_id"],
-                    }
-                }
-                if value["parent_checkpoint_id"]
-                else None
-            ),
-            self._load_writes(deserialize_pending_writes(value["pending_writes"])),
-        )
+        return self._make_checkpoint_tuple(value)
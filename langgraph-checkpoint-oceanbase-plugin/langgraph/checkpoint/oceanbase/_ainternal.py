@@ -31,7 +31,11 @@ class AsyncDictCursor(AbstractAsyncContextManager, Protocol):
         self, operation: str, seq_of_parameters: Sequence[Sequence[Any]], /
     ) -> object: ...
     async def fetchone(self) -> dict[str, Any] | None: ...
+    async def fetchmany(self, size: int = ...) -> Sequence[dict[str, Any]]: ...
     async def fetchall(self) -> Sequence[dict[str, Any]]: ...
+    async def nextset(self) -> bool | None: ...
+    @property
+    def rowcount(self) -> Any: ...
 
     def __aiter__(self) -> AsyncIterator[dict[str, Any]]: ...
 
@@ -0,0 +1,130 @@
+"""Coalescing of concurrent pending-write batches into shared transactions.
+
+Tasks of the same superstep call `put_writes` at nearly the same time. Instead
+of a begin/commit round trip per task, submissions that arrive within a short
+window are handed to a single flush, which writes them in one transaction.
+Every submitter blocks until that transaction has committed (or re-raises the
+error it failed with), so `put_writes` keeps its durability guarantee.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from concurrent.futures import Future
+from typing import Any
+
+# (upsert, rows): whether the rows replace existing writes or are ignored on
+# conflict, and the parameter tuples produced by `_dump_writes`.
+WriteBatch = tuple[bool, Sequence[tuple[Any, ...]]]
+
+
+class WriteCoalescer:
+    """Groups writes submitted from several threads.
+
+    The first submitter of a round becomes its leader: it waits until `window`
+    seconds have passed or `max_rows` rows are pending, then flushes everything
+    submitted so far. Submitters arriving during the flush start the next round.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[Sequence[WriteBatch]], None],
+        *,
+        window: float,
+        max_rows: int,
+    ) -> None:
+        self.flush = flush
+        self.window = window
+        self.max_rows = max_rows
+        self._cond = threading.Condition()
+        self._pending: list[tuple[WriteBatch, Future[None]]] = []
+        self._rows = 0
+        self._leading = False
+
+    def submit(self, upsert: bool, rows: Sequence[tuple[Any, ...]]) -> None:
+        future: Future[None] = Future()
+        with self._cond:
+            self._pending.append(((upsert, rows), future))
+            self._rows += len(rows)
+            lead = not self._leading
+            if lead:
+                self._leading = True
+            elif self._rows >= self.max_rows:
+                self._cond.notify_all()
+        if lead:
+            self._lead()
+        future.result()
+
+    def _lead(self) -> None:
+        with self._cond:
+            deadline = time.monotonic() + self.window
+            while self._rows < self.max_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            pending, self._pending, self._rows = self._pending, [], 0
+            self._leading = False
+        try:
+            self.flush([batch for batch, _ in pending])
+        except BaseException as exc:
+            for _, future in pending:
+                future.set_exception(exc)
+        else:
+            for _, future in pending:
+                future.set_result(None)
+
+
+class AsyncWriteCoalescer:
+    """Groups writes submitted from several tasks of one event loop.
+
+    The flush of a round runs in its own task, so cancelling a submitter does
+    not drop the writes of the others.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[Sequence[WriteBatch]], Awaitable[None]],
+        *,
+        window: float,
+        max_rows: int,
+    ) -> None:
+        self.flush = flush
+        self.window = window
+        self.max_rows = max_rows
+        self._full = asyncio.Event()
+        self._pending: list[tuple[WriteBatch, asyncio.Future[None]]] = []
+        self._rows = 0
+        self._leader: asyncio.Task[None] | None = None
+
+    async def submit(self, upsert: bool, rows: Sequence[tuple[Any, ...]]) -> None:
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._pending.append(((upsert, rows), future))
+        self._rows += len(rows)
+        if self._rows >= self.max_rows:
+            self._full.set()
+        if self._leader is None:
+            self._leader = asyncio.ensure_future(self._lead())
+        await future
+
+    async def _lead(self) -> None:
+        try:
+            await asyncio.wait_for(self._full.wait(), self.window)
+        except asyncio.TimeoutError:
+            pass
+        pending, self._pending, self._rows = self._pending, [], 0
+        self._full.clear()
+        self._leader = None
+        try:
+            await self.flush([batch for batch, _ in pending])
+        except BaseException as exc:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for _, future in pending:
+                if not future.done():
+                    future.set_result(None)
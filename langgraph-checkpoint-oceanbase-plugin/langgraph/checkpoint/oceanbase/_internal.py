@@ -30,7 +30,11 @@ class DictCursor(AbstractContextManager, Protocol):
         self, operation: str, seq_of_parameters: Sequence[Sequence[Any]], /
     ) -> object: ...
     def fetchone(self) -> dict[str, Any] | None: ...
+    def fetchmany(self, size: int = ...) -> Sequence[dict[str, Any]]: ...
     def fetchall(self) -> Sequence[dict[str, Any]]: ...
+    def nextset(self) -> bool | None: ...
+    @property
+    def rowcount(self) -> Any: ...
 
 
 R = TypeVar("R", bound=DictCursor)  # cursor type
@@ -59,9 +63,18 @@ ConnectionFactory = Callable[[], Any]
 Conn = Union[C, ConnectionFactory]
 
 
+def is_shared_connection(conn: Conn[C]) -> bool:
+    """Whether `conn` is a single connection shared by every caller.
+
+    Connection factories and SQLAlchemy pools hand out a separate connection
+    per call, so callers using them don't need to be serialized.
+    """
+    return hasattr(conn, "cursor")
+
+
 @contextmanager
 def get_connection(conn: Conn[C]) -> Iterator[C]:
-    if hasattr(conn, "cursor"):
+    if is_shared_connection(conn):
         yield cast(C, conn)
     elif callable(conn):
         _conn = conn()
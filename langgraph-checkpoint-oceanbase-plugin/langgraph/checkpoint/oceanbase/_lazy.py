@@ -0,0 +1,203 @@
+"""Containers that deserialize checkpoint values on first access.
+
+`LazyChannelValues` and `LazyPendingWrites` are drop-in replacements for the
+dict of channel values and the list of pending writes of a `CheckpointTuple`.
+They keep the serialized (type, bytes) pairs read from the database and only
+call `serde.loads_typed` for a channel or write when it is actually read. Any
+operation that needs every value (comparison, repr, copy, pickling, ...)
+deserializes everything first.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, SupportsIndex, overload
+
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+
+class _Serialized:
+    __slots__ = ("type", "data")
+
+    def __init__(self, type_: str, data: bytes) -> None:
+        self.type = type_
+        self.data = data
+
+
+class LazyChannelValues(dict):
+    """Channel values whose blobs are deserialized per channel on access."""
+
+    __slots__ = ("_serde",)
+
+    def __init__(
+        self,
+        serde: SerializerProtocol,
+        values: Mapping[str, Any],
+        blobs: Iterable[tuple[str, str, bytes | None]],
+    ) -> None:
+        super().__init__(values)
+        self._serde = serde
+        for channel, type_, data in blobs:
+            if type_ != "empty" and data is not None:
+                dict.__setitem__(self, channel, _Serialized(type_, data))
+
+    def __getitem__(self, key: str) -> Any:
+        value = dict.__getitem__(self, key)
+        if isinstance(value, _Serialized):
+            value = self._serde.loads_typed((value.type, value.data))
+            dict.__setitem__(self, key, value)
+        return value
+
+    def _materialize(self) -> None:
+        for key in dict.keys(self):
+            self[key]
+
+    # dict's C implementation reads values directly, so every method that
+    # returns or compares values goes through __getitem__ or _materialize.
+    def __iter__(self) -> Iterator[str]:
+        return dict.__iter__(self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key in self:
+            self[key]
+        return dict.pop(self, key, *default)
+
+    def popitem(self) -> tuple[str, Any]:
+        self._materialize()
+        return dict.popitem(self)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def values(self) -> Any:
+        self._materialize()
+        return dict.values(self)
+
+    def items(self) -> Any:
+        self._materialize()
+        return dict.items(self)
+
+    def copy(self) -> dict[str, Any]:
+        return {key: self[key] for key in dict.keys(self)}
+
+    def __eq__(self, other: object) -> bool:
+        self._materialize()
+        if isinstance(other, LazyChannelValues):
+            other._materialize()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __or__(self, other: Any) -> Any:
+        return self.copy() | other
+
+    def __ror__(self, other: Any) -> Any:
+        return other | self.copy()
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
+    def __reduce__(self) -> Any:
+        return (dict, (self.copy(),))
+
+
+class _SerializedWrite:
+    __slots__ = ("task_id", "channel", "type", "data")
+
+    def __init__(self, task_id: str, channel: str, type_: str, data: bytes) -> None:
+        self.task_id = task_id
+        self.channel = channel
+        self.type = type_
+        self.data = data
+
+
+class LazyPendingWrites(list):
+    """Pending writes whose values are deserialized per write on access."""
+
+    __slots__ = ("_serde",)
+
+    def __init__(
+        self,
+        serde: SerializerProtocol,
+        writes: Iterable[tuple[str, str, str, bytes]],
+    ) -> None:
+        super().__init__(_SerializedWrite(*write) for write in writes)
+        self._serde = serde
+
+    def _load(self, index: int) -> tuple[str, str, Any]:
+        write = list.__getitem__(self, index)
+        if isinstance(write, _SerializedWrite):
+            write = (
+                write.task_id,
+                write.channel,
+                self._serde.loads_typed((write.type, write.data)),
+            )
+            list.__setitem__(self, index, write)
+        return write
+
+    def _materialize(self) -> list[tuple[str, str, Any]]:
+        return [self._load(index) for index in range(len(self))]
+
+    @overload
+    def __getitem__(self, index: SupportsIndex) -> tuple[str, str, Any]: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[tuple[str, str, Any]]: ...
+    def __getitem__(self, index: SupportsIndex | slice) -> Any:
+        if isinstance(index, slice):
+            return self._materialize()[index]
+        position = index.__index__()
+        return self._load(position + len(self) if position < 0 else position)
+
+    def __iter__(self) -> Iterator[tuple[str, str, Any]]:
+        for index in range(len(self)):
+            yield self._load(index)
+
+    def __reversed__(self) -> Iterator[tuple[str, str, Any]]:
+        for index in reversed(range(len(self))):
+            yield self._load(index)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._materialize()
+
+    def index(self, item: Any, *args: Any) -> int:
+        return self._materialize().index(item, *args)
+
+    def count(self, item: Any) -> int:
+        return self._materialize().count(item)
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        self._materialize()
+        list.sort(self, *args, **kwargs)
+
+    def pop(self, index: SupportsIndex = -1) -> tuple[str, str, Any]:
+        write = self[index]
+        list.pop(self, index)
+        return write
+
+    def copy(self) -> list[tuple[str, str, Any]]:
+        return self._materialize()
+
+    def __add__(self, other: Any) -> Any:
+        return self._materialize() + other
+
+    def __radd__(self, other: Any) -> Any:
+        return other + self._materialize()
+
+    def __eq__(self, other: object) -> bool:
+        return self._materialize() == other
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __repr__(self) -> str:
+        return repr(self._materialize())
+
+    def __reduce__(self) -> Any:
+        return (list, (self._materialize(),))
@@ -7,6 +7,7 @@ from contextlib import asynccontextmanager
 from typing import Any, cast
 
 import aiomysql  # type: ignore
+from pymysql.constants import CLIENT
 from typing_extensions import Self, override
 
 from langgraph.checkpoint.oceanbase import _ainternal
@@ -43,11 +44,14 @@ class AIOMySQLSaver(BaseAsyncMySQLSaver[aiomysql.Connection, aiomysql.DictCursor
         conn_string: str,
         *,
         serde: SerializerProtocol | None = None,
+        **kwargs: Any,
     ) -> AsyncIterator[Self]:
         """Create a new AIOMySQLSaver instance from a connection string.
 
         Args:
             conn_string: The MySQL connection info string.
+            serde: The serializer used for channel values and pending writes.
+            **kwargs: Additional options passed on to the saver constructor.
 
         Returns:
             AIOMySQLSaver: A new AIOMySQLSaver instance.
@@ -58,14 +62,24 @@ class AIOMySQLSaver(BaseAsyncMySQLSaver[aiomysql.Connection, aiomysql.DictCursor
         async with aiomysql.connect(
             **cls.parse_conn_string(conn_string),
             autocommit=True,
+            client_flag=(
+                CLIENT.MULTI_STATEMENTS if kwargs.get("read_engine") == "binary" else 0
+            ),
         ) as conn:
-            yield cls(conn=conn, serde=serde)
+            yield cls(conn=conn, serde=serde, **kwargs)
 
     @override
     @staticmethod
     def _get_cursor_from_connection(conn: aiomysql.Connection) -> aiomysql.DictCursor:
         return cast(aiomysql.DictCursor, conn.cursor(aiomysql.DictCursor))
 
+    @override
+    @staticmethod
+    def _get_streaming_cursor_from_connection(
+        conn: aiomysql.Connection,
+    ) -> aiomysql.DictCursor:
+        return cast(aiomysql.DictCursor, conn.cursor(aiomysql.SSDictCursor))
+
 
 class ShallowAIOMySQLSaver(
     BaseShallowAsyncMySQLSaver[aiomysql.Connection, aiomysql.DictCursor]
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import contextvars
+import functools
+import time
 from collections import defaultdict
-from collections.abc import AsyncIterator, Iterator, Sequence
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from concurrent.futures import Executor
 from contextlib import asynccontextmanager
-from typing import Any, Generic
+from typing import Any, Generic, TypeVar
 
 from langchain_core.runnables import RunnableConfig
 
@@ -19,57 +22,370 @@ from langgraph.checkpoint.base import (
     get_checkpoint_metadata,
 )
 from langgraph.checkpoint.oceanbase import _ainternal
-from langgraph.checkpoint.oceanbase.base import BaseMySQLSaver
+from langgraph.checkpoint.oceanbase._coalesce import AsyncWriteCoalescer, WriteBatch
+from langgraph.checkpoint.oceanbase.base import (
+    BaseMySQLSaver,
+    ChannelVersionIndex,
+    CheckpointPage,
+    CopyResult,
+    DecodedRow,
+    ReadEngine,
+    UpgradeResult,
+    decode_row,
+)
+from langgraph.checkpoint.oceanbase.cache import CheckpointCache
+from langgraph.checkpoint.oceanbase.instrumentation import (
+    SpanCallback,
+    current_span,
+    instrument_async_cursor,
+    instrumented,
+)
+from langgraph.checkpoint.oceanbase.jsoncodec import JsonCodec
+from langgraph.checkpoint.oceanbase.retention import PruneResult, RetentionPolicy
 from langgraph.checkpoint.oceanbase.utils import (
-    deserialize_channel_values,
+    approximate_size,
     deserialize_pending_sends,
-    deserialize_pending_writes,
+    keyset_params,
 )
 from langgraph.checkpoint.serde.base import SerializerProtocol
 
+T = TypeVar("T")
+
 
 class BaseAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainternal.R]):
     lock: asyncio.Lock
+    write_coalescer: AsyncWriteCoalescer | None
+    encode_executor: Executor | None
+    offload_threshold: int
 
     def __init__(
         self,
         conn: _ainternal.Conn[_ainternal.C],
         serde: SerializerProtocol | None = None,
+        *,
+        read_engine: ReadEngine = "json",
+        channel_version_index: ChannelVersionIndex = "off",
+        checkpoint_heads: bool = False,
+        write_batch_window: float | None = None,
+        write_batch_max_rows: int = 1000,
+        content_addressed_blobs: bool = False,
+        stream_list: bool = False,
+        lazy_load: bool = False,
+        delete_batch_size: int | None = None,
+        partitions: int | None = None,
+        cache: CheckpointCache | None = None,
+        indexed_metadata: Sequence[str] = (),
+        instrument: SpanCallback | None = None,
+        legacy_checkpoints: bool = True,
+        decode_executor: Executor | None = None,
+        blob_chunk_size: int | None = None,
+        json_codec: JsonCodec | None = None,
+        encode_executor: Executor | None = None,
+        offload_threshold: int = 64 * 1024,
     ) -> None:
-        super().__init__(serde=serde)
+        """Create a saver on top of a connection or connection pool.
+
+        Args:
+            conn: A connection or a connection pool.
+            serde: The serializer used for channel values and pending writes.
+            read_engine: "json" (the default) aggregates channel values and
+                pending writes on the server. "binary" fetches them as raw
+                result sets in one multi-statement round trip, which requires a
+                connection opened with CLIENT.MULTI_STATEMENTS.
+            channel_version_index: "off" (the default) resolves the channel
+                blobs of a checkpoint from its JSON. "write" also records the
+                channel versions of every saved checkpoint in
+                checkpoint_channel_versions, and "read" additionally looks blobs
+                up through that table. Checkpoints saved before the index was
+                enabled need `abackfill_channel_versions` before switching to
+                "read".
+            checkpoint_heads: Whether to keep a pointer to the latest
+                checkpoint of every thread in checkpoint_heads and resolve
+                `aget_tuple` without a checkpoint id through it. Threads
+                without a head fall back to the newest checkpoint id. Every
+                saver writing to the same database must enable it, otherwise
+                heads go stale; `arebuild_checkpoint_heads` repairs them.
+            write_batch_window: If set, `aput_writes` calls arriving within this
+                many seconds of each other are written in one transaction with
+                multi-row statements. Each call still returns only after that
+                transaction has committed, and fails if it fails. Disabled if
+                None.
+            write_batch_max_rows: The number of pending write rows that flushes
+                a batch before its window has passed, and the maximum number of
+                rows per statement.
+            content_addressed_blobs: Whether to store each distinct serialized
+                channel value once in checkpoint_blob_contents, keyed by the
+                SHA-256 of its type and bytes, and only reference it from
+                checkpoint_blobs. Values whose bytes are already stored are not
+                sent again. Blobs in either layout can always be read.
+            stream_list: Whether `alist` reads checkpoints through an
+                unbuffered cursor and yields them as they arrive instead of
+                loading the whole result first. Streaming always uses the
+                "json" read engine.
+            lazy_load: Whether channel values and pending writes of loaded
+                checkpoints are deserialized when first accessed instead of
+                when the checkpoint is read. Useful when callers of `alist`
+                mostly look at configs and metadata.
+            delete_batch_size: If set, `adelete_thread` and
+                `adelete_threads` delete at most this many rows per statement and commit after
+                each one instead of deleting threads in a single transaction.
+                Checkpoints are deleted oldest first, so a thread keeps its
+                latest checkpoint until the deletion is nearly complete.
+            partitions: If set, the checkpoint tables are hash partitioned by
+                thread_id into this many partitions, so that the threads of a
+                multi-node OceanBase cluster are spread over several tablet
+                leaders. `setup` partitions the tables it creates, and only
+                warns about existing tables with another partition count.
+                `arepartition` rebuilds those, once.
+            cache: A `CheckpointCache` serving `aget_tuple` from memory for
+                checkpoints recently saved or read through this saver.
+            indexed_metadata: Metadata keys frequently used in `filter`. `setup`
+                adds an indexed generated column of checkpoints for each of
+                them, which `alist` then uses for equality filters on string,
+                integer and boolean values.
+            instrument: A callback receiving a `Span` with the round trips,
+                rows, payload bytes, serde time and lock wait of every
+                `aput`, `aget_tuple`, `alist`, ... call, e.g. a `SpanAggregator`.
+            legacy_checkpoints: Whether the database may hold checkpoints saved
+                before the v4 layout, whose pending sends are read from their
+                parent's writes. Set it to False once
+                `aupgrade_legacy_checkpoints` has run without skipping any, so
+                that reads never issue that extra query.
+            decode_executor: A thread or process pool on which `alist`
+                deserializes the channel blobs and pending writes of the
+                checkpoints it returns in parallel, in order. Without one,
+                the default thread pool is used. A process pool requires a
+                picklable serializer.
+            blob_chunk_size: If set, serialized channel values larger than
+                this many bytes are stored in chunks of that size in
+                checkpoint_blob_chunks and reassembled when read, so that a
+                single value never has to fit in one `max_allowed_packet`.
+                Smaller values stay inline. Chunked values can always be read.
+            json_codec: The codec of the checkpoint and metadata JSON, and of
+                the channel values and pending writes aggregated by reads.
+                Defaults to `orjson_codec()`.
+            encode_executor: The executor on which `aput` and `aput_writes`
+                serialize large values, e.g. a `ThreadPoolExecutor` bounding
+                how many serializations run at once. Defaults to the default
+                thread pool.
+            offload_threshold: Values estimated to serialize to fewer bytes
+                than this, and checkpoints read with fewer bytes of channel
+                values and pending writes, are (de)serialized on the event
+                loop, which is cheaper than handing them to a thread. Larger
+                ones are (de)serialized on `encode_executor` or
+                `decode_executor` so that they never block the event loop.
+                0 offloads everything.
+        """
+        if offload_threshold < 0:
+            raise ValueError("offload_threshold must not be negative")
+        super().__init__(
+            serde=serde,
+            read_engine=read_engine,
+            channel_version_index=channel_version_index,
+            checkpoint_heads=checkpoint_heads,
+            write_batch_window=write_batch_window,
+            write_batch_max_rows=write_batch_max_rows,
+            content_addressed_blobs=content_addressed_blobs,
+            stream_list=stream_list,
+            lazy_load=lazy_load,
+            delete_batch_size=delete_batch_size,
+            partitions=partitions,
+            cache=cache,
+            indexed_metadata=indexed_metadata,
+            instrument=instrument,
+            legacy_checkpoints=legacy_checkpoints,
+            decode_executor=decode_executor,
+            blob_chunk_size=blob_chunk_size,
+            json_codec=json_codec,
+        )
 
         self.conn = conn
         self.lock = asyncio.Lock()
         self.loop = asyncio.get_running_loop()
+        self.write_coalescer = (
+            AsyncWriteCoalescer(
+                self._flush_writes,
+                window=write_batch_window,
+                max_rows=write_batch_max_rows,
+            )
+            if write_batch_window is not None
+            else None
+        )
+        self.encode_executor = encode_executor
+        self.offload_threshold = offload_threshold
 
     @staticmethod
     def _get_cursor_from_connection(conn: _ainternal.C) -> _ainternal.R:
         raise NotImplementedError
 
+    @staticmethod
+    def _get_streaming_cursor_from_connection(conn: _ainternal.C) -> _ainternal.R:
+        raise NotImplementedError
+
+    async def _fetch_rows(
+        self, cur: _ainternal.R, where: str, args: dict[str, Any], suffix: str = ""
+    ) -> list[dict[str, Any]]:
+        """Select checkpoints with their channel values and pending writes.
+
+        Chunked blobs are reassembled from a single query for all of them.
+
+        Args:
+            cur: The cursor to run the query on.
+            where: The WHERE clause selecting the checkpoints.
+            args: The parameters referenced by `where`.
+            suffix: ORDER BY / LIMIT clauses applied to the checkpoints.
+        """
+        if self.read_engine == "binary":
+            await cur.execute(self._select_binary_sql(where, suffix), args)
+            checkpoints = await cur.fetchall()
+            await cur.nextset()
+            blobs = await cur.fetchall()
+            await cur.nextset()
+            writes = await cur.fetchall()
+            await cur.nextset()
+            values = self._join_binary_rows(checkpoints, blobs, writes)
+        else:
+            await cur.execute(self._select_sql(where) + suffix, args)
+            values = [self._decode_json_row(value) for value in await cur.fetchall()]
+        if refs := self._blob_chunk_refs(values):
+            await cur.execute(*self._select_blob_chunks_sql(refs))
+            chunks = self._group_blob_chunks(refs, await cur.fetchall())
+            self._join_blob_chunks(values, chunks)
+        return values
+
     async def setup(self) -> None:
         """Set up the checkpoint database asynchronously.
 
         This method creates the necessary tables in the MySQL database if they don't
         already exist and runs database migrations. It MUST be called directly by the user
         the first time checkpointer is used.
+
+        The schema version of a database is read in a single query and
+        remembered for the rest of the process, like its partition counts and
+        metadata columns, so later calls for the same database skip them.
+        Pending migrations run while holding a named lock, so that processes
+        starting at the same time migrate the database once. Each migration is
+        recorded as soon as it is applied, so an interrupted setup resumes
+        after the last one.
+        """
+        async with self._cursor() as cur:
+            state = self._schema_state(cur)
+            if not self._schema_current(state):
+                version = await self._read_schema_version(cur)
+                if version < len(self.MIGRATIONS) - 1:
+                    version = await self._migrate(cur)
+                self._check_schema_version(state, version)
+            if self.partitions is not None:
+                if state.partition_counts is None:
+                    await cur.execute(self.SELECT_PARTITION_COUNTS_SQL)
+                    state.partition_counts = {
+                        row["name"]: row["n"] for row in await cur.fetchall()
+                    }
+                self._check_partitions(state.partition_counts)
+            if self.indexed_metadata:
+                if state.metadata_columns is None:
+                    await cur.execute(self.SELECT_METADATA_COLUMNS_SQL)
+                    state.metadata_columns = {
+                        row["name"].lower() for row in await cur.fetchall()
+                    }
+                for sql in self._add_metadata_columns_sql(state.metadata_columns):
+                    await cur.execute(sql)
+                state.metadata_columns.update(
+                    f"metadata_{key}".lower() for key in self.indexed_metadata
+                )
+
+    async def aassert_schema_current(self) -> None:
+        """Raise a RuntimeError if the database needs migrations `setup` would run.
+
+        A cheaper alternative to `setup` for processes that use a database
+        migrated elsewhere, e.g. on cold starts of autoscaled workers: it runs
+        at most one query per database and process, and never takes the
+        migration lock.
         """
         async with self._cursor() as cur:
+            state = self._schema_state(cur)
+            if self._schema_current(state):
+                return
+            version = await self._read_schema_version(cur)
+        self._check_schema_version(state, version)
+
+    async def _read_schema_version(self, cur: _ainternal.R) -> int:
+        """The latest migration applied to the database, -1 if none."""
+        try:
+            await cur.execute(self.SELECT_SCHEMA_VERSION_SQL)
+        except Exception as e:
+            if not self._is_missing_table(e):
+                raise
+            return -1
+        return self._schema_version(await cur.fetchone())
+
+    async def _migrate(self, cur: _ainternal.R) -> int:
+        """Run the pending migrations under the migration lock, returning the
+        new schema version."""
+        async with self._migration_lock(cur):
             await cur.execute(self.MIGRATIONS[0])
-            await cur.execute(
-                "SELECT v FROM checkpoint_migrations ORDER BY v DESC LIMIT 1"
+            # another process may have migrated while we waited for the lock
+            version = await self._read_schema_version(cur)
+            created = version < 0
+            for v in range(version + 1, len(self.MIGRATIONS)):
+                await cur.execute(self.MIGRATIONS[v])
+                await cur.execute(self.INSERT_MIGRATION_SQL, (v,))
+                await cur.execute("COMMIT")
+                version = v
+            if created and self.partitions is not None:
+                # the tables were just created empty, so this rewrites nothing
+                for table in self.PARTITIONED_TABLES:
+                    await cur.execute(self._partition_table_sql(table, self.partitions))
+            return version
+
+    @asynccontextmanager
+    async def _migration_lock(self, cur: _ainternal.R) -> AsyncIterator[None]:
+        """Hold the named lock serializing schema changes across processes."""
+        await cur.execute(
+            self.ACQUIRE_MIGRATION_LOCK_SQL, (self.MIGRATION_LOCK_TIMEOUT,)
+        )
+        row = await cur.fetchone()
+        if not row or not row["acquired"]:
+            raise TimeoutError(
+                "Timed out waiting for another process to migrate the checkpoint schema"
             )
-            row = await cur.fetchone()
-            if row is None:
-                version = -1
-            else:
-                version = row["v"]
-            for v, migration in zip(
-                range(version + 1, len(self.MIGRATIONS)),
-                self.MIGRATIONS[version + 1 :],
-            ):
-                await cur.execute(migration)
-                await cur.execute(f"INSERT INTO checkpoint_migrations (v) VALUES ({v})")
+        try:
+            yield
+        finally:
+            await cur.execute(self.RELEASE_MIGRATION_LOCK_SQL)
+            await cur.fetchone()
+
+    async def arepartition(self, partitions: int | None = None) -> list[str]:
+        """Rebuild the checkpoint tables hash partitioned by thread_id.
+
+        This is the migration path between the unpartitioned layout and any
+        partition count, run once, e.g. from a deploy job. Each table that
+        does not have `partitions` partitions yet is rebuilt with ALTER TABLE
+        ... PARTITION BY KEY, which rewrites all of its rows. `setup` never
+        does this to existing tables, it only warns about them.
+
+        Args:
+            partitions: The number of partitions. Defaults to the `partitions`
+                of the saver.
+
+        Returns:
+            list[str]: The tables that were rebuilt.
+        """
+        partitions = self._repartition_target(partitions)
+        rebuilt: list[str] = []
+        async with self._cursor() as cur, self._migration_lock(cur):
+            for table in self.PARTITIONED_TABLES:
+                await cur.execute(self.SELECT_PARTITION_COUNT_SQL, (table,))
+                row = await cur.fetchone()
+                if (row["n"] if row else 0) != partitions:
+                    await cur.execute(self._partition_table_sql(table, partitions))
+                    rebuilt.append(table)
+            self._schema_state(cur).partition_counts = dict.fromkeys(
+                self.PARTITIONED_TABLES, partitions
+            )
+        return rebuilt
 
+    @instrumented
     async def alist(
         self,
         config: RunnableConfig | None,
@@ -93,26 +409,25 @@ class BaseAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainternal.R]):
             AsyncIterator[CheckpointTuple]: An asynchronous iterator of matching checkpoint tuples.
         """
         where, args = self._search_where(config, filter, before)
-        query = self._select_sql(where) + " ORDER BY checkpoint_id DESC"
+        suffix = " ORDER BY checkpoint_id DESC"
         if limit:
-            query += f" LIMIT {limit}"
-        # if we change this to use .stream() we need to make sure to close the cursor
+            suffix += f" LIMIT {limit}"
+        if self.stream_list:
+            async for value in self._astream(where, args, suffix):
+                yield value
+            return
         async with self._cursor() as cur:
-            await cur.execute(query, args)
-            values = await cur.fetchall()
+            values = await self._fetch_rows(cur, where, args, suffix)
             if not values:
                 return
-            for value in values:
-                value["checkpoint"] = json.loads(value["checkpoint"])
-                value["channel_values"] = deserialize_channel_values(
-                    value["channel_values"]
-                )
             # migrate pending sends if necessary
-            if to_migrate := [
-                v
-                for v in values
-                if v["checkpoint"]["v"] < 4 and v["parent_checkpoint_id"]
-            ]:
+            if self.legacy_checkpoints and (
+                to_migrate := [
+                    v
+                    for v in values
+                    if v["checkpoint"]["v"] < 4 and v["parent_checkpoint_id"]
+                ]
+            ):
                 await cur.execute(
                     self._select_pending_sends_sql(len(to_migrate)),
                     (
@@ -128,13 +443,57 @@ class BaseAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainternal.R]):
                         if value["channel_values"] is None:
                             value["channel_values"] = []
                         self._migrate_pending_sends(
-                            deserialize_pending_sends(sends["sends"]),
+                            deserialize_pending_sends(
+                                sends["sends"], self.json_codec.loads
+                            ),
                             value["checkpoint"],
                             value["channel_values"],
                         )
-            for value in values:
-                yield await self._load_checkpoint_tuple(value)
+            for value, decoded in zip(values, await self._adecode_rows(values)):
+                yield self._make_checkpoint_tuple(value, decoded)
+
+    async def _astream(
+        self, where: str, args: dict[str, Any], suffix: str
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Yield checkpoint tuples as they arrive from an unbuffered cursor.
+
+        The pending sends of legacy checkpoints are fetched up front, in
+        windows, since no other query can run on the connection while the
+        stream is open. For the same reason, threads with chunked blobs are
+        read buffered. The connection stays in use until the iterator is
+        exhausted or closed.
+        """
+        sends_by_parent: dict[tuple[str, str], list[tuple[str, bytes]]] = {}
+        values: list[dict[str, Any]] = []
+        async with self._cursor() as cur:
+            await cur.execute(*self._any_blob_chunk_sql(args))
+            buffered = await cur.fetchone() is not None
+            if self.legacy_checkpoints:
+                await cur.execute(self._select_legacy_parents_sql(where, suffix), args)
+                for query, params in self._pending_sends_windows(await cur.fetchall()):
+                    await cur.execute(query, params)
+                    for sends in await cur.fetchall():
+                        sends_by_parent[(params[0], sends["checkpoint_id"])] = (
+                            deserialize_pending_sends(
+                                sends["sends"], self.json_codec.loads
+                            )
+                        )
+            if buffered:
+                values = await self._fetch_rows(cur, where, args, suffix)
+        if buffered:
+            self._migrate_legacy_rows(values, sends_by_parent)
+            for value, decoded in zip(values, await self._adecode_rows(values)):
+                yield self._make_checkpoint_tuple(value, decoded)
+            return
+        async with self._cursor(streaming=True) as cur:
+            await cur.execute(self._select_sql(where) + suffix, args)
+            while rows := await cur.fetchmany(self.STREAM_FETCH_SIZE):
+                values = [self._decode_json_row(row) for row in rows]
+                self._migrate_legacy_rows(values, sends_by_parent)
+                for value, decoded in zip(values, await self._adecode_rows(values)):
+                    yield self._make_checkpoint_tuple(value, decoded)
 
+    @instrumented
     async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
         """Get a checkpoint tuple from the database asynchronously.
 
@@ -159,32 +518,29 @@ class BaseAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainternal.R]):
                 "checkpoint_id": checkpoint_id,
             }
             where = "WHERE thread_id = %(thread_id)s AND checkpoint_ns_hash = UNHEX(MD5(%(checkpoint_ns)s)) AND checkpoint_id = %(checkpoint_id)s"
+            suffix = ""
         else:
             args = {
                 "thread_id": thread_id,
                 "checkpoint_ns": checkpoint_ns,
             }
-            where = "WHERE thread_id = %(thread_id)s AND checkpoint_ns_hash = UNHEX(MD5(%(checkpoint_ns)s))"
-
-        query = self._select_sql(where)
-        if not checkpoint_id:
-            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+            where, suffix = self._latest_checkpoint_query()
+        if self.cache is not None and (
+            cached := self.cache.get(thread_id, checkpoint_ns, checkpoint_id or None)
+        ):
+            return await self._load_checkpoint_tuple(cached)
         async with self._cursor() as cur:
-            await cur.execute(
-                query,
-                args,
-            )
-            value = await cur.fetchone()
-            if value is None:
+            values = await self._fetch_rows(cur, where, args, suffix)
+            if not values:
                 return None
-
-            value["checkpoint"] = json.loads(value["checkpoint"])
-            value["channel_values"] = deserialize_channel_values(
-                value["channel_values"]
-            )
+            value = values[0]
 
             # migrate pending sends if necessary
-            if value["checkpoint"]["v"] < 4 and value["parent_checkpoint_id"]:
+            if (
+                self.legacy_checkpoints
+                and value["checkpoint"]["v"] < 4
+                and value["parent_checkpoint_id"]
+            ):
                 await cur.execute(
                     self._select_pending_sends_sql(1),
                     (thread_id, value["parent_checkpoint_id"]),
@@ -193,13 +549,168 @@ class BaseAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainternal.R]):
                     if value["channel_values"] is None:
                         value["channel_values"] = []
                     self._migrate_pending_sends(
-                        deserialize_pending_sends(sends["sends"]),
+                        deserialize_pending_sends(
+                            sends["sends"], self.json_codec.loads
+                        ),
                         value["checkpoint"],
                         value["channel_values"],
                     )
 
+            if self.cache is not None:
+                self.cache.add_row(value, latest=not checkpoint_id)
             return await self._load_checkpoint_tuple(value)
 
+    @instrumented
+    async def aget_tuples(
+        self, configs: Sequence[RunnableConfig]
+    ) -> Sequence[CheckpointTuple | None]:
+        """Get the checkpoint tuples of several configs at once.
+
+        Each config selects a checkpoint like in `get_tuple`: the one with its
+        checkpoint_id, or else the latest one of its thread and namespace.
+        Instead of a query per config, the latest checkpoint ids of up to
+        `GET_TUPLES_WINDOW` threads are resolved by one grouped query, and up
+        to that many checkpoints are then read by another.
+
+        Args:
+            configs: The configs to retrieve the checkpoints of.
+
+        Returns:
+            Sequence[Optional[CheckpointTuple]]: The checkpoint tuple of every
+            config, in order, or None where no matching checkpoint was found.
+        """
+        keys = [self._checkpoint_key(config) for config in configs]
+        rows: dict[tuple[str, str, str], dict[str, Any]] = {}
+        latest_ids: dict[tuple[str, str], str] = {}
+        missing_latest: list[tuple[str, str]] = []
+        missing: list[tuple[str, str, str]] = []
+        for thread_id, checkpoint_ns, checkpoint_id in dict.fromkeys(keys):
+            if self.cache is not None and (
+                cached := self.cache.get(thread_id, checkpoint_ns, checkpoint_id)
+            ):
+                if checkpoint_id is None:
+                    latest_ids[(thread_id, checkpoint_ns)] = cached["checkpoint_id"]
+                rows[(thread_id, checkpoint_ns, cached["checkpoint_id"])] = cached
+            elif checkpoint_id is None:
+                missing_latest.append((thread_id, checkpoint_ns))
+            else:
+                missing.append((thread_id, checkpoint_ns, checkpoint_id))
+        if missing or missing_latest:
+            fetched: list[dict[str, Any]] = []
+            async with self._cursor() as cur:
+                resolved: dict[tuple[str, str], str] = {}
+                for query, params in self._latest_checkpoint_ids_windows(
+                    missing_latest
+                ):
+                    await cur.execute(query, params)
+                    resolved.update(
+                        self._match_latest_checkpoint_ids(
+                            missing_latest, await cur.fetchall()
+                        )
+                    )
+                missing.extend(
+                    (*pair, latest_id) for pair, latest_id in resolved.items()
+                )
+                for where, args in self._checkpoint_keys_windows(missing):
+                    fetched.extend(await self._fetch_rows(cur, where, args))
+                await self._amigrate_fetched_rows(cur, fetched)
+            latest_ids.update(resolved)
+            for value in fetched:
+                thread_id, checkpoint_ns = value["thread_id"], value["checkpoint_ns"]
+                rows[(thread_id, checkpoint_ns, value["checkpoint_id"])] = value
+                if self.cache is not None:
+                    self.cache.add_row(
+                        value,
+                        latest=resolved.get((thread_id, checkpoint_ns))
+                        == value["checkpoint_id"],
+                    )
+        decoded = await self._adecode_rows(list(rows.values()))
+        tuples = {
+            key: self._make_checkpoint_tuple(value, row)
+            for (key, value), row in zip(rows.items(), decoded)
+        }
+        return [
+            tuples.get(
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint_id or latest_ids.get((thread_id, checkpoint_ns), ""),
+                )
+            )
+            for thread_id, checkpoint_ns, checkpoint_id in keys
+        ]
+
+    async def _amigrate_fetched_rows(
+        self, cur: _ainternal.R, values: Sequence[dict[str, Any]]
+    ) -> None:
+        """Migrate the pending sends of the legacy checkpoints among rows
+        returned by `_fetch_rows` in place."""
+        if not self.legacy_checkpoints:
+            return
+        to_migrate = [
+            v for v in values if v["checkpoint"]["v"] < 4 and v["parent_checkpoint_id"]
+        ]
+        sends_by_parent: dict[tuple[str, str], list[tuple[str, bytes]]] = {}
+        for query, params in self._pending_sends_windows(to_migrate):
+            await cur.execute(query, params)
+            for sends in await cur.fetchall():
+                sends_by_parent[(params[0], sends["checkpoint_id"])] = (
+                    deserialize_pending_sends(sends["sends"], self.json_codec.loads)
+                )
+        self._migrate_legacy_rows(to_migrate, sends_by_parent)
+
+    @instrumented
+    async def alist_page(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> CheckpointPage:
+        """List checkpoints a page at a time.
+
+        Checkpoints are listed in primary key order, newest first within each
+        thread and namespace, across all threads when `config` is None. Each
+        page resumes after the last checkpoint of the previous one through an
+        index range scan, so it costs the same however deep it is, and is not
+        affected by checkpoints written since.
+
+        Args:
+            config: The thread, and optionally namespace, to list the
+                checkpoints of, or None to list the checkpoints of every
+                thread.
+            filter: Additional filtering criteria for metadata.
+            limit: The maximum number of checkpoints in the page.
+            cursor: The `next_cursor` of the previous page, made by the same
+                `config` and `filter`, or None for the first page.
+
+        Returns:
+            CheckpointPage: The checkpoints of the page and the cursor of the
+            next one, which is None after the last page.
+        """
+        if limit < 1:
+            raise ValueError("limit must be a positive integer")
+        where, args = self._page_where(config, filter, cursor)
+        values: list[dict[str, Any]] = []
+        async with self._cursor() as cur:
+            await cur.execute(
+                self._select_page_keys_sql(where), {**args, "limit": limit + 1}
+            )
+            keys, next_cursor = self._page_keys(await cur.fetchall(), limit)
+            for where, args in self._checkpoint_keys_windows(keys):
+                values.extend(await self._fetch_rows(cur, where, args))
+            await self._amigrate_fetched_rows(cur, values)
+        values = self._order_page_rows(keys, values)
+        return CheckpointPage(
+            [
+                self._make_checkpoint_tuple(value, decoded)
+                for value, decoded in zip(values, await self._adecode_rows(values))
+            ],
+            next_cursor,
+        )
+
+    @instrumented
     async def aput(
         self,
         config: RunnableConfig,
@@ -245,20 +756,24 @@ class BaseAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainternal.R]):
             else:
                 blob_values[k] = copy["channel_values"].pop(k)
 
+        checkpoint_json = self.json_codec.dumps(copy)
+        metadata_json = self._dump_metadata(get_checkpoint_metadata(config, metadata))
+        blobs: Sequence[tuple[str, str, str, str, str, str, bytes | None]] = []
+        # serialized before taking the connection, which is held meanwhile
+        if blob_versions := {k: v for k, v in new_versions.items() if k in blob_values}:
+            blobs = await self._aoffload(
+                approximate_size(
+                    [blob_values[k] for k in blob_versions], self.offload_threshold
+                ),
+                self._dump_blobs,
+                thread_id,
+                checkpoint_ns,
+                blob_values,
+                blob_versions,
+            )
         async with self._cursor(pipeline=True) as cur:
-            if blob_versions := {
-                k: v for k, v in new_versions.items() if k in blob_values
-            }:
-                await cur.executemany(
-                    self.UPSERT_CHECKPOINT_BLOBS_SQL,
-                    await asyncio.to_thread(
-                        self._dump_blobs,
-                        thread_id,
-                        checkpoint_ns,
-                        blob_values,
-                        blob_versions,
-                    ),
-                )
+            if blobs:
+                await self._write_blobs(cur, blobs)
             await cur.execute(
                 self.UPSERT_CHECKPOINTS_SQL,
                 (
@@ -267,12 +782,85 @@ class BaseAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainternal.R]):
                     checkpoint_ns,
                     checkpoint["id"],
                     checkpoint_id,
-                    json.dumps(copy),
-                    self._dump_metadata(get_checkpoint_metadata(config, metadata)),
+                    checkpoint_json,
+                    metadata_json,
                 ),
             )
+            if upsert := self._upsert_channel_versions(
+                thread_id,
+                checkpoint_ns,
+                checkpoint["id"],
+                checkpoint["channel_versions"],
+            ):
+                await cur.execute(*upsert)
+            if self.checkpoint_heads:
+                await cur.execute(
+                    self.UPSERT_CHECKPOINT_HEADS_SQL,
+                    (thread_id, checkpoint_ns, checkpoint["id"]),
+                )
+        self._cache_checkpoint(
+            thread_id,
+            checkpoint_ns,
+            checkpoint,
+            checkpoint_id,
+            checkpoint_json,
+            metadata_json,
+            blobs,
+            blob_values,
+        )
         return next_config
 
+    async def _write_blobs(
+        self,
+        cur: _ainternal.R,
+        blobs: Sequence[tuple[str, str, str, str, str, str, bytes | None]],
+    ) -> None:
+        """Store channel blobs, splitting the values larger than
+        `blob_chunk_size` into chunks and skipping contents that are already
+        stored when `content_addressed_blobs` is enabled.
+
+        Skipped contents are locked until the transaction commits, so `prune`
+        cannot delete them before the rows referencing them exist."""
+        if self.blob_chunk_size is not None:
+            blobs, chunks = self._dump_blob_chunks(blobs)
+            if chunks:
+                await cur.executemany(self.INSERT_BLOB_CHUNKS_SQL, chunks)
+        if not self.content_addressed_blobs:
+            await cur.executemany(self.UPSERT_CHECKPOINT_BLOBS_SQL, blobs)
+            return
+        contents, refs = await self._aoffload(
+            sum(len(blob[6] or b"") for blob in blobs), self._dump_blob_contents, blobs
+        )
+        if contents:
+            await cur.execute(
+                self._select_blob_content_hashes_sql(len(contents)),
+                [content[0] for content in contents],
+            )
+            stored = {row["content_hash"] for row in await cur.fetchall()}
+            if stored:
+                # Only stored contents are locked, as locking the lookup of
+                # missing ones makes writers of the same new content deadlock.
+                await cur.execute(
+                    self._select_blob_content_hashes_sql(len(stored), lock=True),
+                    list(stored),
+                )
+                stored = {row["content_hash"] for row in await cur.fetchall()}
+            if missing := [c for c in contents if c[0] not in stored]:
+                await cur.executemany(self.INSERT_BLOB_CONTENTS_SQL, missing)
+        await cur.executemany(self.UPSERT_CHECKPOINT_BLOB_REFS_SQL, refs)
+
+    async def _aoffload(self, size: int, func: Callable[..., T], *args: Any) -> T:
+        """Call `func` on the event loop if `size` is below
+        `offload_threshold`, and on the `encode_executor` otherwise."""
+        if size < self.offload_threshold:
+            return func(*args)
+        # like asyncio.to_thread, so that serde time is recorded on the span
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self.encode_executor, functools.partial(context.run, func, *args)
+        )
+
+    @instrumented
     async def aput_writes(
         self,
         config: RunnableConfig,
@@ -289,12 +877,14 @@ class BaseAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainternal.R]):
             writes: List of writes to store, each as (channel, value) pair.
             task_id: Identifier for the task creating the writes.
         """
+        upsert = all(w[0] in WRITES_IDX_MAP for w in writes)
         query = (
             self.UPSERT_CHECKPOINT_WRITES_SQL
-            if all(w[0] in WRITES_IDX_MAP for w in writes)
+            if upsert
             else self.INSERT_CHECKPOINT_WRITES_SQL
         )
-        params = await asyncio.to_thread(
+        params = await self._aoffload(
+            approximate_size([w[1] for w in writes], self.offload_threshold),
             self._dump_writes,
             config["configurable"]["thread_id"],
             config["configurable"]["checkpoint_ns"],
@@ -303,8 +893,18 @@ class BaseAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainternal.R]):
             task_path,
             writes,
         )
+        if self.write_coalescer is not None:
+            await self.write_coalescer.submit(upsert, params)
+        else:
+            async with self._cursor(pipeline=True) as cur:
+                await cur.executemany(query, params)
+        self._cache_writes(upsert, params)
+
+    async def _flush_writes(self, batches: Sequence[WriteBatch]) -> None:
+        """Write coalesced `aput_writes` calls in a single transaction."""
         async with self._cursor(pipeline=True) as cur:
-            await cur.executemany(query, params)
+            for query, params in self._batched_writes_sql(batches):
+                await cur.execute(query, params)
 
     async def adelete_thread(self, thread_id: str) -> None:
         """Delete all checkpoints and writes associated with a thread ID.
@@ -313,34 +913,392 @@ class BaseAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainternal.R]):
         Returns:
             None
         """
+        await self.adelete_threads([thread_id])
+
+    @instrumented
+    async def adelete_threads(self, thread_ids: Sequence[str]) -> None:
+        """Delete all checkpoints and writes associated with several thread IDs.
+
+        Up to `DELETE_THREADS_WINDOW` threads are deleted by the same
+        statements. Without a `delete_batch_size`, each group of threads is
+        deleted in one transaction; with one, the rows are deleted in chunks
+        that are committed one at a time, and other tasks get to run between
+        chunks.
+
+        Args:
+            thread_ids: The thread IDs to delete.
+        """
+        try:
+            for window in self._thread_windows(thread_ids):
+                statements = self._delete_threads_sql(len(window))
+                if self.delete_batch_size is None:
+                    async with self._cursor(pipeline=True) as cur:
+                        for query in statements:
+                            await cur.execute(query, window)
+                    continue
+                for query in statements:
+                    while True:
+                        async with self._cursor(pipeline=True) as cur:
+                            await cur.execute(query, (*window, self.delete_batch_size))
+                            deleted = cur.rowcount
+                        if deleted < self.delete_batch_size:
+                            break
+                        await asyncio.sleep(0)
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate_threads(thread_ids)
+
+    async def arebuild_checkpoint_heads(self) -> None:
+        """Recompute the latest checkpoint pointer of every thread.
+
+        Use this after enabling `checkpoint_heads` on a database that already
+        holds checkpoints, or after savers without it have written to it.
+        """
         async with self._cursor(pipeline=True) as cur:
-            await cur.execute(
-                "DELETE FROM checkpoints WHERE thread_id = %s",
-                (str(thread_id),),
-            )
-            await cur.execute(
-                "DELETE FROM checkpoint_blobs WHERE thread_id = %s",
-                (str(thread_id),),
+            await cur.execute("DELETE FROM checkpoint_heads")
+            await cur.execute(self.REBUILD_CHECKPOINT_HEADS_SQL)
+
+    @instrumented
+    async def acopy_thread(
+        self,
+        source_thread_id: str,
+        target_thread_id: str,
+        up_to_checkpoint_id: str | None = None,
+        batch_size: int = 1000,
+    ) -> CopyResult:
+        """Copy the checkpoints of a thread, with their channel blobs and
+        pending writes, to another thread inside the database.
+
+        Nothing goes through the serializer: source checkpoints are walked in
+        primary key order, `batch_size` at a time, and each batch is copied
+        by `INSERT ... SELECT` statements in a transaction of its own.
+        Chunked blobs are copied with their chunks, and content-addressed
+        blobs only get a new reference to their contents.
+        Rows the target thread already has are left untouched, so an
+        interrupted copy is completed by running it again. The target thread
+        should not be written to while it is copied.
+
+        Args:
+            source_thread_id: The thread to copy.
+            target_thread_id: The thread to copy it to.
+            up_to_checkpoint_id: Only copy the checkpoints up to this one, in
+                every namespace, to fork the thread from a past checkpoint.
+            batch_size: The number of checkpoints copied per transaction.
+
+        Returns:
+            CopyResult: The number of inserted rows per table.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        source, target = str(source_thread_id), str(target_thread_id)
+        if source == target:
+            raise ValueError("cannot copy a thread onto itself")
+        bound = [up_to_checkpoint_id] if up_to_checkpoint_id is not None else []
+        inserted = [0, 0, 0, 0, 0]
+        after: tuple[Any, ...] | None = None
+        try:
+            while True:
+                keys_sql, copy_sql = self._copy_thread_sql(after is None, bool(bound))
+                after_params = keyset_params(after) if after is not None else []
+                async with self._cursor(pipeline=True) as cur:
+                    await cur.execute(
+                        keys_sql, (source, *bound, *after_params, batch_size)
+                    )
+                    keys = await cur.fetchall()
+                    if not keys:
+                        break
+                    last = (keys[-1]["checkpoint_ns_hash"], keys[-1]["checkpoint_id"])
+                    params = (
+                        target,
+                        source,
+                        *bound,
+                        *after_params,
+                        *keyset_params(last),
+                    )
+                    for n, query in enumerate(copy_sql):
+                        await cur.execute(query, params)
+                        inserted[n] += cur.rowcount
+                if len(keys) < batch_size:
+                    break
+                after = last
+            if self.checkpoint_heads:
+                async with self._cursor(pipeline=True) as cur:
+                    await cur.execute(self.DELETE_THREAD_HEADS_SQL, (target,))
+                    await cur.execute(self.REBUILD_THREAD_HEADS_SQL, (target,))
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate_threads([target])
+        checkpoints, writes, _, blobs, _ = inserted
+        return CopyResult(checkpoints=checkpoints, writes=writes, blobs=blobs)
+
+    async def abackfill_channel_versions(self, batch_size: int = 1000) -> int:
+        """Index the channel versions of checkpoints saved before the channel
+        version index was enabled.
+
+        Checkpoints are walked in primary key order, `batch_size` at a time,
+        and each batch is committed on its own, so the backfill can run next
+        to live traffic and be resumed after an interruption. Already indexed
+        checkpoints are left untouched.
+
+        Args:
+            batch_size: The number of checkpoints indexed per transaction.
+
+        Returns:
+            int: The number of checkpoints visited.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        visited = 0
+        after: tuple[Any, ...] | None = None
+        while True:
+            keys_sql, backfill_sql = self._backfill_channel_versions_sql(after is None)
+            after_params = keyset_params(after) if after is not None else []
+            async with self._cursor(pipeline=True) as cur:
+                await cur.execute(keys_sql, (*after_params, batch_size))
+                keys = await cur.fetchall()
+                if not keys:
+                    return visited
+                last = keys[-1]
+                last_key = (
+                    last["thread_id"],
+                    last["checkpoint_ns_hash"],
+                    last["checkpoint_id"],
+                )
+                await cur.execute(
+                    backfill_sql, (*after_params, *keyset_params(last_key))
+                )
+            visited += len(keys)
+            if len(keys) < batch_size:
+                return visited
+            after = last_key
+
+    async def aupgrade_legacy_checkpoints(
+        self,
+        batch_size: int = 1000,
+        progress: Callable[[UpgradeResult], None] | None = None,
+    ) -> UpgradeResult:
+        """Rewrite checkpoints saved before the v4 layout, so that reading
+        them no longer needs the pending sends of their parent.
+
+        The pending sends of every legacy checkpoint are moved from its
+        parent's writes into a TASKS channel blob, and version 3 checkpoints
+        are bumped to version 4. Checkpoints are walked in primary key order,
+        `batch_size` at a time, and each batch is committed on its own, so the
+        upgrade can run next to live traffic and be resumed after an
+        interruption. Once a run reports no skipped checkpoints, savers can be
+        created with `legacy_checkpoints=False`.
+
+        Args:
+            batch_size: The number of checkpoints visited per transaction.
+            progress: Called with the running totals after every batch.
+
+        Returns:
+            UpgradeResult: The number of visited, upgraded and skipped
+            checkpoints.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        result = UpgradeResult()
+        claimed: dict[tuple[str, str, str], bytes | None] = {}
+        after: tuple[Any, ...] | None = None
+        try:
+            while True:
+                after_params = keyset_params(after) if after is not None else []
+                async with self._cursor(pipeline=True) as cur:
+                    await cur.execute(
+                        self._legacy_checkpoints_sql(after is None),
+                        (*after_params, batch_size),
+                    )
+                    rows = await cur.fetchall()
+                    if not rows:
+                        return result
+                    legacy = [row for row in rows if row["checkpoint"] is not None]
+                    sends_by_parent: dict[tuple[str, str], list[tuple[str, bytes]]] = {}
+                    for query, params in self._pending_sends_windows(
+                        [row for row in legacy if row["parent_checkpoint_id"]]
+                    ):
+                        await cur.execute(query, params)
+                        for sends in await cur.fetchall():
+                            sends_by_parent[(params[0], sends["checkpoint_id"])] = (
+                                deserialize_pending_sends(
+                                    sends["sends"], self.json_codec.loads
+                                )
+                            )
+                    updates, blobs, versions, skipped = self._upgrade_legacy_rows(
+                        legacy, sends_by_parent, claimed
+                    )
+                    if blobs:
+                        await self._write_blobs(cur, blobs)
+                    for statement in versions:
+                        await cur.execute(*statement)
+                    if updates:
+                        await cur.executemany(self.UPGRADE_CHECKPOINT_SQL, updates)
+                result = UpgradeResult(
+                    visited=result.visited + len(rows),
+                    upgraded=result.upgraded + len(updates),
+                    skipped=result.skipped + skipped,
+                )
+                if progress is not None:
+                    progress(result)
+                if len(rows) < batch_size:
+                    return result
+                last = rows[-1]
+                after = (
+                    last["thread_id"],
+                    last["checkpoint_ns_hash"],
+                    last["checkpoint_id"],
+                )
+        finally:
+            if self.cache is not None:
+                self.cache.clear()
+
+    @instrumented
+    async def aprune(
+        self, policy: RetentionPolicy, batch_size: int = 1000
+    ) -> PruneResult:
+        """Delete the checkpoints a retention policy does not keep.
+
+        Checkpoints are walked in primary key order, `batch_size` at a time,
+        and the expired checkpoints of each batch are deleted with their
+        pending writes in a transaction of their own. Channel blobs, their
+        chunks and content-addressed blob contents no longer referenced by any
+        remaining checkpoint are then collected the same way. Pruning can run
+        next to live traffic, and an interrupted run is completed by the next one.
+
+        Args:
+            policy: Which checkpoints to keep.
+            batch_size: The number of rows visited per transaction.
+
+        Returns:
+            PruneResult: The number of deleted rows per table.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        try:
+            checkpoints, writes = await self._aprune_checkpoints(policy, batch_size)
+        finally:
+            if self.cache is not None:
+                self.cache.clear()
+        return PruneResult(
+            checkpoints=checkpoints,
+            writes=writes,
+            blobs=await self._adelete_unreferenced(
+                self._unreferenced_blobs_sql, batch_size, self._blob_gc_threads
+            ),
+            blob_chunks=await self._adelete_unreferenced(
+                self._unreferenced_blob_chunks_sql, batch_size
+            ),
+            blob_contents=await self._adelete_unreferenced(
+                self._unreferenced_blob_contents_sql, batch_size
+            ),
+        )
+
+    async def _aprune_checkpoints(
+        self, policy: RetentionPolicy, batch_size: int
+    ) -> tuple[int, int]:
+        checkpoints = writes = 0
+        after: tuple[Any, ...] | None = None
+        while True:
+            keys_sql, expired_params = self._prunable_checkpoints_sql(
+                policy, after is None
             )
-            await cur.execute(
-                "DELETE FROM checkpoint_writes WHERE thread_id = %s",
-                (str(thread_id),),
+            after_params = keyset_params(after) if after is not None else []
+            async with self._cursor(pipeline=True) as cur:
+                await cur.execute(
+                    keys_sql, (*expired_params, *after_params, batch_size)
+                )
+                keys = await cur.fetchall()
+                if not keys:
+                    return checkpoints, writes
+                expired = [
+                    param
+                    for key in keys
+                    if key["expired"]
+                    for param in (
+                        key["thread_id"],
+                        key["checkpoint_ns_hash"],
+                        key["checkpoint_id"],
+                    )
+                ]
+                if expired:
+                    num_keys = len(expired) // 3
+                    await cur.execute(
+                        self._delete_checkpoint_keys_sql("checkpoints", num_keys),
+                        expired,
+                    )
+                    checkpoints += cur.rowcount
+                    await cur.execute(
+                        self._delete_checkpoint_keys_sql("checkpoint_writes", num_keys),
+                        expired,
+                    )
+                    writes += cur.rowcount
+                    for table in ("checkpoint_channel_versions", "checkpoint_heads"):
+                        await cur.execute(
+                            self._delete_checkpoint_keys_sql(table, num_keys), expired
+                        )
+            if len(keys) < batch_size:
+                return checkpoints, writes
+            last = keys[-1]
+            after = (
+                last["thread_id"],
+                last["checkpoint_ns_hash"],
+                last["checkpoint_id"],
             )
 
+    async def _adelete_unreferenced(
+        self,
+        statements: Callable[[bool], tuple[str, str]],
+        batch_size: int,
+        bounds: Callable[[Sequence[Any] | None, Sequence[Any]], Sequence[Any]]
+        | None = None,
+    ) -> int:
+        """Walk a table in key order, deleting unreferenced rows per batch.
+
+        `bounds` gives the parameters the delete takes after its keyset ones,
+        from the keys the batch starts after and ends at.
+        """
+        deleted = 0
+        after: Sequence[Any] | None = None
+        while True:
+            keys_sql, delete_sql = statements(after is None)
+            after_params = keyset_params(after) if after is not None else []
+            async with self._cursor(pipeline=True) as cur:
+                await cur.execute(keys_sql, (*after_params, batch_size))
+                keys = await cur.fetchall()
+                if not keys:
+                    return deleted
+                last = tuple(keys[-1].values())
+                extra = bounds(after, last) if bounds is not None else []
+                await cur.execute(
+                    delete_sql, (*after_params, *keyset_params(last), *extra)
+                )
+                deleted += cur.rowcount
+            if len(keys) < batch_size:
+                return deleted
+            after = last
+
     @asynccontextmanager
-    async def _cursor(self, *, pipeline: bool = False) -> AsyncIterator[_ainternal.R]:
+    async def _cursor(
+        self, *, pipeline: bool = False, streaming: bool = False
+    ) -> AsyncIterator[_ainternal.R]:
         """Create a database cursor as a context manager.
 
         Args:
             pipeline: whether to use transaction context manager and handle concurrency
+            streaming: whether to use an unbuffered cursor that fetches rows
+                from the server as they are read
         """
+        span = current_span() if self.instrument is not None else None
+        started = time.perf_counter()
         async with _ainternal.get_connection(self.conn) as conn:
             if pipeline:
                 async with self.lock:
+                    if span is not None:
+                        span.lock_wait += time.perf_counter() - started
                     await conn.begin()
                     try:
                         async with self._get_cursor_from_connection(conn) as cur:
-                            yield cur
+                            yield instrument_async_cursor(cur, span)
                         await conn.commit()
                     except:
                         await conn.rollback()
@@ -348,13 +1306,19 @@ class BaseAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainternal.R]):
             else:
                 async with (
                     self.lock,
-                    self._get_cursor_from_connection(conn) as cur,
+                    (
+                        self._get_streaming_cursor_from_connection(conn)
+                        if streaming
+                        else self._get_cursor_from_connection(conn)
+                    ) as cur,
                 ):
-                    yield cur
+                    if span is not None:
+                        span.lock_wait += time.perf_counter() - started
+                    yield instrument_async_cursor(cur, span)
 
     async def _load_checkpoint_tuple(self, value: dict[str, Any]) -> CheckpointTuple:
-        """
-        Convert a database row into a CheckpointTuple object.
+        """Convert a database row into a CheckpointTuple object, deserializing
+        its blobs and writes off the event loop.
 
         Args:
             value: A row from the database containing checkpoint data.
@@ -364,38 +1328,39 @@ class BaseAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainternal.R]):
             including its configuration, metadata, parent checkpoint (if any),
             and pending writes.
         """
-        return CheckpointTuple(
-            {
-                "configurable": {
-                    "thread_id": value["thread_id"],
-                    "checkpoint_ns": value["checkpoint_ns"],
-                    "checkpoint_id": value["checkpoint_id"],
-                }
-            },
-            {
-                **value["checkpoint"],
-                "channel_values": {
-                    **value["checkpoint"].get("channel_values"),
-                    **self._load_blobs(value["channel_values"]),
-                },
-            },
-            self._load_metadata(value["metadata"]),
-            (
-                {
-                    "configurable": {
-                        "thread_id": value["thread_id"],
-                        "checkpoint_ns": value["checkpoint_ns"],
-                        "checkpoint_id": value["parent_checkpoint_id"],
-                    }
-                }
-                if value["parent_checkpoint_id"]
-                else None
-            ),
-            await asyncio.to_thread(
-                self._load_writes,
-                deserialize_pending_writes(value["pending_writes"]),
-            ),
-        )
+        (decoded,) = await self._adecode_rows([value])
+        return self._make_checkpoint_tuple(value, decoded)
+
+    async def _adecode_rows(
+        self, values: Sequence[dict[str, Any]]
+    ) -> list[DecodedRow | None]:
+        """Deserialize the blobs and writes of rows in parallel, in row order,
+        on the `decode_executor` or the default thread pool, or on the event
+        loop for rows smaller than `offload_threshold`.
+
+        Returns None for every row with `lazy_load`.
+        """
+        if self.lazy_load:
+            return [None] * len(values)
+        loop = asyncio.get_running_loop()
+
+        async def decode(value: dict[str, Any]) -> DecodedRow:
+            args = (self.serde, value["channel_values"], value["pending_writes"])
+            if self._encoded_size(value) < self.offload_threshold:
+                return decode_row(*args)
+            if self.decode_executor is None:
+                return await asyncio.to_thread(decode_row, *args)
+            return await loop.run_in_executor(self.decode_executor, decode_row, *args)
+
+        return await asyncio.gather(*(decode(value) for value in values))
+
+    @staticmethod
+    def _encoded_size(value: dict[str, Any]) -> int:
+        """The serialized size of the channel values and pending writes of a
+        fetched row."""
+        return sum(
+            len(blob or b"") for _, _, blob in value["channel_values"] or ()
+        ) + sum(len(write[3] or b"") for write in value["pending_writes"] or ())
 
     def list(
         self,
@@ -471,6 +1436,50 @@ class BaseAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainternal.R]):
             self.aget_tuple(config), self.loop
         ).result()
 
+    def get_tuples(
+        self, configs: Sequence[RunnableConfig]
+    ) -> Sequence[CheckpointTuple | None]:
+        """Get the checkpoint tuples of several configs at once.
+
+        Args:
+            configs: The configs to retrieve the checkpoints of.
+
+        Returns:
+            Sequence[Optional[CheckpointTuple]]: The checkpoint tuple of every
+            config, in order, or None where no matching checkpoint was found.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.aget_tuples(configs), self.loop
+        ).result()
+
+    def list_page(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> CheckpointPage:
+        """List checkpoints a page at a time.
+
+        Args:
+            config: The thread, and optionally namespace, to list the
+                checkpoints of, or None to list the checkpoints of every
+                thread.
+            filter: Additional filtering criteria for metadata.
+            limit: The maximum number of checkpoints in the page.
+            cursor: The `next_cursor` of the previous page, or None for the
+                first page.
+
+        Returns:
+            CheckpointPage: The checkpoints of the page and the cursor of the
+            next one, which is None after the last page.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.alist_page(config, filter=filter, limit=limit, cursor=cursor),
+            self.loop,
+        ).result()
+
     def put(
         self,
         config: RunnableConfig,
@@ -539,3 +1548,108 @@ class BaseAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainternal.R]):
         return asyncio.run_coroutine_threadsafe(
             self.adelete_thread(thread_id), self.loop
         ).result()
+
+    def delete_threads(self, thread_ids: Sequence[str]) -> None:
+        """Delete all checkpoints and writes associated with several thread IDs.
+
+        Args:
+            thread_ids: The thread IDs to delete.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.adelete_threads(thread_ids), self.loop
+        ).result()
+
+    def backfill_channel_versions(self, batch_size: int = 1000) -> int:
+        """Index the channel versions of checkpoints saved before the channel
+        version index was enabled.
+
+        Args:
+            batch_size: The number of checkpoints indexed per transaction.
+
+        Returns:
+            int: The number of checkpoints visited.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.abackfill_channel_versions(batch_size), self.loop
+        ).result()
+
+    def copy_thread(
+        self,
+        source_thread_id: str,
+        target_thread_id: str,
+        up_to_checkpoint_id: str | None = None,
+        batch_size: int = 1000,
+    ) -> CopyResult:
+        """Copy the checkpoints of a thread, with their channel blobs and
+        pending writes, to another thread inside the database.
+
+        Args:
+            source_thread_id: The thread to copy.
+            target_thread_id: The thread to copy it to.
+            up_to_checkpoint_id: Only copy the checkpoints up to this one, in
+                every namespace, to fork the thread from a past checkpoint.
+            batch_size: The number of checkpoints copied per transaction.
+
+        Returns:
+            CopyResult: The number of inserted rows per table.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.acopy_thread(
+                source_thread_id, target_thread_id, up_to_checkpoint_id, batch_size
+            ),
+            self.loop,
+        ).result()
+
+    def prune(self, policy: RetentionPolicy, batch_size: int = 1000) -> PruneResult:
+        """Delete the checkpoints a retention policy does not keep.
+
+        Args:
+            policy: Which checkpoints to keep.
+            batch_size: The number of rows visited per transaction.
+
+        Returns:
+            PruneResult: The number of deleted rows per table.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.aprune(policy, batch_size), self.loop
+        ).result()
+
+    def upgrade_legacy_checkpoints(
+        self,
+        batch_size: int = 1000,
+        progress: Callable[[UpgradeResult], None] | None = None,
+    ) -> UpgradeResult:
+        """Rewrite checkpoints saved before the v4 layout, so that reading
+        them no longer needs the pending sends of their parent.
+
+        Args:
+            batch_size: The number of checkpoints visited per transaction.
+            progress: Called with the running totals after every batch.
+
+        Returns:
+            UpgradeResult: The number of visited, upgraded and skipped
+            checkpoints.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.aupgrade_legacy_checkpoints(batch_size, progress), self.loop
+        ).result()
+
+    def rebuild_checkpoint_heads(self) -> None:
+        """Recompute the latest checkpoint pointer of every thread."""
+        return asyncio.run_coroutine_threadsafe(
+            self.arebuild_checkpoint_heads(), self.loop
+        ).result()
+
+    def repartition(self, partitions: int | None = None) -> Sequence[str]:
+        """Rebuild the checkpoint tables hash partitioned by thread_id.
+
+        Args:
+            partitions: The number of partitions. Defaults to the `partitions`
+                of the saver.
+
+        Returns:
+            Sequence[str]: The tables that were rebuilt.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.arepartition(partitions), self.loop
+        ).result()
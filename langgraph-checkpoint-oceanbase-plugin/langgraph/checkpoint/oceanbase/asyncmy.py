@@ -7,7 +7,8 @@ from contextlib import asynccontextmanager
 from typing import Any, cast
 
 from asyncmy import Connection, connect  # type: ignore
-from asyncmy.cursors import DictCursor  # type: ignore
+from asyncmy.constants import CLIENT
+from asyncmy.cursors import DictCursor, SSDictCursor  # type: ignore
 from typing_extensions import Self, override
 
 from langgraph.checkpoint.oceanbase.aio_base import BaseAsyncMySQLSaver
@@ -43,11 +44,14 @@ class AsyncMySaver(BaseAsyncMySQLSaver[Connection, DictCursor]):
         conn_string: str,
         *,
         serde: SerializerProtocol | None = None,
+        **kwargs: Any,
     ) -> AsyncIterator[Self]:
         """Create a new AsyncMySaver instance from a connection string.
 
         Args:
             conn_string: The MySQL connection info string.
+            serde: The serializer used for channel values and pending writes.
+            **kwargs: Additional options passed on to the saver constructor.
 
         Returns:
             AsyncMySaver: A new AsyncMySaver instance.
@@ -58,14 +62,22 @@ class AsyncMySaver(BaseAsyncMySQLSaver[Connection, DictCursor]):
         async with connect(
             **cls.parse_conn_string(conn_string),
             autocommit=True,
+            client_flag=(
+                CLIENT.MULTI_STATEMENTS if kwargs.get("read_engine") == "binary" else 0
+            ),
         ) as conn:
-            yield cls(conn=conn, serde=serde)
+            yield cls(conn=conn, serde=serde, **kwargs)
 
     @override
     @staticmethod
     def _get_cursor_from_connection(conn: Connection) -> DictCursor:
         return cast(DictCursor, conn.cursor(DictCursor))
 
+    @override
+    @staticmethod
+    def _get_streaming_cursor_from_connection(conn: Connection) -> DictCursor:
+        return cast(DictCursor, conn.cursor(SSDictCursor))
+
 
 class ShallowAsyncMySaver(BaseShallowAsyncMySQLSaver[Connection, DictCursor]):
     def __init__(
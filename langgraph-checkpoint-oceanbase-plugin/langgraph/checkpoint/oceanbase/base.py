@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import base64
+import hashlib
 import json
 import random
-from collections.abc import Sequence
-from typing import Any, Optional, cast
+import re
+import warnings
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Executor
+from itertools import repeat
+from typing import Any, Literal, NamedTuple, Optional, cast
 
 from langchain_core.runnables import RunnableConfig
 
@@ -11,15 +18,45 @@ from langgraph.checkpoint.base import (
     WRITES_IDX_MAP,
     BaseCheckpointSaver,
     ChannelVersions,
+    Checkpoint,
     CheckpointMetadata,
+    CheckpointTuple,
     get_checkpoint_id,
 )
-from langgraph.checkpoint.oceanbase.utils import mysql_mariadb_branch
+from langgraph.checkpoint.oceanbase._coalesce import WriteBatch
+from langgraph.checkpoint.oceanbase._lazy import LazyChannelValues, LazyPendingWrites
+from langgraph.checkpoint.oceanbase.cache import CheckpointCache
+from langgraph.checkpoint.oceanbase.instrumentation import SpanCallback, TimedSerializer
+from langgraph.checkpoint.oceanbase.jsoncodec import (
+    DEFAULT_JSON_CODEC,
+    JsonCodec,
+    json_dumps,
+    json_loads,
+)
+from langgraph.checkpoint.oceanbase.retention import RetentionPolicy
+from langgraph.checkpoint.oceanbase.utils import (
+    deserialize_channel_values,
+    deserialize_pending_writes,
+    keyset_params,
+    keyset_predicate,
+    mysql_mariadb_branch,
+)
+from langgraph.checkpoint.serde.base import SerializerProtocol
 from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
 from langgraph.checkpoint.serde.types import TASKS
 
 MetadataInput = Optional[dict[str, Any]]
 
+# "json" aggregates blobs and writes into base64 encoded JSON arrays on the
+# server. "binary" fetches them as plain LONGBLOB result sets and joins them on
+# the client, which requires the CLIENT.MULTI_STATEMENTS connection flag.
+ReadEngine = Literal["json", "binary"]
+
+# Whether (thread_id, checkpoint_ns_hash, checkpoint_id, channel, version) rows
+# are recorded in checkpoint_channel_versions ("write") and also used to look up
+# channel blobs instead of exploding the checkpoint JSON on every read ("read").
+ChannelVersionIndex = Literal["off", "write", "read"]
+
 """
 To add a new migration, add a new string to the MIGRATIONS list.
 The position of the migration in the list is the version number.
@@ -81,7 +118,50 @@ MIGRATIONS = [
     "ALTER TABLE checkpoint_writes MODIFY COLUMN `checkpoint_ns` VARCHAR(255) NOT NULL DEFAULT '';",
     """
     ALTER TABLE checkpoint_writes ADD COLUMN task_path VARCHAR(2000) NOT NULL DEFAULT '';
+    """,
+    # Created whatever `channel_version_index` is. The option belongs to a
+    # saver while the schema belongs to the database, which savers with and
+    # without it share, and every saver deletes and prunes the rows of this
+    # table (THREAD_TABLES) so that none are left behind for the savers
+    # reading it.
+    """CREATE TABLE IF NOT EXISTS checkpoint_channel_versions (
+    thread_id VARCHAR(150) NOT NULL,
+    checkpoint_ns_hash BINARY(16) NOT NULL,
+    checkpoint_id VARCHAR(150) NOT NULL,
+    channel VARCHAR(150) NOT NULL,
+    version VARCHAR(150) NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns_hash, checkpoint_id, channel)
+);""",
+    # Created whatever `checkpoint_heads` is, like checkpoint_channel_versions:
+    # every saver deletes and prunes heads, so that a saver without the option
+    # never leaves one pointing to a deleted checkpoint.
+    """CREATE TABLE IF NOT EXISTS checkpoint_heads (
+    thread_id VARCHAR(150) NOT NULL,
+    checkpoint_ns_hash BINARY(16) NOT NULL,
+    checkpoint_id VARCHAR(150) NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns_hash)
+);""",
+    """CREATE TABLE IF NOT EXISTS checkpoint_blob_contents (
+    content_hash BINARY(32) NOT NULL,
+    type VARCHAR(150) NOT NULL,
+    `blob` LONGBLOB NOT NULL,
+    PRIMARY KEY (content_hash)
+);""",
+    """
+    ALTER TABLE checkpoint_blobs ADD COLUMN content_hash BINARY(32) NULL;
+    """,
     """
+    CREATE INDEX checkpoint_blobs_content_hash_idx ON checkpoint_blobs (content_hash);
+    """,
+    """CREATE TABLE IF NOT EXISTS checkpoint_blob_chunks (
+    thread_id VARCHAR(150) NOT NULL,
+    checkpoint_ns_hash BINARY(16) NOT NULL,
+    channel VARCHAR(150) NOT NULL,
+    version VARCHAR(150) NOT NULL,
+    idx INTEGER NOT NULL,
+    `data` LONGBLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns_hash, channel, version, idx)
+);""",
 ]
 
 SELECT_SQL = f"""
@@ -106,12 +186,14 @@ select
         select json_arrayagg(json_array(
             bl.channel,
             bl.type,
-            to_base64(bl.blob)
+            to_base64(coalesce(bl.blob, bc.blob))
         ))
         from channel_versions
         inner join checkpoint_blobs bl
             on bl.channel = channel_versions.channel
             and bl.version = channel_versions.version
+        left join checkpoint_blob_contents bc
+            on bc.content_hash = bl.content_hash
         where bl.thread_id = checkpoints.thread_id
             and bl.checkpoint_ns_hash = checkpoints.checkpoint_ns_hash
             and channel_versions.thread_id = checkpoints.thread_id
@@ -134,6 +216,133 @@ select
     ) as pending_writes
 from checkpoints {{WHERE}} """
 
+# Same as SELECT_SQL, but channel versions come from an index lookup on
+# checkpoint_channel_versions instead of the checkpoint JSON.
+SELECT_INDEXED_SQL = """
+select
+    thread_id,
+    checkpoint,
+    checkpoint_ns,
+    checkpoint_id,
+    parent_checkpoint_id,
+    metadata,
+    (
+        select json_arrayagg(json_array(
+            bl.channel,
+            bl.type,
+            to_base64(coalesce(bl.blob, bc.blob))
+        ))
+        from checkpoint_channel_versions cv
+        inner join checkpoint_blobs bl
+            on bl.thread_id = cv.thread_id
+            and bl.checkpoint_ns_hash = cv.checkpoint_ns_hash
+            and bl.channel = cv.channel
+            and bl.version = cv.version
+        left join checkpoint_blob_contents bc
+            on bc.content_hash = bl.content_hash
+        where cv.thread_id = checkpoints.thread_id
+            and cv.checkpoint_ns_hash = checkpoints.checkpoint_ns_hash
+            and cv.checkpoint_id = checkpoints.checkpoint_id
+    ) as channel_values,
+    (
+        select
+        json_arrayagg(json_array(
+            cw.task_id,
+            cw.channel,
+            cw.type,
+            to_base64(cw.blob),
+            cw.idx
+        ))
+        from checkpoint_writes cw
+        where cw.thread_id = checkpoints.thread_id
+            and cw.checkpoint_ns_hash = checkpoints.checkpoint_ns_hash
+            and cw.checkpoint_id = checkpoints.checkpoint_id
+    ) as pending_writes
+from checkpoints {WHERE} """
+
+# The "binary" read engine sends these three statements in one round trip. Each
+# selects the same checkpoints ({WHERE} {SUFFIX}) and returns raw rows that are
+# joined on the client.
+SELECT_CHECKPOINTS_BINARY_SQL = """
+select
+    thread_id,
+    checkpoint,
+    checkpoint_ns,
+    checkpoint_id,
+    parent_checkpoint_id,
+    metadata
+from checkpoints {WHERE} {SUFFIX}"""
+
+SELECT_BLOBS_BINARY_SQL = """
+with selected as (
+    select thread_id, checkpoint_ns_hash, checkpoint
+    from checkpoints {WHERE} {SUFFIX}
+), channel_versions as (
+    select distinct thread_id, checkpoint_ns_hash, channel, json_unquote(
+        json_extract(checkpoint, concat('$.channel_versions.', '"', channel, '"'))
+    ) as version
+    from selected, json_table(
+        json_keys(checkpoint, '$.channel_versions'),
+        '$[*]' columns (channel VARCHAR(150) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci PATH '$')
+    ) as channels
+)
+select
+    bl.thread_id,
+    bl.checkpoint_ns,
+    bl.channel,
+    bl.version,
+    bl.type,
+    coalesce(bl.`blob`, bc.`blob`) as `blob`
+from channel_versions
+inner join checkpoint_blobs bl
+    on bl.thread_id = channel_versions.thread_id
+    and bl.checkpoint_ns_hash = channel_versions.checkpoint_ns_hash
+    and bl.channel = channel_versions.channel
+    and bl.version = channel_versions.version
+left join checkpoint_blob_contents bc
+    on bc.content_hash = bl.content_hash"""
+
+SELECT_INDEXED_BLOBS_BINARY_SQL = """
+with selected as (
+    select thread_id, checkpoint_ns_hash, checkpoint_id
+    from checkpoints {WHERE} {SUFFIX}
+), channel_versions as (
+    select distinct cv.thread_id, cv.checkpoint_ns_hash, cv.channel, cv.version
+    from selected
+    inner join checkpoint_channel_versions cv
+        on cv.thread_id = selected.thread_id
+        and cv.checkpoint_ns_hash = selected.checkpoint_ns_hash
+        and cv.checkpoint_id = selected.checkpoint_id
+)
+select
+    bl.thread_id,
+    bl.checkpoint_ns,
+    bl.channel,
+    bl.version,
+    bl.type,
+    coalesce(bl.`blob`, bc.`blob`) as `blob`
+from channel_versions
+inner join checkpoint_blobs bl
+    on bl.thread_id = channel_versions.thread_id
+    and bl.checkpoint_ns_hash = channel_versions.checkpoint_ns_hash
+    and bl.channel = channel_versions.channel
+    and bl.version = channel_versions.version
+left join checkpoint_blob_contents bc
+    on bc.content_hash = bl.content_hash"""
+
+SELECT_WRITES_BINARY_SQL = """
+with selected as (
+    select thread_id, checkpoint_ns_hash, checkpoint_id
+    from checkpoints {WHERE} {SUFFIX}
+)
+select cw.thread_id, cw.checkpoint_ns, cw.checkpoint_id, cw.task_id, cw.channel, cw.type, cw.`blob`, cw.idx
+from selected
+inner join checkpoint_writes cw
+    on cw.thread_id = selected.thread_id
+    and cw.checkpoint_ns_hash = selected.checkpoint_ns_hash
+    and cw.checkpoint_id = selected.checkpoint_id
+order by cw.task_id, cw.idx"""
+
 SELECT_PENDING_SENDS_SQL = f"""
 select
     checkpoint_id,
@@ -151,11 +360,92 @@ where thread_id = %s
 group by checkpoint_id
 """
 
+# The legacy (v < 4) checkpoints among those selected by {WHERE} {SUFFIX},
+# whose pending sends have to be migrated from their parent's writes.
+SELECT_LEGACY_PARENTS_SQL = """
+select thread_id, parent_checkpoint_id
+from (
+    select thread_id, parent_checkpoint_id, checkpoint
+    from checkpoints {WHERE} {SUFFIX}
+) as selected
+where parent_checkpoint_id is not null
+    and json_extract(checkpoint, '$.v') < 4
+"""
+
+# Selects the next batch of checkpoint keys for `upgrade_legacy_checkpoints`,
+# with the checkpoint of the legacy (v < 4) ones whose pending sends have not
+# been moved into a TASKS blob yet.
+SELECT_LEGACY_CHECKPOINTS_SQL = f"""
+    SELECT thread_id, checkpoint_ns, checkpoint_ns_hash, checkpoint_id, parent_checkpoint_id,
+        IF(
+            json_extract(checkpoint, '$.v') < 4
+            AND NOT json_contains_path(checkpoint, 'one', '$.channel_versions."{TASKS}"'),
+            checkpoint,
+            NULL
+        ) AS checkpoint
+    FROM checkpoints {{WHERE}}
+    ORDER BY thread_id, checkpoint_ns_hash, checkpoint_id
+    LIMIT %s
+"""
+
+UPGRADE_CHECKPOINT_SQL = """
+    UPDATE checkpoints SET checkpoint = %s
+    WHERE thread_id = %s AND checkpoint_ns_hash = %s AND checkpoint_id = %s
+        AND json_extract(checkpoint, '$.v') < 4
+"""
+
 UPSERT_CHECKPOINT_BLOBS_SQL = """
     INSERT IGNORE INTO checkpoint_blobs (thread_id, checkpoint_ns, checkpoint_ns_hash, channel, version, type, `blob`)
     VALUES (%s, %s, UNHEX(MD5(%s)), %s, %s, %s, %s)
 """
 
+# Content-addressed blob layout: the bytes live once per content hash in
+# checkpoint_blob_contents and the checkpoint_blobs row only references them.
+UPSERT_CHECKPOINT_BLOB_REFS_SQL = """
+    INSERT IGNORE INTO checkpoint_blobs (thread_id, checkpoint_ns, checkpoint_ns_hash, channel, version, type, `blob`, content_hash)
+    VALUES (%s, %s, UNHEX(MD5(%s)), %s, %s, %s, %s, %s)
+"""
+
+SELECT_BLOB_CONTENT_HASHES_SQL = """
+    SELECT content_hash FROM checkpoint_blob_contents WHERE content_hash IN ({PLACEHOLDERS})
+"""
+
+# Locks the stored contents a writer is about to reference without sending
+# their bytes again, until the references are committed. The garbage
+# collection of `prune` waits for the lock, then finds the references, while
+# a content it deleted in the meantime is not returned and is written again.
+LOCK_BLOB_CONTENTS_SQL = SELECT_BLOB_CONTENT_HASHES_SQL + "    FOR UPDATE\n"
+
+INSERT_BLOB_CONTENTS_SQL = """
+    INSERT IGNORE INTO checkpoint_blob_contents (content_hash, type, `blob`)
+    VALUES (%s, %s, %s)
+"""
+
+# Chunked blob layout: values larger than `blob_chunk_size` are stored as
+# numbered rows of checkpoint_blob_chunks, and their checkpoint_blobs row only
+# keeps their type, followed by BLOB_CHUNKS_MARKER and the number of chunks,
+# and no blob.
+BLOB_CHUNKS_MARKER = "+chunked:"
+
+INSERT_BLOB_CHUNKS_SQL = """
+    INSERT IGNORE INTO checkpoint_blob_chunks (thread_id, checkpoint_ns_hash, channel, version, idx, `data`)
+    VALUES (%s, UNHEX(MD5(%s)), %s, %s, %s, %s)
+"""
+
+# Selects the chunks of several chunked blobs, the key of each of them
+# repeating BLOB_CHUNK_REF_PLACEHOLDER.
+SELECT_BLOB_CHUNKS_SQL = """
+    SELECT thread_id, checkpoint_ns_hash, channel, version, idx, `data`
+    FROM checkpoint_blob_chunks
+    WHERE (thread_id, checkpoint_ns_hash, channel, version) IN ({PLACEHOLDERS})
+    ORDER BY thread_id, checkpoint_ns_hash, channel, version, idx
+"""
+
+BLOB_CHUNK_REF_PLACEHOLDER = "(%s, UNHEX(MD5(%s)), %s, %s)"
+
+# Whether a thread, or any thread without {WHERE}, has chunked blobs.
+SELECT_ANY_BLOB_CHUNK_SQL = "SELECT 1 FROM checkpoint_blob_chunks {WHERE} LIMIT 1"
+
 UPSERT_CHECKPOINTS_SQL = f"""
     INSERT INTO checkpoints (thread_id, checkpoint_ns, checkpoint_ns_hash, checkpoint_id, parent_checkpoint_id, checkpoint, metadata)
     VALUES (%s, %s, UNHEX(MD5(%s)), %s, %s, %s, %s) {mysql_mariadb_branch("AS new", "")}
@@ -178,16 +468,1144 @@ INSERT_CHECKPOINT_WRITES_SQL = """
     VALUES (%s, %s, UNHEX(MD5(%s)), %s, %s, %s, %s, %s, %s, %s)
 """
 
+# Multi-row forms of UPSERT_CHECKPOINT_WRITES_SQL and
+# INSERT_CHECKPOINT_WRITES_SQL, used to flush coalesced writes. {VALUES} is
+# replaced by one CHECKPOINT_WRITES_VALUES tuple per row.
+UPSERT_CHECKPOINT_WRITES_BATCH_SQL = f"""
+    INSERT INTO checkpoint_writes (thread_id, checkpoint_ns, checkpoint_ns_hash, checkpoint_id, task_id, task_path, idx, channel, type, `blob`)
+    VALUES {{VALUES}} {mysql_mariadb_branch("AS new", "")}
+    ON DUPLICATE KEY UPDATE
+        channel = {mysql_mariadb_branch("new.channel", "VALUE(channel)")},
+        type = {mysql_mariadb_branch("new.type", "VALUE(type)")},
+        `blob` = {mysql_mariadb_branch("new.blob", "VALUE(`blob`)")}
+"""
+
+INSERT_CHECKPOINT_WRITES_BATCH_SQL = """
+    INSERT IGNORE INTO checkpoint_writes (thread_id, checkpoint_ns, checkpoint_ns_hash, checkpoint_id, task_id, task_path, idx, channel, type, `blob`)
+    VALUES {VALUES}
+"""
+
+CHECKPOINT_WRITES_VALUES = "(%s, %s, UNHEX(MD5(%s)), %s, %s, %s, %s, %s, %s, %s)"
+
+UPSERT_CHANNEL_VERSIONS_SQL = f"""
+    INSERT INTO checkpoint_channel_versions (thread_id, checkpoint_ns_hash, checkpoint_id, channel, version)
+    VALUES {{VALUES}} {mysql_mariadb_branch("AS new", "")}
+    ON DUPLICATE KEY UPDATE
+        version = {mysql_mariadb_branch("new.version", "VALUE(version)")}
+"""
+
+CHANNEL_VERSIONS_VALUES = "(%s, UNHEX(MD5(%s)), %s, %s, %s)"
+
+UPSERT_CHECKPOINT_HEADS_SQL = f"""
+    INSERT INTO checkpoint_heads (thread_id, checkpoint_ns_hash, checkpoint_id)
+    VALUES (%s, UNHEX(MD5(%s)), %s) {mysql_mariadb_branch("AS new", "")}
+    ON DUPLICATE KEY UPDATE
+        checkpoint_id = GREATEST(checkpoint_id, {mysql_mariadb_branch("new.checkpoint_id", "VALUE(checkpoint_id)")})
+"""
+
+REBUILD_CHECKPOINT_HEADS_SQL = """
+    INSERT INTO checkpoint_heads (thread_id, checkpoint_ns_hash, checkpoint_id)
+    SELECT thread_id, checkpoint_ns_hash, max(checkpoint_id)
+    FROM checkpoints
+    GROUP BY thread_id, checkpoint_ns_hash
+"""
+
+# Selects the latest checkpoint of a thread through checkpoint_heads, falling
+# back to the newest checkpoint id for threads that have no head yet.
+LATEST_CHECKPOINT_WHERE = """WHERE thread_id = %(thread_id)s AND checkpoint_ns_hash = UNHEX(MD5(%(checkpoint_ns)s)) AND checkpoint_id = coalesce(
+    (
+        select h.checkpoint_id from checkpoint_heads h
+        where h.thread_id = %(thread_id)s and h.checkpoint_ns_hash = UNHEX(MD5(%(checkpoint_ns)s))
+    ),
+    (
+        select max(c.checkpoint_id) from checkpoints c
+        where c.thread_id = %(thread_id)s and c.checkpoint_ns_hash = UNHEX(MD5(%(checkpoint_ns)s))
+    )
+)"""
+
+# Selects the latest checkpoint id of each (thread_id, checkpoint_ns_hash) pair
+# given in place of {PAIRS}, for `get_tuples`.
+SELECT_LATEST_CHECKPOINT_IDS_SQL = """
+    SELECT thread_id, checkpoint_ns_hash, max(checkpoint_id) AS checkpoint_id
+    FROM checkpoints
+    WHERE (thread_id, checkpoint_ns_hash) IN ({PAIRS})
+    GROUP BY thread_id, checkpoint_ns_hash
+"""
+
+# Selects the checkpoints whose keys are given in place of {KEYS}.
+CHECKPOINT_KEYS_WHERE = (
+    "WHERE (thread_id, checkpoint_ns_hash, checkpoint_id) IN ({KEYS})"
+)
+
+# Selects the keys of a `list_page` page, walking the primary key backwards
+# from the cursor predicate in {WHERE}.
+SELECT_PAGE_KEYS_SQL = """
+    SELECT thread_id, checkpoint_ns, checkpoint_ns_hash, checkpoint_id
+    FROM checkpoints {WHERE}
+    ORDER BY thread_id DESC, checkpoint_ns_hash DESC, checkpoint_id DESC
+    LIMIT %(limit)s
+"""
+
+# Explodes the channel versions of a batch of checkpoints, selected by
+# {WHERE} in primary key order, into checkpoint_channel_versions.
+BACKFILL_CHANNEL_VERSIONS_SQL = """
+    INSERT IGNORE INTO checkpoint_channel_versions (thread_id, checkpoint_ns_hash, checkpoint_id, channel, version)
+    SELECT c.thread_id, c.checkpoint_ns_hash, c.checkpoint_id, channels.channel, json_unquote(
+        json_extract(c.checkpoint, concat('$.channel_versions.', '"', channels.channel, '"'))
+    )
+    FROM checkpoints c, json_table(
+        json_keys(c.checkpoint, '$.channel_versions'),
+        '$[*]' columns (channel VARCHAR(150) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci PATH '$')
+    ) as channels
+    {WHERE}
+"""
+
+SELECT_CHECKPOINT_KEYS_SQL = """
+    SELECT thread_id, checkpoint_ns_hash, checkpoint_id
+    FROM checkpoints {WHERE}
+    ORDER BY thread_id, checkpoint_ns_hash, checkpoint_id
+    LIMIT %s
+"""
+
+CHECKPOINT_KEY_COLUMNS = ("thread_id", "checkpoint_ns_hash", "checkpoint_id")
+
+# Selects the next batch of checkpoint keys for `prune`, flagging the ones the
+# retention policy expires with the {EXPIRED} predicate.
+SELECT_PRUNABLE_CHECKPOINTS_SQL = """
+    SELECT thread_id, checkpoint_ns_hash, checkpoint_id, {EXPIRED} AS expired
+    FROM checkpoints c {WHERE}
+    ORDER BY thread_id, checkpoint_ns_hash, checkpoint_id
+    LIMIT %s
+"""
+
+# Deletes the rows of a checkpoint table belonging to the {KEYS} checkpoints.
+DELETE_CHECKPOINT_KEYS_SQL = """
+    DELETE FROM {TABLE}
+    WHERE (thread_id, checkpoint_ns_hash, checkpoint_id) IN ({KEYS})
+"""
+
+SELECT_SCHEMA_VERSION_SQL = "SELECT max(v) AS v FROM checkpoint_migrations"
+
+INSERT_MIGRATION_SQL = "INSERT INTO checkpoint_migrations (v) VALUES (%s)"
+
+# A named lock held while migrating, so that processes set up at the same time
+# migrate a database once. Lock names are limited to 64 characters, hence the
+# hash of the database name.
+ACQUIRE_MIGRATION_LOCK_SQL = (
+    "SELECT GET_LOCK(concat('checkpoint_migrations_', md5(DATABASE())), %s) AS acquired"
+)
+RELEASE_MIGRATION_LOCK_SQL = (
+    "SELECT RELEASE_LOCK(concat('checkpoint_migrations_', md5(DATABASE()))) AS released"
+)
+
+# The MySQL error raised when reading the schema version of an empty database.
+ER_NO_SUCH_TABLE = 1146
+
+# The tables hash partitioned by thread_id when a saver is created with
+# `partitions`. Their primary keys all start with thread_id, which MySQL
+# requires of a partitioning column, and every query of a single thread
+# filters on it, so it only touches one partition.
+PARTITIONED_TABLES = (
+    "checkpoints",
+    "checkpoint_blobs",
+    "checkpoint_writes",
+    "checkpoint_channel_versions",
+    "checkpoint_heads",
+    "checkpoint_blob_chunks",
+)
+
+SELECT_PARTITION_COUNT_SQL = """
+    SELECT count(partition_name) AS n FROM information_schema.partitions
+    WHERE table_schema = DATABASE() AND table_name = %s
+"""
+
+SELECT_PARTITION_COUNTS_SQL = f"""
+    SELECT table_name AS name, count(partition_name) AS n
+    FROM information_schema.partitions
+    WHERE table_schema = DATABASE()
+        AND table_name IN ({", ".join(f"'{table}'" for table in PARTITIONED_TABLES)})
+    GROUP BY table_name
+"""
+
+PARTITION_TABLE_SQL = (
+    "ALTER TABLE {TABLE} PARTITION BY KEY(thread_id) PARTITIONS {PARTITIONS}"
+)
+
+# Metadata keys declared in `indexed_metadata` are materialized as generated
+# columns of checkpoints, named metadata_<key>, with an index leading with the
+# column. Values longer than the column are truncated, which the json_contains
+# filter kept next to the indexed predicate makes up for.
+SELECT_METADATA_COLUMNS_SQL = r"""
+    SELECT column_name AS name FROM information_schema.columns
+    WHERE table_schema = DATABASE() AND table_name = 'checkpoints'
+        AND column_name LIKE 'metadata\_%'
+"""
+
+ADD_METADATA_COLUMN_SQL = """
+    ALTER TABLE checkpoints
+    ADD COLUMN metadata_{KEY} VARCHAR(150) GENERATED ALWAYS AS (
+        left(json_unquote(json_extract(metadata, '$."{KEY}"')), 150)
+    ) VIRTUAL,
+    ADD INDEX checkpoints_metadata_{KEY}_idx (
+        metadata_{KEY}, thread_id, checkpoint_ns_hash, checkpoint_id
+    )
+"""
+
+METADATA_KEY_PATTERN = re.compile(r"[A-Za-z0-9_]{1,40}")
+
+
+def indexed_metadata_value(value: Any) -> str | None:
+    """The value of a metadata_<key> column for a metadata filter value, or
+    None if the column can't be used to filter on it."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, str):
+        return value[:150]
+    # floats print differently in MySQL, and objects and arrays are matched
+    # by containment rather than equality
+    return None
+
+
+# The tables holding rows of a thread, in the order `delete_threads` empties
+# them, with the primary key order their rows are deleted in. Checkpoints go
+# first and oldest first, so an interrupted chunked deletion never rolls a
+# thread back to an earlier checkpoint.
+THREAD_TABLES = (
+    ("checkpoints", "thread_id, checkpoint_ns_hash, checkpoint_id"),
+    ("checkpoint_writes", "thread_id, checkpoint_ns_hash, checkpoint_id, task_id, idx"),
+    (
+        "checkpoint_channel_versions",
+        "thread_id, checkpoint_ns_hash, checkpoint_id, channel",
+    ),
+    ("checkpoint_heads", "thread_id, checkpoint_ns_hash"),
+    ("checkpoint_blobs", "thread_id, checkpoint_ns_hash, channel, version"),
+    (
+        "checkpoint_blob_chunks",
+        "thread_id, checkpoint_ns_hash, channel, version, idx",
+    ),
+)
+
+DELETE_THREADS_SQL = "DELETE FROM {TABLE} WHERE thread_id IN ({PLACEHOLDERS})"
+
+SELECT_BLOB_KEYS_SQL = """
+    SELECT thread_id, checkpoint_ns_hash, channel, version
+    FROM checkpoint_blobs {WHERE}
+    ORDER BY thread_id, checkpoint_ns_hash, channel, version
+    LIMIT %s
+"""
+
+BLOB_KEY_COLUMNS = ("thread_id", "checkpoint_ns_hash", "channel", "version")
+
+# Deletes the channel blobs in a key range that no checkpoint of their thread
+# refers to in its channel_versions. The referenced versions are extracted once
+# per batch from the checkpoints of the threads the key range spans, which
+# {THREADS} selects, rather than once per blob row.
+DELETE_UNREFERENCED_BLOBS_SQL = """
+    DELETE FROM checkpoint_blobs {WHERE}
+        AND (thread_id, checkpoint_ns_hash, channel, version) NOT IN (
+            SELECT c.thread_id, c.checkpoint_ns_hash, channels.channel, json_unquote(
+                json_extract(c.checkpoint, concat('$.channel_versions.', '"', channels.channel, '"'))
+            )
+            FROM checkpoints c, json_table(
+                json_keys(c.checkpoint, '$.channel_versions'),
+                '$[*]' columns (channel VARCHAR(150) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci PATH '$')
+            ) as channels
+            WHERE {THREADS}
+        )
+"""
+
+# Same as DELETE_UNREFERENCED_BLOBS_SQL, looking references up in
+# checkpoint_channel_versions.
+DELETE_UNINDEXED_BLOBS_SQL = """
+    DELETE FROM checkpoint_blobs {WHERE} AND NOT EXISTS (
+        SELECT 1 FROM checkpoint_channel_versions v
+        WHERE v.thread_id = checkpoint_blobs.thread_id
+            AND v.checkpoint_ns_hash = checkpoint_blobs.checkpoint_ns_hash
+            AND v.channel = checkpoint_blobs.channel
+            AND v.version = checkpoint_blobs.version
+    )
+"""
+
+SELECT_BLOB_CHUNK_KEYS_SQL = """
+    SELECT thread_id, checkpoint_ns_hash, channel, version, idx
+    FROM checkpoint_blob_chunks {WHERE}
+    ORDER BY thread_id, checkpoint_ns_hash, channel, version, idx
+    LIMIT %s
+"""
+
+BLOB_CHUNK_KEY_COLUMNS = (*BLOB_KEY_COLUMNS, "idx")
+
+# Deletes the blob chunks in a key range whose checkpoint_blobs row is gone.
+DELETE_UNREFERENCED_BLOB_CHUNKS_SQL = """
+    DELETE FROM checkpoint_blob_chunks {WHERE} AND NOT EXISTS (
+        SELECT 1 FROM checkpoint_blobs b
+        WHERE b.thread_id = checkpoint_blob_chunks.thread_id
+            AND b.checkpoint_ns_hash = checkpoint_blob_chunks.checkpoint_ns_hash
+            AND b.channel = checkpoint_blob_chunks.channel
+            AND b.version = checkpoint_blob_chunks.version
+    )
+"""
+
+SELECT_BLOB_CONTENT_KEYS_SQL = """
+    SELECT content_hash FROM checkpoint_blob_contents {WHERE}
+    ORDER BY content_hash
+    LIMIT %s
+"""
+
+BLOB_CONTENT_KEY_COLUMNS = ("content_hash",)
+
+# Deletes the blob contents in a key range that no checkpoint_blobs row
+# references. The references are checked by the DELETE itself, so a content
+# only goes once no reference exists at the time it is deleted.
+DELETE_UNREFERENCED_BLOB_CONTENTS_SQL = """
+    DELETE FROM checkpoint_blob_contents {WHERE} AND NOT EXISTS (
+        SELECT 1 FROM checkpoint_blobs b
+        WHERE b.content_hash = checkpoint_blob_contents.content_hash
+    )
+"""
+
+
+# Statements of `copy_thread`. Each copies the rows of a batch of source
+# checkpoints, selected by {WHERE} over the table aliased as s, to the target
+# thread given as their first parameter. Rows the target already has are left
+# untouched, so an interrupted copy is completed by running it again.
+SELECT_THREAD_CHECKPOINT_KEYS_SQL = """
+    SELECT s.checkpoint_ns_hash, s.checkpoint_id
+    FROM checkpoints s {WHERE}
+    ORDER BY s.checkpoint_ns_hash, s.checkpoint_id
+    LIMIT %s
+"""
+
+THREAD_CHECKPOINT_KEY_COLUMNS = ("s.checkpoint_ns_hash", "s.checkpoint_id")
+
+COPY_CHECKPOINTS_SQL = """
+    INSERT IGNORE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_ns_hash, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata)
+    SELECT %s, s.checkpoint_ns, s.checkpoint_ns_hash, s.checkpoint_id, s.parent_checkpoint_id, s.type, s.checkpoint, s.metadata
+    FROM checkpoints s {WHERE}
+"""
+
+COPY_CHECKPOINT_WRITES_SQL = """
+    INSERT IGNORE INTO checkpoint_writes (thread_id, checkpoint_ns, checkpoint_ns_hash, checkpoint_id, task_id, task_path, idx, channel, type, `blob`)
+    SELECT %s, s.checkpoint_ns, s.checkpoint_ns_hash, s.checkpoint_id, s.task_id, s.task_path, s.idx, s.channel, s.type, s.`blob`
+    FROM checkpoint_writes s {WHERE}
+"""
+
+COPY_CHANNEL_VERSIONS_SQL = """
+    INSERT IGNORE INTO checkpoint_channel_versions (thread_id, checkpoint_ns_hash, checkpoint_id, channel, version)
+    SELECT %s, s.checkpoint_ns_hash, s.checkpoint_id, s.channel, s.version
+    FROM checkpoint_channel_versions s {WHERE}
+"""
+
+# Copies the channel blobs the batch of checkpoints refers to in their
+# channel_versions. Content-addressed blobs only copy their reference.
+COPY_REFERENCED_BLOBS_SQL = """
+    INSERT IGNORE INTO checkpoint_blobs (thread_id, checkpoint_ns, checkpoint_ns_hash, channel, version, type, `blob`, content_hash)
+    SELECT %s, b.checkpoint_ns, b.checkpoint_ns_hash, b.channel, b.version, b.type, b.`blob`, b.content_hash
+    FROM checkpoints s, json_table(
+        json_keys(s.checkpoint, '$.channel_versions'),
+        '$[*]' columns (channel VARCHAR(150) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci PATH '$')
+    ) as channels, checkpoint_blobs b
+    {WHERE}
+        AND b.thread_id = s.thread_id
+        AND b.checkpoint_ns_hash = s.checkpoint_ns_hash
+        AND b.channel = channels.channel
+        AND b.version = json_unquote(json_extract(
+            s.checkpoint, concat('$.channel_versions.', '"', channels.channel, '"')
+        ))
+"""
+
+# Same as COPY_REFERENCED_BLOBS_SQL, looking references up in
+# checkpoint_channel_versions.
+COPY_INDEXED_BLOBS_SQL = """
+    INSERT IGNORE INTO checkpoint_blobs (thread_id, checkpoint_ns, checkpoint_ns_hash, channel, version, type, `blob`, content_hash)
+    SELECT %s, b.checkpoint_ns, b.checkpoint_ns_hash, b.channel, b.version, b.type, b.`blob`, b.content_hash
+    FROM checkpoint_channel_versions s
+    JOIN checkpoint_blobs b
+        ON b.thread_id = s.thread_id
+        AND b.checkpoint_ns_hash = s.checkpoint_ns_hash
+        AND b.channel = s.channel
+        AND b.version = s.version
+    {WHERE}
+"""
+
+# Copies the chunks of the chunked blobs the batch of checkpoints refers to.
+COPY_REFERENCED_BLOB_CHUNKS_SQL = """
+    INSERT IGNORE INTO checkpoint_blob_chunks (thread_id, checkpoint_ns_hash, channel, version, idx, `data`)
+    SELECT %s, k.checkpoint_ns_hash, k.channel, k.version, k.idx, k.`data`
+    FROM checkpoints s, json_table(
+        json_keys(s.checkpoint, '$.channel_versions'),
+        '$[*]' columns (channel VARCHAR(150) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci PATH '$')
+    ) as channels, checkpoint_blob_chunks k
+    {WHERE}
+        AND k.thread_id = s.thread_id
+        AND k.checkpoint_ns_hash = s.checkpoint_ns_hash
+        AND k.channel = channels.channel
+        AND k.version = json_unquote(json_extract(
+            s.checkpoint, concat('$.channel_versions.', '"', channels.channel, '"')
+        ))
+"""
+
+COPY_INDEXED_BLOB_CHUNKS_SQL = """
+    INSERT IGNORE INTO checkpoint_blob_chunks (thread_id, checkpoint_ns_hash, channel, version, idx, `data`)
+    SELECT %s, k.checkpoint_ns_hash, k.channel, k.version, k.idx, k.`data`
+    FROM checkpoint_channel_versions s
+    JOIN checkpoint_blob_chunks k
+        ON k.thread_id = s.thread_id
+        AND k.checkpoint_ns_hash = s.checkpoint_ns_hash
+        AND k.channel = s.channel
+        AND k.version = s.version
+    {WHERE}
+"""
+
+DELETE_THREAD_HEADS_SQL = "DELETE FROM checkpoint_heads WHERE thread_id = %s"
+
+REBUILD_THREAD_HEADS_SQL = """
+    INSERT INTO checkpoint_heads (thread_id, checkpoint_ns_hash, checkpoint_id)
+    SELECT thread_id, checkpoint_ns_hash, max(checkpoint_id)
+    FROM checkpoints
+    WHERE thread_id = %s
+    GROUP BY thread_id, checkpoint_ns_hash
+"""
+
+
+def blob_content_hash(type_: str, blob: bytes) -> bytes:
+    """The key of a serialized value in checkpoint_blob_contents."""
+    return hashlib.sha256(type_.encode() + b"\0" + blob).digest()
+
+
+# The deserialized channel blobs and pending writes of a checkpoint row.
+DecodedRow = tuple[dict[str, Any], list[tuple[str, str, Any]]]
+
+
+def decode_row(
+    serde: SerializerProtocol,
+    blob_values: Sequence[tuple[str, str, bytes | None]] | None,
+    writes: Sequence[tuple[str, str, str, bytes]] | None,
+) -> DecodedRow:
+    """Deserialize the channel blobs and pending writes of a checkpoint row.
+
+    A module level function, so that a process pool can run it.
+    """
+    return (
+        {
+            k: serde.loads_typed((t, v))
+            for k, t, v in blob_values or ()
+            if t != "empty" and v is not None
+        },
+        [
+            (tid, channel, serde.loads_typed((t, v)))
+            for tid, channel, t, v in writes or ()
+        ],
+    )
+
+
+class _SchemaState:
+    """What `setup` and `assert_schema_current` found out about a database."""
+
+    __slots__ = ("version", "partition_counts", "metadata_columns")
+
+    def __init__(self) -> None:
+        # the latest migration applied, -1 until found current
+        self.version = -1
+        # table -> number of partitions, None until read
+        self.partition_counts: dict[str, int] | None = None
+        # the lower cased metadata_ columns of checkpoints, None until read
+        self.metadata_columns: set[str] | None = None
+
+
+# The schema state of every database set up or checked in this process, by
+# `_schema_key`, shared by all savers so that later ones skip the schema
+# queries. A database dropped and recreated under the same name goes unnoticed
+# until `forget_schema_state` is called.
+_SCHEMA_STATES: dict[tuple[Any, ...], _SchemaState] = {}
+
+
+def forget_schema_state() -> None:
+    """Make the next `setup` or `assert_schema_current` of every database
+    read its schema again."""
+    _SCHEMA_STATES.clear()
+
+
+class UpgradeResult(NamedTuple):
+    """The progress of one `upgrade_legacy_checkpoints` run."""
+
+    # checkpoints walked, of any version
+    visited: int = 0
+    # legacy checkpoints rewritten in the v4 layout
+    upgraded: int = 0
+    # legacy checkpoints left to the read path, because their pending sends
+    # would share a TASKS blob version with a sibling's different sends
+    skipped: int = 0
+
+
+class CopyResult(NamedTuple):
+    """The number of rows one `copy_thread` run inserted per table."""
+
+    checkpoints: int
+    writes: int
+    blobs: int
+
+
+class CheckpointPage(NamedTuple):
+    """A page of `list_page`, with the cursor of the next page, or None after
+    the last one."""
+
+    checkpoints: Sequence[CheckpointTuple]
+    next_cursor: str | None
+
 
 class BaseMySQLSaver(BaseCheckpointSaver[str]):
     MIGRATIONS = MIGRATIONS
     UPSERT_CHECKPOINT_BLOBS_SQL = UPSERT_CHECKPOINT_BLOBS_SQL
+    UPSERT_CHECKPOINT_BLOB_REFS_SQL = UPSERT_CHECKPOINT_BLOB_REFS_SQL
+    INSERT_BLOB_CONTENTS_SQL = INSERT_BLOB_CONTENTS_SQL
+    INSERT_BLOB_CHUNKS_SQL = INSERT_BLOB_CHUNKS_SQL
     UPSERT_CHECKPOINTS_SQL = UPSERT_CHECKPOINTS_SQL
     UPSERT_CHECKPOINT_WRITES_SQL = UPSERT_CHECKPOINT_WRITES_SQL
     INSERT_CHECKPOINT_WRITES_SQL = INSERT_CHECKPOINT_WRITES_SQL
+    UPSERT_CHECKPOINT_WRITES_BATCH_SQL = UPSERT_CHECKPOINT_WRITES_BATCH_SQL
+    INSERT_CHECKPOINT_WRITES_BATCH_SQL = INSERT_CHECKPOINT_WRITES_BATCH_SQL
+    UPSERT_CHECKPOINT_HEADS_SQL = UPSERT_CHECKPOINT_HEADS_SQL
+    REBUILD_CHECKPOINT_HEADS_SQL = REBUILD_CHECKPOINT_HEADS_SQL
+    DELETE_THREAD_HEADS_SQL = DELETE_THREAD_HEADS_SQL
+    REBUILD_THREAD_HEADS_SQL = REBUILD_THREAD_HEADS_SQL
+    PARTITIONED_TABLES = PARTITIONED_TABLES
+    SELECT_PARTITION_COUNT_SQL = SELECT_PARTITION_COUNT_SQL
+    SELECT_PARTITION_COUNTS_SQL = SELECT_PARTITION_COUNTS_SQL
+    SELECT_METADATA_COLUMNS_SQL = SELECT_METADATA_COLUMNS_SQL
+    SELECT_SCHEMA_VERSION_SQL = SELECT_SCHEMA_VERSION_SQL
+    INSERT_MIGRATION_SQL = INSERT_MIGRATION_SQL
+    UPGRADE_CHECKPOINT_SQL = UPGRADE_CHECKPOINT_SQL
+    ACQUIRE_MIGRATION_LOCK_SQL = ACQUIRE_MIGRATION_LOCK_SQL
+    RELEASE_MIGRATION_LOCK_SQL = RELEASE_MIGRATION_LOCK_SQL
+
+    # Rows fetched per round trip by streaming `list` calls, and parent
+    # checkpoints per pending sends query when migrating legacy checkpoints.
+    STREAM_FETCH_SIZE = 100
+    PENDING_SENDS_WINDOW = 1000
+    # Threads deleted per statement by `delete_threads`.
+    DELETE_THREADS_WINDOW = 500
+    # Checkpoints read per query by `get_tuples`.
+    GET_TUPLES_WINDOW = 500
+    # Seconds `setup` waits for another process to finish migrating.
+    MIGRATION_LOCK_TIMEOUT = 300
+    # Rows per task sent to a process pool `decode_executor`.
+    DECODE_CHUNK_SIZE = 8
 
     jsonplus_serde = JsonPlusSerializer()
 
+    read_engine: ReadEngine
+    channel_version_index: ChannelVersionIndex
+    checkpoint_heads: bool
+    content_addressed_blobs: bool
+    stream_list: bool
+    lazy_load: bool
+    delete_batch_size: int | None
+    partitions: int | None
+    cache: CheckpointCache | None
+    indexed_metadata: tuple[str, ...]
+    instrument: SpanCallback | None
+    legacy_checkpoints: bool
+    decode_executor: Executor | None
+    blob_chunk_size: int | None
+    json_codec: JsonCodec
+
+    def __init__(
+        self,
+        *,
+        serde: SerializerProtocol | None = None,
+        read_engine: ReadEngine = "json",
+        channel_version_index: ChannelVersionIndex = "off",
+        checkpoint_heads: bool = False,
+        write_batch_window: float | None = None,
+        write_batch_max_rows: int = 1000,
+        content_addressed_blobs: bool = False,
+        stream_list: bool = False,
+        lazy_load: bool = False,
+        delete_batch_size: int | None = None,
+        partitions: int | None = None,
+        cache: CheckpointCache | None = None,
+        indexed_metadata: Sequence[str] = (),
+        instrument: SpanCallback | None = None,
+        legacy_checkpoints: bool = True,
+        decode_executor: Executor | None = None,
+        blob_chunk_size: int | None = None,
+        json_codec: JsonCodec | None = None,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.instrument = instrument
+        if instrument is not None:
+            self.serde = TimedSerializer(self.serde)
+        if read_engine not in ("json", "binary"):
+            raise ValueError(f"Unknown read engine: {read_engine}")
+        if channel_version_index not in ("off", "write", "read"):
+            raise ValueError(
+                f"Unknown channel version index mode: {channel_version_index}"
+            )
+        self.read_engine = read_engine
+        self.channel_version_index = channel_version_index
+        if write_batch_window is not None and write_batch_window < 0:
+            raise ValueError("write_batch_window must not be negative")
+        if write_batch_max_rows < 1:
+            raise ValueError("write_batch_max_rows must be a positive integer")
+        self.checkpoint_heads = checkpoint_heads
+        self.write_batch_window = write_batch_window
+        self.write_batch_max_rows = write_batch_max_rows
+        self.content_addressed_blobs = content_addressed_blobs
+        self.stream_list = stream_list
+        self.lazy_load = lazy_load
+        if delete_batch_size is not None and delete_batch_size < 1:
+            raise ValueError("delete_batch_size must be a positive integer")
+        self.delete_batch_size = delete_batch_size
+        if partitions is not None and partitions < 1:
+            raise ValueError("partitions must be a positive integer")
+        self.partitions = partitions
+        self.cache = cache
+        for key in indexed_metadata:
+            if not METADATA_KEY_PATTERN.fullmatch(key):
+                raise ValueError(
+                    f"Indexed metadata keys must be at most 40 letters, digits "
+                    f"or underscores: {key!r}"
+                )
+        self.indexed_metadata = tuple(dict.fromkeys(indexed_metadata))
+        self.legacy_checkpoints = legacy_checkpoints
+        self.decode_executor = decode_executor
+        if blob_chunk_size is not None and blob_chunk_size < 1:
+            raise ValueError("blob_chunk_size must be a positive integer")
+        self.blob_chunk_size = blob_chunk_size
+        self.json_codec = json_codec or DEFAULT_JSON_CODEC
+        # the schema state of databases whose driver doesn't tell which
+        # database a connection is bound to
+        self._local_schema_state = _SchemaState()
+
+    @staticmethod
+    def _partition_table_sql(table: str, partitions: int) -> str:
+        """The statement rebuilding `table` with `partitions` partitions."""
+        return PARTITION_TABLE_SQL.replace("{TABLE}", table).replace(
+            "{PARTITIONS}", str(partitions)
+        )
+
+    def _repartition_target(self, partitions: int | None) -> int:
+        """The partition count `repartition` rebuilds the tables with."""
+        if partitions is None:
+            partitions = self.partitions
+        if partitions is None:
+            raise ValueError("repartition needs a partition count")
+        if partitions < 1:
+            raise ValueError("partitions must be a positive integer")
+        return partitions
+
+    def _check_partitions(self, counts: dict[str, int]) -> None:
+        """Warn if the partition counts `setup` found are not `partitions`."""
+        if tables := [
+            table
+            for table in self.PARTITIONED_TABLES
+            if counts.get(table, 0) != self.partitions
+        ]:
+            warnings.warn(
+                f"{', '.join(tables)} do not have {self.partitions} partitions. "
+                "Call repartition() once to rebuild them.",
+                stacklevel=3,
+            )
+
+    @staticmethod
+    def _schema_key(cur: Any) -> tuple[Any, ...] | None:
+        """The (host, port, database) the connection of a cursor is bound to,
+        or None if the driver doesn't tell."""
+        conn = getattr(cur, "connection", None)
+        # pymysql and aiomysql connections expose them, asyncmy keeps them
+        # in private attributes
+        for prefix in ("", "_"):
+            host, port, db = (
+                getattr(conn, prefix + name, None) for name in ("host", "port", "db")
+            )
+            if host is not None and db:
+                return (host, port, db.decode() if isinstance(db, bytes) else db)
+        return None
+
+    def _schema_state(self, cur: Any) -> _SchemaState:
+        """The schema state of the database the cursor is connected to."""
+        key = self._schema_key(cur)
+        if key is None:
+            return self._local_schema_state
+        return _SCHEMA_STATES.setdefault(key, _SchemaState())
+
+    def _schema_current(self, state: _SchemaState) -> bool:
+        """Whether the database was already found migrated."""
+        return state.version >= len(self.MIGRATIONS) - 1
+
+    def _check_schema_version(self, state: _SchemaState, version: int) -> None:
+        """Remember the schema version of a database, raising if it is behind
+        the migrations of this saver."""
+        if version < len(self.MIGRATIONS) - 1:
+            raise RuntimeError(
+                f"The checkpoint schema is at version {version}, version "
+                f"{len(self.MIGRATIONS) - 1} is required. Run setup() to migrate it."
+            )
+        state.version = version
+
+    @staticmethod
+    def _schema_version(row: dict[str, Any] | None) -> int:
+        return -1 if row is None or row["v"] is None else row["v"]
+
+    @staticmethod
+    def _is_missing_table(error: Exception) -> bool:
+        return bool(error.args) and error.args[0] == ER_NO_SUCH_TABLE
+
+    def _add_metadata_columns_sql(self, columns: Iterable[str]) -> list[str]:
+        """The statements adding the generated columns of `indexed_metadata`
+        missing from checkpoints, given its metadata_ columns."""
+        existing = {column.lower() for column in columns}
+        return [
+            ADD_METADATA_COLUMN_SQL.replace("{KEY}", key)
+            for key in self.indexed_metadata
+            if f"metadata_{key}".lower() not in existing
+        ]
+
+    def _cache_checkpoint(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        checkpoint: Checkpoint,
+        parent_checkpoint_id: str | None,
+        checkpoint_json: str,
+        metadata_json: str,
+        blobs: Sequence[tuple[str, str, str, str, str, str, bytes | None]],
+        blob_channels: Iterable[str],
+    ) -> None:
+        """Add a checkpoint saved by `put` to the cache, given the rows from
+        `_dump_blobs` that were written with it."""
+        if self.cache is None:
+            return
+        self.cache.add_checkpoint(
+            thread_id,
+            checkpoint_ns,
+            checkpoint,
+            parent_checkpoint_id,
+            checkpoint_json,
+            metadata_json,
+            [
+                (channel, version, type_, blob)
+                for *_, channel, version, type_, blob in blobs
+            ],
+            blob_channels,
+        )
+
+    def _cache_writes(
+        self,
+        upsert: bool,
+        params: Sequence[tuple[str, str, str, str, str, str, int, str, str, bytes]],
+    ) -> None:
+        """Add pending writes saved by `put_writes`, given the rows from
+        `_dump_writes`, to their cached checkpoint."""
+        if self.cache is None or not params:
+            return
+        thread_id, checkpoint_ns, _, checkpoint_id, *_ = params[0]
+        self.cache.add_writes(
+            thread_id,
+            checkpoint_ns,
+            checkpoint_id,
+            [
+                (task_id, idx, channel, type_, blob)
+                for *_, task_id, _, idx, channel, type_, blob in params
+            ],
+            upsert=upsert,
+        )
+
+    def _upsert_channel_versions(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        checkpoint_id: str,
+        versions: ChannelVersions,
+    ) -> tuple[str, list[Any]] | None:
+        """Build the statement recording the channel versions of a checkpoint.
+
+        Returns None if the channel version index is off or there is nothing
+        to record.
+        """
+        if self.channel_version_index == "off" or not versions:
+            return None
+        params: list[Any] = []
+        for channel, version in versions.items():
+            params.extend((thread_id, checkpoint_ns, checkpoint_id, channel, version))
+        values = ", ".join([CHANNEL_VERSIONS_VALUES] * len(versions))
+        return UPSERT_CHANNEL_VERSIONS_SQL.replace("{VALUES}", values), params
+
+    def _batched_writes_sql(
+        self, batches: Sequence[WriteBatch]
+    ) -> Iterator[tuple[str, list[Any]]]:
+        """Turn coalesced `put_writes` calls into multi-row statements.
+
+        Consecutive batches of the same kind are merged, up to
+        `write_batch_max_rows` rows per statement, so writes are applied in
+        submission order with their upsert / insert-ignore semantics intact.
+        """
+        upsert: bool | None = None
+        params: list[Any] = []
+        rows = 0
+        for batch_upsert, batch_rows in batches:
+            for row in batch_rows:
+                if rows and (
+                    batch_upsert != upsert or rows >= self.write_batch_max_rows
+                ):
+                    yield self._writes_statement(cast(bool, upsert), rows), params
+                    params, rows = [], 0
+                upsert = batch_upsert
+                params.extend(row)
+                rows += 1
+        if rows:
+            yield self._writes_statement(cast(bool, upsert), rows), params
+
+    def _writes_statement(self, upsert: bool, rows: int) -> str:
+        query = (
+            self.UPSERT_CHECKPOINT_WRITES_BATCH_SQL
+            if upsert
+            else self.INSERT_CHECKPOINT_WRITES_BATCH_SQL
+        )
+        return query.replace("{VALUES}", ", ".join([CHECKPOINT_WRITES_VALUES] * rows))
+
+    def _latest_checkpoint_query(self) -> tuple[str, str]:
+        """Return the WHERE clause and suffix selecting the latest checkpoint
+        of a thread, given `thread_id` and `checkpoint_ns` parameters."""
+        if self.checkpoint_heads:
+            return LATEST_CHECKPOINT_WHERE, ""
+        return (
+            "WHERE thread_id = %(thread_id)s AND checkpoint_ns_hash = UNHEX(MD5(%(checkpoint_ns)s))",
+            " ORDER BY checkpoint_id DESC LIMIT 1",
+        )
+
+    @staticmethod
+    def _keyset_batch_sql(
+        keys_sql: str, batch_sql: str, columns: Sequence[str], first: bool
+    ) -> tuple[str, str]:
+        """Statements for one batch of a walk over a table in key order.
+
+        The first selects the next batch of keys and takes (*after,
+        batch_size), or just (batch_size) for the `first` batch. The second
+        processes every row up to the last key of the batch and takes (*after,
+        *last), or just (*last). Both templates receive their WHERE clause in
+        place of {WHERE}.
+        """
+        after = keyset_predicate(columns)
+        upto = f"NOT {keyset_predicate(columns)}"
+        if first:
+            return (
+                keys_sql.replace("{WHERE}", ""),
+                batch_sql.replace("{WHERE}", f"WHERE {upto}"),
+            )
+        return (
+            keys_sql.replace("{WHERE}", f"WHERE {after}"),
+            batch_sql.replace("{WHERE}", f"WHERE {after} AND {upto}"),
+        )
+
+    @staticmethod
+    def _legacy_checkpoints_sql(first: bool) -> str:
+        """The query selecting the next batch of checkpoints for
+        `upgrade_legacy_checkpoints`, taking (*after, batch_size), or just
+        (batch_size) for the `first` batch."""
+        where = "" if first else f"WHERE {keyset_predicate(CHECKPOINT_KEY_COLUMNS)}"
+        return SELECT_LEGACY_CHECKPOINTS_SQL.replace("{WHERE}", where)
+
+    def _upgrade_legacy_rows(
+        self,
+        rows: Sequence[dict[str, Any]],
+        sends_by_parent: dict[tuple[str, str], list[tuple[str, bytes]]],
+        claimed: dict[tuple[str, str, str], bytes | None],
+    ) -> tuple[
+        list[tuple[str, str, bytes, str]],
+        list[tuple[str, str, str, str, str, str, bytes | None]],
+        list[tuple[str, list[Any]]],
+        int,
+    ]:
+        """Rewrite legacy checkpoints selected by SELECT_LEGACY_CHECKPOINTS_SQL
+        in the v4 layout.
+
+        The pending sends of a checkpoint, read from its parent's TASKS
+        writes, are stored as a TASKS channel blob, exactly as the read path
+        migrates them. Version 3 checkpoints are bumped to version 4. Older
+        ones keep their version, since the graph still migrates their
+        channels when loading them, but get their TASKS blob all the same.
+
+        `claimed` maps the TASKS blob versions written so far in the thread
+        being walked to their contents; a checkpoint whose blob would collide
+        with a sibling's different sends is skipped.
+
+        Returns the UPGRADE_CHECKPOINT_SQL parameters, the blob rows, the
+        channel version index statements and the number of skipped
+        checkpoints.
+        """
+        updates: list[tuple[str, str, bytes, str]] = []
+        blobs: list[tuple[str, str, str, str, str, str, bytes | None]] = []
+        versions: list[tuple[str, list[Any]]] = []
+        skipped = 0
+        for row in rows:
+            thread_id, checkpoint_ns = row["thread_id"], row["checkpoint_ns"]
+            if claimed and next(iter(claimed))[0] != thread_id:
+                claimed.clear()
+            checkpoint = self.json_codec.loads(row["checkpoint"])
+            channel_values: list[tuple[str, str, bytes | None]] = []
+            if sends := sends_by_parent.get((thread_id, row["parent_checkpoint_id"])):
+                self._migrate_pending_sends(sends, checkpoint, channel_values)
+            if channel_values:
+                _, type_, blob = channel_values[0]
+                version = cast(str, checkpoint["channel_versions"][TASKS])
+                key = (thread_id, checkpoint_ns, version)
+                if claimed.setdefault(key, blob) != blob:
+                    skipped += 1
+                    continue
+                blobs.append(
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint_ns,
+                        TASKS,
+                        version,
+                        type_,
+                        blob,
+                    )
+                )
+                if statement := self._upsert_channel_versions(
+                    thread_id, checkpoint_ns, row["checkpoint_id"], {TASKS: version}
+                ):
+                    versions.append(statement)
+            elif checkpoint["v"] < 3:
+                continue
+            if checkpoint["v"] == 3:
+                checkpoint["v"] = 4
+            updates.append(
+                (
+                    self.json_codec.dumps(checkpoint),
+                    thread_id,
+                    row["checkpoint_ns_hash"],
+                    row["checkpoint_id"],
+                )
+            )
+        return updates, blobs, versions, skipped
+
+    @classmethod
+    def _backfill_channel_versions_sql(cls, first: bool) -> tuple[str, str]:
+        """Statements for one batch of `backfill_channel_versions`."""
+        return cls._keyset_batch_sql(
+            SELECT_CHECKPOINT_KEYS_SQL,
+            BACKFILL_CHANNEL_VERSIONS_SQL,
+            CHECKPOINT_KEY_COLUMNS,
+            first,
+        )
+
+    def _prunable_checkpoints_sql(
+        self, policy: RetentionPolicy, first: bool
+    ) -> tuple[str, list[Any]]:
+        """The query selecting the next batch of checkpoints for `prune`.
+
+        Returns the statement and the parameters of its expiry predicate; the
+        statement then takes (*after, batch_size), or just (batch_size) for the
+        `first` batch.
+        """
+        expired = []
+        params: list[Any] = []
+        if policy.keep_last is not None:
+            expired.append(
+                "c.checkpoint_id < ("
+                "select n.checkpoint_id from checkpoints n"
+                " where n.thread_id = c.thread_id"
+                " and n.checkpoint_ns_hash = c.checkpoint_ns_hash"
+                " order by n.checkpoint_id desc limit %s, 1)"
+            )
+            params.append(policy.keep_last - 1)
+        if (cutoff := policy.cutoff()) is not None:
+            expired.append("json_unquote(json_extract(c.checkpoint, '$.ts')) < %s")
+            params.append(cutoff)
+        if policy.keep_metadata:
+            expired.append("NOT json_contains(c.metadata, %s)")
+            params.append(self.json_codec.dumps(policy.keep_metadata))
+        where = "" if first else f"WHERE {keyset_predicate(CHECKPOINT_KEY_COLUMNS)}"
+        return (
+            SELECT_PRUNABLE_CHECKPOINTS_SQL.replace(
+                "{EXPIRED}", f"({' AND '.join(expired)})"
+            ).replace("{WHERE}", where),
+            params,
+        )
+
+    def _copy_thread_sql(self, first: bool, up_to: bool) -> tuple[str, list[str]]:
+        """Statements for one batch of `copy_thread`.
+
+        The first selects the next batch of source checkpoint keys and takes
+        (source, [up_to], *after, batch_size), leaving out `after` for the
+        `first` batch. The others copy every row up to the last key of the
+        batch and take (target, source, [up_to], *after, *last).
+        """
+        where = ["s.thread_id = %s"]
+        if up_to:
+            where.append("s.checkpoint_id <= %s")
+        if not first:
+            where.append(keyset_predicate(THREAD_CHECKPOINT_KEY_COLUMNS))
+        upto = f"NOT {keyset_predicate(THREAD_CHECKPOINT_KEY_COLUMNS)}"
+        keys_where = f"WHERE {' AND '.join(where)}"
+        batch_where = f"{keys_where} AND {upto}"
+        return (
+            SELECT_THREAD_CHECKPOINT_KEYS_SQL.replace("{WHERE}", keys_where),
+            [
+                query.replace("{WHERE}", batch_where)
+                for query in (
+                    COPY_CHECKPOINTS_SQL,
+                    COPY_CHECKPOINT_WRITES_SQL,
+                    COPY_CHANNEL_VERSIONS_SQL,
+                    COPY_INDEXED_BLOBS_SQL
+                    if self.channel_version_index == "read"
+                    else COPY_REFERENCED_BLOBS_SQL,
+                    COPY_INDEXED_BLOB_CHUNKS_SQL
+                    if self.channel_version_index == "read"
+                    else COPY_REFERENCED_BLOB_CHUNKS_SQL,
+                )
+            ],
+        )
+
+    def _delete_threads_sql(self, num_threads: int) -> list[str]:
+        """Statements deleting every row of `num_threads` threads, in order.
+
+        With a `delete_batch_size`, each statement deletes at most that many
+        rows in primary key order and takes the limit as its last parameter.
+        """
+        placeholders = ",".join(["%s"] * num_threads)
+        chunk = (
+            " ORDER BY {ORDER} LIMIT %s" if self.delete_batch_size is not None else ""
+        )
+        return [
+            DELETE_THREADS_SQL.replace("{TABLE}", table).replace(
+                "{PLACEHOLDERS}", placeholders
+            )
+            + chunk.replace("{ORDER}", order)
+            for table, order in THREAD_TABLES
+        ]
+
+    def _thread_windows(self, thread_ids: Sequence[str]) -> Iterator[list[str]]:
+        """Split distinct thread ids into groups deleted by the same statements."""
+        ids = list(dict.fromkeys(str(thread_id) for thread_id in thread_ids))
+        for start in range(0, len(ids), self.DELETE_THREADS_WINDOW):
+            yield ids[start : start + self.DELETE_THREADS_WINDOW]
+
+    @staticmethod
+    def _delete_checkpoint_keys_sql(table: str, num_keys: int) -> str:
+        return DELETE_CHECKPOINT_KEYS_SQL.replace("{TABLE}", table).replace(
+            "{KEYS}", ",".join(["(%s, %s, %s)"] * num_keys)
+        )
+
+    def _unreferenced_blobs_sql(self, first: bool) -> tuple[str, str]:
+        """Statements for one batch of the blob garbage collection of `prune`.
+
+        Blob references are only looked up in checkpoint_channel_versions in
+        "read" mode, where the index is known to be complete. Otherwise, the
+        delete also takes the bounds of `_blob_gc_threads` after its keyset
+        parameters.
+        """
+        if self.channel_version_index == "read":
+            return self._keyset_batch_sql(
+                SELECT_BLOB_KEYS_SQL,
+                DELETE_UNINDEXED_BLOBS_SQL,
+                BLOB_KEY_COLUMNS,
+                first,
+            )
+        threads = "c.thread_id <= %s" if first else "c.thread_id BETWEEN %s AND %s"
+        return self._keyset_batch_sql(
+            SELECT_BLOB_KEYS_SQL,
+            DELETE_UNREFERENCED_BLOBS_SQL.replace("{THREADS}", threads),
+            BLOB_KEY_COLUMNS,
+            first,
+        )
+
+    def _blob_gc_threads(
+        self, after: Sequence[Any] | None, last: Sequence[Any]
+    ) -> list[Any]:
+        """The thread_id bounds of a batch of `_unreferenced_blobs_sql`.
+
+        They span every thread between the `after` and `last` blob keys, so
+        the blobs a concurrent writer adds to the key range are checked
+        against the checkpoints of their thread too.
+        """
+        if self.channel_version_index == "read":
+            return []
+        return [last[0]] if after is None else [after[0], last[0]]
+
+    @classmethod
+    def _unreferenced_blob_chunks_sql(cls, first: bool) -> tuple[str, str]:
+        return cls._keyset_batch_sql(
+            SELECT_BLOB_CHUNK_KEYS_SQL,
+            DELETE_UNREFERENCED_BLOB_CHUNKS_SQL,
+            BLOB_CHUNK_KEY_COLUMNS,
+            first,
+        )
+
+    @classmethod
+    def _unreferenced_blob_contents_sql(cls, first: bool) -> tuple[str, str]:
+        return cls._keyset_batch_sql(
+            SELECT_BLOB_CONTENT_KEYS_SQL,
+            DELETE_UNREFERENCED_BLOB_CONTENTS_SQL,
+            BLOB_CONTENT_KEY_COLUMNS,
+            first,
+        )
+
+    def _decode_json_row(self, value: dict[str, Any]) -> dict[str, Any]:
+        """Decode a row returned by SELECT_SQL in place.
+
+        The checkpoint is parsed and the base64 encoded JSON arrays of channel
+        values and pending writes are turned into lists of raw tuples.
+        """
+        value["checkpoint"] = self.json_codec.loads(value["checkpoint"])
+        value["channel_values"] = deserialize_channel_values(
+            value["channel_values"], self.json_codec.loads
+        )
+        value["pending_writes"] = deserialize_pending_writes(
+            value["pending_writes"], self.json_codec.loads
+        )
+        return value
+
+    def _join_binary_rows(
+        self,
+        checkpoints: Sequence[dict[str, Any]],
+        blobs: Sequence[dict[str, Any]],
+        writes: Sequence[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Join the result sets of the "binary" read engine on the client.
+
+        Produces the same rows as `_decode_json_row` does for SELECT_SQL.
+        """
+        blobs_by_version = {
+            (bl["thread_id"], bl["checkpoint_ns"], bl["channel"], bl["version"]): (
+                bl["type"],
+                bl["blob"],
+            )
+            for bl in blobs
+        }
+        writes_by_checkpoint: dict[tuple[str, str, str], list] = defaultdict(list)
+        for cw in writes:
+            writes_by_checkpoint[
+                (cw["thread_id"], cw["checkpoint_ns"], cw["checkpoint_id"])
+            ].append((cw["task_id"], cw["channel"], cw["type"], cw["blob"]))
+        values = []
+        for row in checkpoints:
+            value = dict(row)
+            value["checkpoint"] = checkpoint = self.json_codec.loads(
+                value["checkpoint"]
+            )
+            thread_id = value["thread_id"]
+            checkpoint_ns = value["checkpoint_ns"]
+            channel_values = []
+            for channel, version in checkpoint["channel_versions"].items():
+                blob = blobs_by_version.get(
+                    (thread_id, checkpoint_ns, channel, str(version))
+                )
+                if blob is not None:
+                    channel_values.append((channel, *blob))
+            value["channel_values"] = channel_values
+            value["pending_writes"] = writes_by_checkpoint.get(
+                (thread_id, checkpoint_ns, value["checkpoint_id"]), []
+            )
+            values.append(value)
+        return values
+
     def _migrate_pending_sends(
         self,
         pending_sends: list[tuple[str, bytes]],
@@ -219,6 +1637,83 @@ class BaseMySQLSaver(BaseCheckpointSaver[str]):
             if t != "empty" and v is not None
         }
 
+    def _load_channel_values(
+        self,
+        values: dict[str, Any],
+        blob_values: list[tuple[str, str, bytes | None]],
+    ) -> dict[str, Any]:
+        """Merge the inline channel values of a checkpoint with its blobs."""
+        if self.lazy_load:
+            return LazyChannelValues(self.serde, values, blob_values or ())
+        return {**values, **self._load_blobs(blob_values)}
+
+    def _decode_rows(
+        self, values: Sequence[dict[str, Any]]
+    ) -> Iterator[DecodedRow | None]:
+        """Deserialize the blobs and writes of rows on the `decode_executor`,
+        in row order.
+
+        Yields None for every row, leaving `_make_checkpoint_tuple` to decode
+        it on the calling thread, without an executor, with `lazy_load` or
+        for a single row.
+        """
+        if self.decode_executor is None or self.lazy_load or len(values) < 2:
+            return repeat(None, len(values))
+        return self.decode_executor.map(
+            decode_row,
+            repeat(self.serde),
+            [value["channel_values"] for value in values],
+            [value["pending_writes"] for value in values],
+            chunksize=self.DECODE_CHUNK_SIZE,
+        )
+
+    def _make_checkpoint_tuple(
+        self, value: dict[str, Any], decoded: DecodedRow | None = None
+    ) -> CheckpointTuple:
+        """Convert a database row into a CheckpointTuple object.
+
+        Args:
+            value: A row from the database containing checkpoint data.
+            decoded: The row's blobs and writes, if already deserialized by
+                `decode_row`.
+
+        Returns:
+            CheckpointTuple: A structured representation of the checkpoint,
+            including its configuration, metadata, parent checkpoint (if any),
+            and pending writes.
+        """
+        if decoded is None:
+            channel_values = self._load_channel_values(
+                value["checkpoint"].get("channel_values"), value["channel_values"]
+            )
+            pending_writes = self._load_writes(value["pending_writes"])
+        else:
+            channel_values = {**value["checkpoint"].get("channel_values"), **decoded[0]}
+            pending_writes = decoded[1]
+        return CheckpointTuple(
+            {
+                "configurable": {
+                    "thread_id": value["thread_id"],
+                    "checkpoint_ns": value["checkpoint_ns"],
+                    "checkpoint_id": value["checkpoint_id"],
+                }
+            },
+            {**value["checkpoint"], "channel_values": channel_values},
+            self._load_metadata(value["metadata"]),
+            (
+                {
+                    "configurable": {
+                        "thread_id": value["thread_id"],
+                        "checkpoint_ns": value["checkpoint_ns"],
+                        "checkpoint_id": value["parent_checkpoint_id"],
+                    }
+                }
+                if value["parent_checkpoint_id"]
+                else None
+            ),
+            pending_writes,
+        )
+
     def _dump_blobs(
         self,
         thread_id: str,
@@ -245,9 +1740,184 @@ class BaseMySQLSaver(BaseCheckpointSaver[str]):
             for k, ver in versions.items()
         ]
 
+    @staticmethod
+    def _dump_blob_contents(
+        blobs: Sequence[tuple[str, str, str, str, str, str, bytes | None]],
+    ) -> tuple[
+        list[tuple[bytes, str, bytes]],
+        list[tuple[str, str, str, str, str, str, None, bytes | None]],
+    ]:
+        """Split rows from `_dump_blobs` into content-addressed storage.
+
+        Returns the distinct (content_hash, type, blob) contents and the
+        checkpoint_blobs rows referencing them by hash.
+        """
+        contents: dict[bytes, tuple[bytes, str, bytes]] = {}
+        refs: list[tuple[str, str, str, str, str, str, None, bytes | None]] = []
+        for thread_id, checkpoint_ns, ns, channel, version, type_, blob in blobs:
+            digest = None
+            if blob is not None:
+                digest = blob_content_hash(type_, blob)
+                contents.setdefault(digest, (digest, type_, blob))
+            refs.append(
+                (thread_id, checkpoint_ns, ns, channel, version, type_, None, digest)
+            )
+        return list(contents.values()), refs
+
+    @staticmethod
+    def _select_blob_content_hashes_sql(num_hashes: int, lock: bool = False) -> str:
+        return (
+            LOCK_BLOB_CONTENTS_SQL if lock else SELECT_BLOB_CONTENT_HASHES_SQL
+        ).replace("{PLACEHOLDERS}", ",".join(["%s"] * num_hashes))
+
+    def _dump_blob_chunks(
+        self,
+        blobs: Sequence[tuple[str, str, str, str, str, str, bytes | None]],
+    ) -> tuple[
+        list[tuple[str, str, str, str, str, str, bytes | None]],
+        list[tuple[str, str, str, str, int, bytes]],
+    ]:
+        """Split the rows from `_dump_blobs` larger than `blob_chunk_size`.
+
+        Returns the checkpoint_blobs rows, with chunked values replaced by
+        their marker, and the checkpoint_blob_chunks rows.
+        """
+        size = self.blob_chunk_size
+        if size is None:
+            return list(blobs), []
+        rows: list[tuple[str, str, str, str, str, str, bytes | None]] = []
+        chunks: list[tuple[str, str, str, str, int, bytes]] = []
+        for thread_id, checkpoint_ns, ns, channel, version, type_, blob in blobs:
+            if blob is None or len(blob) <= size:
+                rows.append(
+                    (thread_id, checkpoint_ns, ns, channel, version, type_, blob)
+                )
+                continue
+            rows.append(
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    ns,
+                    channel,
+                    version,
+                    f"{type_}{BLOB_CHUNKS_MARKER}{-(-len(blob) // size)}",
+                    None,
+                )
+            )
+            chunks.extend(
+                (thread_id, ns, channel, version, idx, blob[start : start + size])
+                for idx, start in enumerate(range(0, len(blob), size))
+            )
+        return rows, chunks
+
+    @staticmethod
+    def _blob_chunk_refs(
+        values: Iterable[dict[str, Any]],
+    ) -> list[tuple[str, str, str, str]]:
+        """The (thread_id, checkpoint_ns, channel, version) of the chunked
+        blobs among the channel values of rows, for `_select_blob_chunks_sql`."""
+        refs: dict[tuple[str, str, str, str], None] = {}
+        for value in values:
+            versions = value["checkpoint"]["channel_versions"]
+            for channel, type_, blob in value["channel_values"] or ():
+                if blob is None and BLOB_CHUNKS_MARKER in type_:
+                    key = (
+                        value["thread_id"],
+                        value["checkpoint_ns"],
+                        channel,
+                        str(versions[channel]),
+                    )
+                    refs[key] = None
+        return list(refs)
+
+    @staticmethod
+    def _select_blob_chunks_sql(
+        refs: Sequence[tuple[str, str, str, str]],
+    ) -> tuple[str, list[str]]:
+        """Select the chunks of the blobs of `refs` in a single query."""
+        return (
+            SELECT_BLOB_CHUNKS_SQL.replace(
+                "{PLACEHOLDERS}", ",".join([BLOB_CHUNK_REF_PLACEHOLDER] * len(refs))
+            ),
+            [param for ref in refs for param in ref],
+        )
+
+    @staticmethod
+    def _group_blob_chunks(
+        refs: Sequence[tuple[str, str, str, str]],
+        rows: Iterable[dict[str, Any]],
+    ) -> dict[tuple[str, str, str, str], list[bytes]]:
+        """Group the chunk rows from `_select_blob_chunks_sql` by the ref of
+        their blob, in order."""
+        by_key = {
+            (ref[0], hashlib.md5(ref[1].encode()).digest(), ref[2], ref[3]): ref
+            for ref in refs
+        }
+        chunks: dict[tuple[str, str, str, str], list[bytes]] = defaultdict(list)
+        for row in rows:
+            key = (
+                row["thread_id"],
+                bytes(row["checkpoint_ns_hash"]),
+                row["channel"],
+                row["version"],
+            )
+            ref = by_key[key]
+            # the chunks after a gap are left out, as if they were missing too
+            if row["idx"] == len(chunks[ref]):
+                chunks[ref].append(row["data"])
+        return chunks
+
+    @staticmethod
+    def _join_blob_chunks(
+        values: Iterable[dict[str, Any]],
+        chunks: dict[tuple[str, str, str, str], list[bytes]],
+    ) -> None:
+        """Replace the chunked blobs among the channel values of rows in place
+        with the values reassembled from their chunks.
+
+        Raises ValueError when chunks of a value are missing.
+        """
+        for value in values:
+            if not value["channel_values"]:
+                continue
+            versions = value["checkpoint"]["channel_versions"]
+            channel_values = []
+            for channel, type_, blob in value["channel_values"]:
+                if blob is None and BLOB_CHUNKS_MARKER in type_:
+                    type_, _, count = type_.rpartition(BLOB_CHUNKS_MARKER)
+                    ref = (
+                        value["thread_id"],
+                        value["checkpoint_ns"],
+                        channel,
+                        str(versions[channel]),
+                    )
+                    parts = chunks.get(ref, [])
+                    if len(parts) != int(count):
+                        raise ValueError(
+                            f"Channel {channel!r} at version {ref[3]!r} of thread "
+                            f"{ref[0]!r}, namespace {ref[1]!r} has {len(parts)} "
+                            f"of its {count} chunks in checkpoint_blob_chunks"
+                        )
+                    blob = b"".join(parts)
+                channel_values.append((channel, type_, blob))
+            value["channel_values"] = channel_values
+
+    @staticmethod
+    def _any_blob_chunk_sql(args: dict[str, Any]) -> tuple[str, tuple[Any, ...]]:
+        """The query checking whether the threads `list` reads with `args`
+        might have chunked blobs, with its parameters."""
+        if "thread_id" in args:
+            return (
+                SELECT_ANY_BLOB_CHUNK_SQL.replace("{WHERE}", "WHERE thread_id = %s"),
+                (args["thread_id"],),
+            )
+        return SELECT_ANY_BLOB_CHUNK_SQL.replace("{WHERE}", ""), ()
+
     def _load_writes(
         self, writes: list[tuple[str, str, str, bytes]]
     ) -> list[tuple[str, str, Any]]:
+        if self.lazy_load:
+            return LazyPendingWrites(self.serde, writes or ())
         return (
             [
                 (
@@ -287,7 +1957,7 @@ class BaseMySQLSaver(BaseCheckpointSaver[str]):
 
     def _load_metadata(self, metadata: str) -> CheckpointMetadata:
         try:
-            return json.loads(metadata)
+            return self.json_codec.loads(metadata)
         except (TypeError, json.JSONDecodeError):
             # This is a best effort fallback for backwards compatibility with
             # old checkpoints and old versions of LangGraph prior to "writes"
@@ -304,7 +1974,7 @@ class BaseMySQLSaver(BaseCheckpointSaver[str]):
 
     def _dump_metadata(self, metadata: CheckpointMetadata) -> str:
         try:
-            return json.dumps(metadata)
+            return self.json_codec.dumps(metadata)
         except TypeError:
             # This is a best effort fallback for backwards compatibility with
             # old checkpoints and old versions of LangGraph prior to "writes"
@@ -363,8 +2033,17 @@ class BaseMySQLSaver(BaseCheckpointSaver[str]):
 
         # construct predicate for metadata filter
         if filter:
+            # use the generated columns of indexed keys to narrow down rows,
+            # json_contains still checks the whole filter
+            for key, value in filter.items():
+                if (
+                    key in self.indexed_metadata
+                    and (column_value := indexed_metadata_value(value)) is not None
+                ):
+                    wheres.append(f"metadata_{key} = %(metadata_{key})s ")
+                    param_values[f"metadata_{key}"] = column_value
             wheres.append("json_contains(metadata, %(filter)s) ")
-            param_values["filter"] = json.dumps(filter)
+            param_values["filter"] = self.json_codec.dumps(filter)
 
         # construct predicate for `before`
         if before is not None:
@@ -376,10 +2055,196 @@ class BaseMySQLSaver(BaseCheckpointSaver[str]):
             param_values,
         )
 
+    def _page_where(
+        self,
+        config: RunnableConfig | None,
+        filter: MetadataInput,
+        cursor: str | None,
+    ) -> tuple[str, dict[str, Any]]:
+        """Return the WHERE clause of SELECT_PAGE_KEYS_SQL and its values.
+
+        The cursor predicate only covers the key columns that `config` does
+        not pin, so that it is a range scan of the primary key.
+        """
+        where, args = self._search_where(config, filter)
+        if cursor is None:
+            return where, args
+        pinned = 0
+        if config:
+            pinned = 1 if config["configurable"].get("checkpoint_ns") is None else 2
+        params = keyset_params(self._decode_page_cursor(cursor)[pinned:])
+        names = [f"after_{n}" for n in range(len(params))]
+        predicate = keyset_predicate(CHECKPOINT_KEY_COLUMNS[pinned:], "<") % tuple(
+            f"%({name})s" for name in names
+        )
+        args.update(zip(names, params))
+        return f"{where} AND {predicate}" if where else f"WHERE {predicate}", args
+
+    @staticmethod
+    def _select_page_keys_sql(where: str) -> str:
+        return SELECT_PAGE_KEYS_SQL.replace("{WHERE}", where)
+
+    def _page_keys(
+        self, rows: Sequence[dict[str, Any]], limit: int
+    ) -> tuple[list[tuple[str, str, str]], str | None]:
+        """The checkpoint keys of a page, given up to `limit` + 1 rows of
+        SELECT_PAGE_KEYS_SQL, and the cursor of the next page."""
+        keys = [
+            (row["thread_id"], row["checkpoint_ns"], row["checkpoint_id"])
+            for row in rows[:limit]
+        ]
+        if len(rows) <= limit:
+            return keys, None
+        return keys, self._encode_page_cursor(rows[limit - 1])
+
+    @staticmethod
+    def _encode_page_cursor(row: dict[str, Any]) -> str:
+        key = [row["thread_id"], row["checkpoint_ns_hash"].hex(), row["checkpoint_id"]]
+        return base64.urlsafe_b64encode(json_dumps(key).encode()).decode()
+
+    @staticmethod
+    def _decode_page_cursor(cursor: str) -> tuple[str, bytes, str]:
+        try:
+            thread_id, ns_hash, checkpoint_id = json_loads(
+                base64.urlsafe_b64decode(cursor)
+            )
+            return str(thread_id), bytes.fromhex(ns_hash), str(checkpoint_id)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid list_page cursor: {cursor!r}") from None
+
     @staticmethod
-    def _select_sql(where: str) -> str:
+    def _order_page_rows(
+        keys: Sequence[tuple[str, str, str]], values: Iterable[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Put rows fetched by key back in the order of the page keys."""
+        by_key = {
+            (value["thread_id"], value["checkpoint_ns"], value["checkpoint_id"]): value
+            for value in values
+        }
+        return [by_key[key] for key in keys if key in by_key]
+
+    def _select_sql(self, where: str) -> str:
+        if self.channel_version_index == "read":
+            return SELECT_INDEXED_SQL.replace("{WHERE}", where)
         return SELECT_SQL.replace("{WHERE}", where)
 
+    def _select_binary_sql(self, where: str, suffix: str = "") -> str:
+        blobs_sql = (
+            SELECT_INDEXED_BLOBS_BINARY_SQL
+            if self.channel_version_index == "read"
+            else SELECT_BLOBS_BINARY_SQL
+        )
+        return ";".join(
+            sql.replace("{WHERE}", where).replace("{SUFFIX}", suffix)
+            for sql in (
+                SELECT_CHECKPOINTS_BINARY_SQL,
+                blobs_sql,
+                SELECT_WRITES_BINARY_SQL,
+            )
+        )
+
+    @staticmethod
+    def _checkpoint_key(config: RunnableConfig) -> tuple[str, str, str | None]:
+        """The thread, namespace and checkpoint id a config selects, with no
+        checkpoint id for the latest checkpoint."""
+        return (
+            str(config["configurable"]["thread_id"]),
+            config["configurable"].get("checkpoint_ns", ""),
+            get_checkpoint_id(config) or None,
+        )
+
+    def _latest_checkpoint_ids_windows(
+        self, pairs: Sequence[tuple[str, str]]
+    ) -> Iterator[tuple[str, list[str]]]:
+        """Yield queries selecting the latest checkpoint ids of (thread_id,
+        checkpoint_ns) pairs, at most `GET_TUPLES_WINDOW` pairs per query."""
+        for start in range(0, len(pairs), self.GET_TUPLES_WINDOW):
+            window = pairs[start : start + self.GET_TUPLES_WINDOW]
+            yield (
+                SELECT_LATEST_CHECKPOINT_IDS_SQL.replace(
+                    "{PAIRS}", ",".join(["(%s, UNHEX(MD5(%s)))"] * len(window))
+                ),
+                [param for pair in window for param in pair],
+            )
+
+    @staticmethod
+    def _match_latest_checkpoint_ids(
+        pairs: Iterable[tuple[str, str]], rows: Iterable[dict[str, Any]]
+    ) -> dict[tuple[str, str], str]:
+        """Map (thread_id, checkpoint_ns) pairs to the latest checkpoint ids
+        selected for them by SELECT_LATEST_CHECKPOINT_IDS_SQL."""
+        ids = {
+            (row["thread_id"], bytes(row["checkpoint_ns_hash"])): row["checkpoint_id"]
+            for row in rows
+        }
+        matched = {}
+        for thread_id, checkpoint_ns in pairs:
+            ns_hash = hashlib.md5(checkpoint_ns.encode()).digest()
+            if (checkpoint_id := ids.get((thread_id, ns_hash))) is not None:
+                matched[(thread_id, checkpoint_ns)] = checkpoint_id
+        return matched
+
+    def _checkpoint_keys_windows(
+        self, keys: Sequence[tuple[str, str, str]]
+    ) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Yield WHERE clauses selecting checkpoints by key, with their
+        parameters, at most `GET_TUPLES_WINDOW` checkpoints per clause."""
+        for start in range(0, len(keys), self.GET_TUPLES_WINDOW):
+            window = keys[start : start + self.GET_TUPLES_WINDOW]
+            placeholders = []
+            args: dict[str, Any] = {}
+            for n, (thread_id, checkpoint_ns, checkpoint_id) in enumerate(window):
+                placeholders.append(
+                    f"(%(thread_id_{n})s, UNHEX(MD5(%(checkpoint_ns_{n})s)),"
+                    f" %(checkpoint_id_{n})s)"
+                )
+                args[f"thread_id_{n}"] = thread_id
+                args[f"checkpoint_ns_{n}"] = checkpoint_ns
+                args[f"checkpoint_id_{n}"] = checkpoint_id
+            yield CHECKPOINT_KEYS_WHERE.replace("{KEYS}", ",".join(placeholders)), args
+
+    def _migrate_legacy_rows(
+        self,
+        values: Iterable[dict[str, Any]],
+        sends_by_parent: dict[tuple[str, str], list[tuple[str, bytes]]],
+    ) -> None:
+        """Migrate the pending sends of legacy checkpoint rows in place, given
+        the sends of their parents by (thread_id, checkpoint_id)."""
+        for value in values:
+            if value["checkpoint"]["v"] < 4 and (
+                sends := sends_by_parent.get(
+                    (value["thread_id"], value["parent_checkpoint_id"])
+                )
+            ):
+                if value["channel_values"] is None:
+                    value["channel_values"] = []
+                self._migrate_pending_sends(
+                    sends, value["checkpoint"], value["channel_values"]
+                )
+
+    @staticmethod
+    def _select_legacy_parents_sql(where: str, suffix: str = "") -> str:
+        return SELECT_LEGACY_PARENTS_SQL.replace("{WHERE}", where).replace(
+            "{SUFFIX}", suffix
+        )
+
+    def _pending_sends_windows(
+        self, parents: Sequence[dict[str, Any]]
+    ) -> Iterator[tuple[str, tuple[str, ...]]]:
+        """Yield pending sends queries for the parents of legacy checkpoints,
+        at most `PENDING_SENDS_WINDOW` parents per query."""
+        by_thread: defaultdict[str, list[str]] = defaultdict(list)
+        for row in parents:
+            by_thread[row["thread_id"]].append(row["parent_checkpoint_id"])
+        for thread_id, parent_ids in by_thread.items():
+            unique = list(dict.fromkeys(parent_ids))
+            for start in range(0, len(unique), self.PENDING_SENDS_WINDOW):
+                window = unique[start : start + self.PENDING_SENDS_WINDOW]
+                yield (
+                    self._select_pending_sends_sql(len(window)),
+                    (thread_id, *window),
+                )
+
     @staticmethod
     def _select_pending_sends_sql(num_ids: int) -> str:
         placeholders = ",".join(["%s"] * num_ids)
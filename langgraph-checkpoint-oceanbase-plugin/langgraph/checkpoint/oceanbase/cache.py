@@ -0,0 +1,384 @@
+"""In-process cache of recently written and read checkpoints.
+
+A `CheckpointCache` passed to a saver as `cache` keeps checkpoints in their
+serialized form, the way they are read from the database, so `get_tuple` can
+rebuild a `CheckpointTuple` without a round trip. Checkpoints are added by
+`put` and by `get_tuple` reads, pending writes by `put_writes`, and the
+latest checkpoint of every thread and namespace is tracked in a slot of its
+own. Entries are evicted least recently used first once `max_entries` or
+`max_bytes` is exceeded, together with the latest slot pointing to them.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, Literal, NamedTuple
+
+from langgraph.checkpoint.oceanbase.jsoncodec import json_dumps, json_loads
+
+# "single_writer": the saver owning the cache is the only writer of the
+# threads it serves, so cached checkpoints and latest pointers never go stale.
+# "eventual": other processes write too; entries are trusted for `ttl`
+# seconds, after which they are read from the database again.
+CacheConsistency = Literal["single_writer", "eventual"]
+
+# Per-entry bookkeeping, on top of the serialized bytes.
+_ENTRY_OVERHEAD = 256
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _Entry:
+    __slots__ = (
+        "parent_checkpoint_id",
+        "checkpoint",
+        "metadata",
+        "blobs",
+        "writes",
+        "exact_writes",
+        "size",
+        "expires",
+    )
+
+    def __init__(
+        self,
+        parent_checkpoint_id: str | None,
+        checkpoint: str,
+        metadata: str,
+        blobs: dict[str, tuple[str, str, bytes | None]],
+        writes: dict[tuple[str, int], tuple[str, str, str, bytes]],
+        exact_writes: bool,
+        expires: float | None,
+    ) -> None:
+        self.parent_checkpoint_id = parent_checkpoint_id
+        self.checkpoint = checkpoint
+        self.metadata = metadata
+        # channel -> (version, type, blob)
+        self.blobs = blobs
+        # (task_id, idx) -> (task_id, channel, type, blob). Writes of entries
+        # read from the database are keyed by position, since their idx is not
+        # part of the row, and cannot be merged with new writes.
+        self.writes = writes
+        self.exact_writes = exact_writes
+        self.expires = expires
+        self.size = self._size()
+
+    def _size(self) -> int:
+        return (
+            _ENTRY_OVERHEAD
+            + len(self.checkpoint)
+            + len(self.metadata)
+            + sum(len(blob or b"") for _, _, blob in self.blobs.values())
+            + sum(len(write[3]) for write in self.writes.values())
+        )
+
+
+class CheckpointCache:
+    """A size-bounded LRU cache of serialized checkpoints.
+
+    Args:
+        max_entries: The maximum number of cached checkpoints.
+        max_bytes: The maximum total size of the cached checkpoints, counting
+            their serialized channel values, pending writes, checkpoint JSON
+            and metadata.
+        consistency: "single_writer" if the saver using the cache is the
+            only writer of its threads. Use "eventual" together with `ttl`
+            when several processes write to the same threads.
+        ttl: In "eventual" mode, the number of seconds a cached checkpoint or
+            latest pointer is served before it is read again.
+
+    Example:
+        >>> cache = CheckpointCache(max_entries=10_000, max_bytes=256 * 2**20)
+        >>> saver = PyOceanBaseSaver(conn, cache=cache)
+        >>> cache.stats().hit_ratio
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 2**20,
+        consistency: CacheConsistency = "single_writer",
+        ttl: float | None = None,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be a positive integer")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be a positive integer")
+        if consistency not in ("single_writer", "eventual"):
+            raise ValueError(f"Unknown cache consistency mode: {consistency}")
+        if consistency == "eventual" and (ttl is None or ttl <= 0):
+            raise ValueError('"eventual" consistency requires a positive ttl')
+        if consistency == "single_writer" and ttl is not None:
+            raise ValueError('ttl is only supported with "eventual" consistency')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.consistency = consistency
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str, str], _Entry] = OrderedDict()
+        self._latest: dict[tuple[str, str], tuple[str, float | None]] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(
+        self, thread_id: str, checkpoint_ns: str, checkpoint_id: str | None = None
+    ) -> dict[str, Any] | None:
+        """Return the row of a checkpoint, or of the latest checkpoint of the
+        thread if `checkpoint_id` is None, as the saver reads it from the
+        database."""
+        now = time.monotonic()
+        with self._lock:
+            if checkpoint_id is None:
+                latest = self._latest.get((thread_id, checkpoint_ns))
+                if latest is not None and self._expired(latest[1], now):
+                    del self._latest[(thread_id, checkpoint_ns)]
+                    latest = None
+                if latest is None:
+                    self._misses += 1
+                    return None
+                checkpoint_id = latest[0]
+            key = (thread_id, checkpoint_ns, checkpoint_id)
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry.expires, now):
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            channel_values = [
+                (channel, type_, blob)
+                for channel, (_, type_, blob) in entry.blobs.items()
+            ]
+            pending_writes = [entry.writes[write] for write in sorted(entry.writes)]
+        return {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint_id,
+            "parent_checkpoint_id": entry.parent_checkpoint_id,
+            "checkpoint": json_loads(entry.checkpoint),
+            "metadata": entry.metadata,
+            "channel_values": channel_values,
+            "pending_writes": pending_writes,
+        }
+
+    def add_row(self, row: Mapping[str, Any], *, latest: bool = False) -> None:
+        """Cache a row read from the database.
+
+        Args:
+            row: The row, as passed to `_load_checkpoint_tuple`.
+            latest: Whether the row was selected as the latest checkpoint of
+                its thread.
+        """
+        versions = row["checkpoint"].get("channel_versions", {})
+        self._store(
+            (row["thread_id"], row["checkpoint_ns"], row["checkpoint_id"]),
+            _Entry(
+                row["parent_checkpoint_id"],
+                json_dumps(row["checkpoint"]),
+                row["metadata"],
+                {
+                    channel: (str(versions.get(channel)), type_, blob)
+                    for channel, type_, blob in row["channel_values"] or ()
+                },
+                {
+                    (write[0], position): write
+                    for position, write in enumerate(row["pending_writes"] or ())
+                },
+                False,
+                self._expires(),
+            ),
+            latest,
+        )
+
+    def add_checkpoint(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        checkpoint: Mapping[str, Any],
+        parent_checkpoint_id: str | None,
+        checkpoint_json: str,
+        metadata_json: str,
+        blobs: Iterable[tuple[str, str, str, bytes | None]],
+        blob_channels: Iterable[str],
+    ) -> None:
+        """Cache a checkpoint written by `put` and make it the latest one.
+
+        Args:
+            checkpoint: The checkpoint that was saved.
+            checkpoint_json: The checkpoint JSON stored in the database,
+                without the channel values kept as blobs.
+            metadata_json: The metadata JSON stored in the database.
+            blobs: The (channel, version, type, blob) values written with the
+                checkpoint.
+            blob_channels: Every channel of the checkpoint whose value is
+                stored as a blob. Values not written with the checkpoint are
+                taken from the cached parent; if that is not possible the
+                checkpoint is not cached.
+        """
+        key = (thread_id, checkpoint_ns, checkpoint["id"])
+        versions = checkpoint["channel_versions"]
+        entry_blobs = {
+            channel: (str(version), type_, blob)
+            for channel, version, type_, blob in blobs
+            if type_ != "empty"
+        }
+        with self._lock:
+            parent = (
+                self._entries.get((thread_id, checkpoint_ns, parent_checkpoint_id))
+                if parent_checkpoint_id is not None
+                else None
+            )
+            for channel in blob_channels:
+                if channel in entry_blobs:
+                    continue
+                inherited = parent.blobs.get(channel) if parent is not None else None
+                if inherited is None or inherited[0] != str(versions.get(channel)):
+                    # the new checkpoint can't be served, and neither can the
+                    # previous latest one
+                    self._latest.pop((thread_id, checkpoint_ns), None)
+                    self._remove(key)
+                    return
+                entry_blobs[channel] = inherited
+            previous = self._entries.get(key)
+            entry = _Entry(
+                parent_checkpoint_id,
+                checkpoint_json,
+                metadata_json,
+                entry_blobs,
+                previous.writes if previous is not None else {},
+                previous.exact_writes if previous is not None else True,
+                self._expires(),
+            )
+            self._store_locked(key, entry, True)
+
+    def add_writes(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        checkpoint_id: str,
+        writes: Sequence[tuple[str, int, str, str, bytes]],
+        *,
+        upsert: bool,
+    ) -> None:
+        """Record committed (task_id, idx, channel, type, blob) pending writes.
+
+        With `upsert`, writes replace existing writes of the same task and
+        index, otherwise those are kept, like in the database.
+        """
+        key = (thread_id, checkpoint_ns, checkpoint_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            if not entry.exact_writes:
+                self._remove(key)
+                return
+            for task_id, idx, channel, type_, blob in writes:
+                write = (task_id, channel, type_, blob)
+                if upsert:
+                    entry.writes[(task_id, idx)] = write
+                else:
+                    entry.writes.setdefault((task_id, idx), write)
+            self._bytes -= entry.size
+            entry.size = entry._size()
+            self._bytes += entry.size
+            self._evict()
+
+    def invalidate_threads(self, thread_ids: Iterable[str]) -> None:
+        """Drop every cached checkpoint of the given threads."""
+        threads = {str(thread_id) for thread_id in thread_ids}
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in threads]:
+                self._remove(key)
+            for slot in [slot for slot in self._latest if slot[0] in threads]:
+                del self._latest[slot]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+    def _expires(self) -> float | None:
+        return time.monotonic() + self.ttl if self.ttl is not None else None
+
+    @staticmethod
+    def _expired(expires: float | None, now: float) -> bool:
+        return expires is not None and expires <= now
+
+    def _store(self, key: tuple[str, str, str], entry: _Entry, latest: bool) -> None:
+        with self._lock:
+            self._store_locked(key, entry, latest)
+
+    def _store_locked(
+        self, key: tuple[str, str, str], entry: _Entry, latest: bool
+    ) -> None:
+        if entry.size > self.max_bytes:
+            self._remove(key)
+            if latest:
+                self._latest.pop(key[:2], None)
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.size
+        self._entries[key] = entry
+        self._bytes += entry.size
+        if latest:
+            current = self._latest.get(key[:2])
+            # checkpoint ids increase, so an older read never moves the
+            # pointer back past a checkpoint written since
+            if current is None or current[0] <= key[2]:
+                self._latest[key[:2]] = (key[2], entry.expires)
+        self._evict()
+
+    def _remove(self, key: tuple[str, str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._dropped(key, entry)
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            key, entry = self._entries.popitem(last=False)
+            self._dropped(key, entry)
+            self._evictions += 1
+
+    def _dropped(self, key: tuple[str, str, str], entry: _Entry) -> None:
+        """Account for an entry removed from `_entries`, and drop the latest
+        slot pointing to it, so that there are never more slots than
+        entries."""
+        self._bytes -= entry.size
+        latest = self._latest.get(key[:2])
+        if latest is not None and latest[0] == key[2]:
+            del self._latest[key[:2]]
+
+
+__all__ = ["CacheConsistency", "CacheStats", "CheckpointCache"]
@@ -0,0 +1,458 @@
+"""Per-operation instrumentation of the savers and stores.
+
+Savers and stores created with an `instrument` callback record a `Span` for
+every public operation (`put`, `get_tuple`, `list`, `batch`, ...) and pass it
+to the callback when the operation finishes. A span counts the round trips to
+the server by statement class, the rows read or affected, the bytes of
+parameters sent and values received, and the time spent serializing values
+and waiting for the saver's lock or a pooled connection.
+
+The span of the running operation is available from `current_span()`, e.g.
+to tag it from a custom serializer. `SpanAggregator` is a ready-made callback
+reporting latency percentiles per operation.
+
+Example:
+    >>> aggregator = SpanAggregator()
+    >>> with PyOceanBaseSaver.from_conn_string(DB_URI, instrument=aggregator) as saver:
+    ...     graph = builder.compile(checkpointer=saver)
+    ...     graph.invoke(inputs, config)
+    >>> aggregator.report()["put"].p99_ms
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import (
+    AsyncIterator,
+    Callable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from inspect import isasyncgenfunction, iscoroutinefunction, isgeneratorfunction
+from typing import Any, NamedTuple, TypeVar, cast
+
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """The cost of one saver or store operation."""
+
+    __slots__ = (
+        "operation",
+        "duration",
+        "round_trips",
+        "statements",
+        "rows",
+        "payload_bytes",
+        "serde_time",
+        "lock_wait",
+        "error",
+    )
+
+    def __init__(self, operation: str) -> None:
+        self.operation = operation
+        # seconds, from the call to its return or the end of the iteration
+        self.duration = 0.0
+        self.round_trips = 0
+        # round trips by statement class, e.g. {"SELECT": 1, "INSERT": 2}
+        self.statements: dict[str, int] = defaultdict(int)
+        self.rows = 0
+        self.payload_bytes = 0
+        self.serde_time = 0.0
+        self.lock_wait = 0.0
+        # the name of the exception the operation raised, if any
+        self.error: str | None = None
+
+    def __repr__(self) -> str:
+        return (
+            f"Span({self.operation!r}, duration={self.duration:.6f}, "
+            f"round_trips={self.round_trips}, rows={self.rows}, "
+            f"payload_bytes={self.payload_bytes})"
+        )
+
+
+SpanCallback = Callable[[Span], None]
+
+_current_span: ContextVar[Span | None] = ContextVar("checkpoint_span", default=None)
+
+
+def current_span() -> Span | None:
+    """The span of the saver or store operation running in this context."""
+    return _current_span.get()
+
+
+@contextmanager
+def record(operation: str, callback: SpanCallback | None) -> Iterator[Span | None]:
+    """Record a span for `operation` and pass it to `callback` at the end.
+
+    Yields None, and records nothing, without a callback.
+    """
+    if callback is None:
+        yield None
+        return
+    span = Span(operation)
+    token = _current_span.set(span)
+    start = time.perf_counter()
+    try:
+        yield span
+    except BaseException as e:
+        span.error = type(e).__name__
+        raise
+    finally:
+        span.duration = time.perf_counter() - start
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            # a generator finalized in another context than it started in
+            pass
+        try:
+            callback(span)
+        except Exception:
+            logger.exception("Instrumentation callback failed")
+
+
+def _record_iter(
+    operation: str, callback: SpanCallback, iterator: Iterator[Any]
+) -> Iterator[Any]:
+    with record(operation, callback):
+        yield from iterator
+
+
+async def _record_aiter(
+    operation: str, callback: SpanCallback, iterator: AsyncIterator[Any]
+) -> AsyncIterator[Any]:
+    with record(operation, callback):
+        async for item in iterator:
+            yield item
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def instrumented(method: F) -> F:
+    """Record a span named after `method` for every call, when the instance
+    has an `instrument` callback.
+
+    Spans of generators and async generators last until the iteration ends.
+    """
+    operation = method.__name__
+
+    if isgeneratorfunction(method):
+
+        @wraps(method)
+        def gen_wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            iterator = method(self, *args, **kwargs)
+            if self.instrument is None:
+                return iterator
+            return _record_iter(operation, self.instrument, iterator)
+
+        return cast(F, gen_wrapper)
+
+    if isasyncgenfunction(method):
+
+        @wraps(method)
+        def agen_wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            iterator = method(self, *args, **kwargs)
+            if self.instrument is None:
+                return iterator
+            return _record_aiter(operation, self.instrument, iterator)
+
+        return cast(F, agen_wrapper)
+
+    if iscoroutinefunction(method):
+
+        @wraps(method)
+        async def async_wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            with record(operation, self.instrument):
+                return await method(self, *args, **kwargs)
+
+        return cast(F, async_wrapper)
+
+    @wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        with record(operation, self.instrument):
+            return method(self, *args, **kwargs)
+
+    return cast(F, wrapper)
+
+
+@contextmanager
+def timed_serde() -> Iterator[None]:
+    """Add the time spent in the block to the serde time of the current span."""
+    span = _current_span.get()
+    if span is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        span.serde_time += time.perf_counter() - start
+
+
+def statement_class(query: str) -> str:
+    """The first keyword of a statement, with CTEs counted as SELECT."""
+    words = query.lstrip(" \t\r\n(").split(None, 1)
+    keyword = words[0].upper() if words else ""
+    return "SELECT" if keyword == "WITH" else keyword
+
+
+def _payload_size(value: Any) -> int:
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, Mapping):
+        return sum(_payload_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_payload_size(v) for v in value)
+    return 0
+
+
+class InstrumentedCursor:
+    """A cursor recording its round trips, rows and payload in a span."""
+
+    def __init__(self, cursor: Any, span: Span) -> None:
+        self._cursor = cursor
+        self._span = span
+
+    def _executed(self, query: str, params: Any) -> None:
+        span = self._span
+        kind = statement_class(query)
+        span.round_trips += 1
+        span.statements[kind] += 1
+        span.payload_bytes += len(query) + _payload_size(params)
+        if kind != "SELECT":
+            rowcount = self._cursor.rowcount
+            if isinstance(rowcount, int) and rowcount > 0:
+                span.rows += rowcount
+
+    def _fetched(self, rows: Sequence[Any]) -> None:
+        self._span.rows += len(rows)
+        self._span.payload_bytes += _payload_size(rows)
+
+    def execute(self, query: str, params: Any = None) -> Any:
+        result = self._cursor.execute(query, params)
+        self._executed(query, params)
+        return result
+
+    def executemany(self, query: str, params: Any) -> Any:
+        result = self._cursor.executemany(query, params)
+        self._executed(query, params)
+        return result
+
+    def fetchone(self) -> Any:
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._fetched((row,))
+        return row
+
+    def fetchmany(self, size: int | None = None) -> Any:
+        rows = (
+            self._cursor.fetchmany() if size is None else self._cursor.fetchmany(size)
+        )
+        self._fetched(rows)
+        return rows
+
+    def fetchall(self) -> Any:
+        rows = self._cursor.fetchall()
+        self._fetched(rows)
+        return rows
+
+    def __iter__(self) -> Iterator[Any]:
+        for row in self._cursor:
+            self._fetched((row,))
+            yield row
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+
+class AsyncInstrumentedCursor(InstrumentedCursor):
+    """`InstrumentedCursor` for the cursors of asyncio drivers."""
+
+    async def execute(self, query: str, params: Any = None) -> Any:
+        result = await self._cursor.execute(query, params)
+        self._executed(query, params)
+        return result
+
+    async def executemany(self, query: str, params: Any) -> Any:
+        result = await self._cursor.executemany(query, params)
+        self._executed(query, params)
+        return result
+
+    async def fetchone(self) -> Any:
+        row = await self._cursor.fetchone()
+        if row is not None:
+            self._fetched((row,))
+        return row
+
+    async def fetchmany(self, size: int | None = None) -> Any:
+        rows = await (
+            self._cursor.fetchmany() if size is None else self._cursor.fetchmany(size)
+        )
+        self._fetched(rows)
+        return rows
+
+    async def fetchall(self) -> Any:
+        rows = await self._cursor.fetchall()
+        self._fetched(rows)
+        return rows
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        async for row in self._cursor:
+            self._fetched((row,))
+            yield row
+
+
+def instrument_cursor(cursor: Any, span: Span | None) -> Any:
+    return cursor if span is None else InstrumentedCursor(cursor, span)
+
+
+def instrument_async_cursor(cursor: Any, span: Span | None) -> Any:
+    return cursor if span is None else AsyncInstrumentedCursor(cursor, span)
+
+
+class TimedSerializer(SerializerProtocol):
+    """Serializer adding the time spent in another serializer to the current
+    span."""
+
+    def __init__(self, serde: SerializerProtocol) -> None:
+        self.serde = serde
+
+    def dumps(self, obj: Any) -> bytes:
+        with timed_serde():
+            return self.serde.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        with timed_serde():
+            return self.serde.loads(data)
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        with timed_serde():
+            return self.serde.dumps_typed(obj)
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        with timed_serde():
+            return self.serde.loads_typed(data)
+
+
+class OperationStats(NamedTuple):
+    """Aggregated spans of one operation. Means are per call."""
+
+    calls: int
+    errors: int
+    p50_ms: float
+    p99_ms: float
+    mean_ms: float
+    round_trips: float
+    rows: float
+    payload_bytes: float
+    serde_ms: float
+    lock_wait_ms: float
+
+
+class _Samples:
+    __slots__ = (
+        "durations",
+        "count",
+        "errors",
+        "round_trips",
+        "rows",
+        "payload_bytes",
+        "serde_time",
+        "lock_wait",
+        "duration",
+    )
+
+    def __init__(self, max_samples: int) -> None:
+        self.durations: deque[float] = deque(maxlen=max_samples)
+        self.count = self.errors = self.round_trips = self.rows = 0
+        self.payload_bytes = 0
+        self.serde_time = self.lock_wait = self.duration = 0.0
+
+
+class SpanAggregator:
+    """A span callback collecting latency percentiles per operation.
+
+    Percentiles are computed over the last `max_samples` calls of every
+    operation, the other statistics over all calls since the last `reset`.
+    The aggregator is thread safe, so one can be shared by several savers.
+
+    Example:
+        >>> aggregator = SpanAggregator()
+        >>> saver = PyOceanBaseSaver(conn, instrument=aggregator)
+        >>> for operation, stats in aggregator.report().items():
+        ...     print(operation, stats.p50_ms, stats.p99_ms, stats.round_trips)
+    """
+
+    def __init__(self, max_samples: int = 10_000) -> None:
+        if max_samples < 1:
+            raise ValueError("max_samples must be a positive integer")
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples: dict[str, _Samples] = {}
+
+    def __call__(self, span: Span) -> None:
+        with self._lock:
+            samples = self._samples.get(span.operation)
+            if samples is None:
+                samples = self._samples[span.operation] = _Samples(self.max_samples)
+            samples.durations.append(span.duration)
+            samples.count += 1
+            samples.errors += span.error is not None
+            samples.round_trips += span.round_trips
+            samples.rows += span.rows
+            samples.payload_bytes += span.payload_bytes
+            samples.serde_time += span.serde_time
+            samples.lock_wait += span.lock_wait
+            samples.duration += span.duration
+
+    def report(self) -> dict[str, OperationStats]:
+        with self._lock:
+            return {
+                operation: self._stats(samples)
+                for operation, samples in sorted(self._samples.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+    @staticmethod
+    def _stats(samples: _Samples) -> OperationStats:
+        ordered = sorted(samples.durations)
+
+        def percentile(q: float) -> float:
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e3
+
+        count = samples.count
+        return OperationStats(
+            calls=count,
+            errors=samples.errors,
+            p50_ms=percentile(0.5),
+            p99_ms=percentile(0.99),
+            mean_ms=samples.duration / count * 1e3,
+            round_trips=samples.round_trips / count,
+            rows=samples.rows / count,
+            payload_bytes=samples.payload_bytes / count,
+            serde_ms=samples.serde_time / count * 1e3,
+            lock_wait_ms=samples.lock_wait / count * 1e3,
+        )
+
+
+__all__ = [
+    "OperationStats",
+    "Span",
+    "SpanAggregator",
+    "SpanCallback",
+    "TimedSerializer",
+    "current_span",
+]
@@ -0,0 +1,107 @@
+"""The JSON codec used for the documents kept in JSON columns.
+
+Checkpoints, metadata, metadata filters, the channel values and pending writes
+aggregated by the read queries, and store values all go through a `JsonCodec`.
+The default one is backed by orjson, and falls back to the standard library
+wherever orjson would produce a different document.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from collections.abc import Callable
+from enum import Enum
+from typing import Any, NamedTuple
+from uuid import UUID
+
+import orjson
+
+
+class JsonCodec(NamedTuple):
+    """Encodes values to JSON text and decodes JSON text or bytes."""
+
+    name: str
+    dumps: Callable[[Any], str]
+    loads: Callable[[str | bytes], Any]
+
+
+# datetimes and dataclasses are left to `default`, which orjson does not get,
+# so they raise TypeError like they do with json instead of being encoded
+_ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+# orjson reads integers beyond 64 bits as floats. They have at least 19
+# digits, and so do the few documents left to json as a false positive.
+_LONG_NUMBER = re.compile(r"[0-9]{19}")
+_LONG_NUMBER_BYTES = re.compile(rb"[0-9]{19}")
+
+
+def _orjson_encodes_like_json(obj: Any) -> bool:
+    """Whether orjson encodes `obj` like json, or raises TypeError.
+
+    Only NaN and infinities, which orjson writes as null, and UUIDs and enums,
+    which json rejects, tell them apart.
+    """
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif isinstance(item, float):
+            if not math.isfinite(item):
+                return False
+        elif isinstance(item, (UUID, Enum)):
+            return False
+    return True
+
+
+def _orjson_dumps(obj: Any) -> str:
+    if not _orjson_encodes_like_json(obj):
+        return json.dumps(obj)
+    try:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode()
+    except TypeError:
+        # orjson rejects non-string keys and integers beyond 64 bits, which
+        # json encodes, and raises TypeError itself for unsupported types
+        return json.dumps(obj)
+
+
+def _orjson_loads(data: str | bytes) -> Any:
+    if isinstance(data, bytes):
+        long_number = _LONG_NUMBER_BYTES.search(data)
+    else:
+        long_number = _LONG_NUMBER.search(data)
+    if long_number is not None:
+        return json.loads(data)
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # NaN, Infinity and lone surrogates, which json accepts
+        return json.loads(data)
+
+
+def orjson_codec() -> JsonCodec:
+    """The default codec.
+
+    Documents are compact and not ASCII-escaped, which is the same value once
+    stored in a JSON column. Everything else orjson would do differently is
+    left to json: documents with NaN, infinities, UUIDs or enums are encoded
+    by json, and documents that may hold integers beyond 64 bits are decoded
+    by it.
+    """
+    return JsonCodec("orjson", _orjson_dumps, _orjson_loads)
+
+
+def stdlib_codec() -> JsonCodec:
+    """A codec backed by the standard library json module only."""
+    return JsonCodec("json", json.dumps, json.loads)
+
+
+DEFAULT_JSON_CODEC = orjson_codec()
+
+json_dumps = DEFAULT_JSON_CODEC.dumps
+json_loads = DEFAULT_JSON_CODEC.loads
@@ -4,10 +4,11 @@ import urllib.parse
 import warnings
 from collections.abc import Iterator
 from contextlib import contextmanager
-from typing import Any
+from typing import Any, cast
 
 import pymysql
-from pymysql.cursors import DictCursor
+from pymysql.constants import CLIENT
+from pymysql.cursors import DictCursor, SSDictCursor
 from typing_extensions import Self, override
 
 from langgraph.checkpoint.oceanbase import BaseSyncMySQLSaver, _internal
@@ -44,11 +45,13 @@ class PyOceanBaseSaver(BaseSyncMySQLSaver[pymysql.Connection, DictCursor]):
     def from_conn_string(
         cls,
         conn_string: str,
+        **kwargs: Any,
     ) -> Iterator[Self]:
         """Create a new PyMySQLSaver instance from a connection string.
 
         Args:
             conn_string: The MySQL connection info string.
+            **kwargs: Additional options passed on to the saver constructor.
 
         Returns:
             PyMySQLSaver: A new PyMySQLSaver instance.
@@ -59,14 +62,25 @@ class PyOceanBaseSaver(BaseSyncMySQLSaver[pymysql.Connection, DictCursor]):
         with pymysql.connect(
             **cls.parse_conn_string(conn_string),
             autocommit=True,
+            client_flag=(
+                CLIENT.MULTI_STATEMENTS if kwargs.get("read_engine") == "binary" else 0
+            ),
         ) as conn:
-            yield cls(conn)
+            yield cls(conn, **kwargs)
 
     @override
     @staticmethod
     def _get_cursor_from_connection(conn: pymysql.Connection) -> DictCursor:
         return conn.cursor(DictCursor)
 
+    @override
+    @staticmethod
+    def _get_streaming_cursor_from_connection(
+        conn: pymysql.Connection,
+    ) -> DictCursor:
+        # unbuffered, but yields the same dict rows as DictCursor
+        return cast(DictCursor, conn.cursor(SSDictCursor))
+
 
 class ShallowPyMySQLSaver(BaseShallowSyncMySQLSaver):
     def __init__(
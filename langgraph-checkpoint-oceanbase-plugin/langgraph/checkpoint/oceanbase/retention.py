@@ -0,0 +1,156 @@
+"""Retention policies for pruning old checkpoints.
+
+A `RetentionPolicy` describes which checkpoints of every thread to keep. The
+`prune` / `aprune` methods of the savers delete the others, together with
+their pending writes, and then garbage-collect the channel blobs no surviving
+checkpoint refers to. `RetentionJob` runs `prune` periodically on a background
+thread.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from langgraph.checkpoint.oceanbase import BaseSyncMySQLSaver
+    from langgraph.checkpoint.oceanbase.aio_base import BaseAsyncMySQLSaver
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionPolicy:
+    """Which checkpoints of a thread survive pruning.
+
+    A checkpoint is deleted if it is not among the `keep_last` newest
+    checkpoints of its thread and namespace, and it is older than `ttl`, and
+    its metadata does not contain `keep_metadata`. Criteria left as None do
+    not protect anything, so `RetentionPolicy(ttl=...)` alone also expires the
+    latest checkpoint of idle threads.
+
+    Args:
+        keep_last: The number of newest checkpoints to keep per thread and
+            namespace.
+        ttl: The age, as a timedelta or in seconds, after which checkpoints
+            may be deleted. Ages are measured from the checkpoint's `ts`.
+        keep_metadata: Checkpoints whose metadata contains these key/value
+            pairs are always kept, e.g. `{"source": "input"}`.
+
+    Example:
+        >>> policy = RetentionPolicy(keep_last=20, ttl=timedelta(days=30))
+        >>> saver.prune(policy)
+    """
+
+    __slots__ = ("keep_last", "ttl", "keep_metadata")
+
+    def __init__(
+        self,
+        *,
+        keep_last: int | None = None,
+        ttl: timedelta | float | None = None,
+        keep_metadata: dict[str, Any] | None = None,
+    ) -> None:
+        if keep_last is None and ttl is None:
+            raise ValueError("A retention policy needs keep_last or ttl")
+        if keep_last is not None and keep_last < 1:
+            raise ValueError("keep_last must be a positive integer")
+        if ttl is not None and not isinstance(ttl, timedelta):
+            ttl = timedelta(seconds=ttl)
+        if ttl is not None and ttl < timedelta(0):
+            raise ValueError("ttl must not be negative")
+        self.keep_last = keep_last
+        self.ttl: timedelta | None = ttl
+        self.keep_metadata = keep_metadata
+
+    def cutoff(self) -> str | None:
+        """The `ts` before which checkpoints are expired, or None without a ttl."""
+        if self.ttl is None:
+            return None
+        return (datetime.now(timezone.utc) - self.ttl).isoformat()
+
+    def __repr__(self) -> str:
+        return (
+            f"RetentionPolicy(keep_last={self.keep_last!r}, ttl={self.ttl!r}, "
+            f"keep_metadata={self.keep_metadata!r})"
+        )
+
+
+class PruneResult(NamedTuple):
+    """The number of rows deleted by one `prune` run."""
+
+    checkpoints: int = 0
+    writes: int = 0
+    blobs: int = 0
+    blob_contents: int = 0
+    blob_chunks: int = 0
+
+
+class RetentionJob:
+    """Applies a retention policy to a saver every `interval` seconds.
+
+    The job runs on a daemon thread and calls the synchronous `prune` of the
+    saver, so it works with async savers as long as their event loop keeps
+    running. Errors are logged and retried on the next run.
+
+    Example:
+        >>> with RetentionJob(saver, RetentionPolicy(keep_last=50), interval=3600):
+        ...     serve()
+    """
+
+    def __init__(
+        self,
+        saver: BaseSyncMySQLSaver | BaseAsyncMySQLSaver,
+        policy: RetentionPolicy,
+        *,
+        interval: float,
+        batch_size: int = 1000,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.saver = saver
+        self.policy = policy
+        self.interval = interval
+        self.batch_size = batch_size
+        self.last_result: PruneResult | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self) -> PruneResult:
+        """Prune immediately on the calling thread."""
+        self.last_result = self.saver.prune(self.policy, batch_size=self.batch_size)
+        return self.last_result
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise RuntimeError("The retention job is already running")
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="checkpoint-retention", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the job, waiting for a prune in progress to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Pruning checkpoints failed")
+
+    def __enter__(self) -> RetentionJob:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+__all__ = ["PruneResult", "RetentionJob", "RetentionPolicy"]
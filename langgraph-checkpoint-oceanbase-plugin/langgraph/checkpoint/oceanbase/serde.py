@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import lzma
+import zlib
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+
+class Codec(NamedTuple):
+    """A compression codec, recorded by `name` in the type of stored values."""
+
+    name: str
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+def zlib_codec(level: int = 6) -> Codec:
+    return Codec("zlib", lambda data: zlib.compress(data, level), zlib.decompress)
+
+
+def lzma_codec(preset: int = 6) -> Codec:
+    return Codec(
+        "lzma", lambda data: lzma.compress(data, preset=preset), lzma.decompress
+    )
+
+
+def zstd_codec(level: int = 3) -> Codec:
+    try:
+        import zstandard  # type: ignore[import-not-found, unused-ignore]
+    except ImportError:
+        raise ImportError(
+            "zstandard is not installed. Please install it with `pip install zstandard`."
+        ) from None
+
+    # the module level functions are thread safe, (de)compressor objects are not
+    return Codec(
+        "zstd", lambda data: zstandard.compress(data, level), zstandard.decompress
+    )
+
+
+def lz4_codec() -> Codec:
+    try:
+        import lz4.frame  # type: ignore[import-not-found, import-untyped, unused-ignore]
+    except ImportError:
+        raise ImportError(
+            "lz4 is not installed. Please install it with `pip install lz4`."
+        ) from None
+
+    return Codec("lz4", lz4.frame.compress, lz4.frame.decompress)
+
+
+CODECS: dict[str, Callable[[], Codec]] = {
+    "zlib": zlib_codec,
+    "lzma": lzma_codec,
+    "zstd": zstd_codec,
+    "lz4": lz4_codec,
+}
+
+
+class CompressedSerializer(SerializerProtocol):
+    """Serializer that compresses the output of another serializer.
+
+    Values whose serialized form is at least `min_size` bytes are compressed
+    with `codec`, and the codec name is appended to their type, e.g.
+    `msgpack+zlib`. Smaller values, and values that do not shrink, are stored
+    as is. Values written without compression, or with any of the built-in
+    codecs, stay readable.
+
+    Example:
+        >>> from langgraph.checkpoint.oceanbase.pyoceanbase import PyOceanBaseSaver
+        >>> serde = CompressedSerializer("zstd", min_size=4096)
+        >>> with PyOceanBaseSaver.from_conn_string(DB_URI, serde=serde) as saver:
+        ...     saver.setup()
+    """
+
+    def __init__(
+        self,
+        codec: str | Codec = "zlib",
+        serde: SerializerProtocol | None = None,
+        *,
+        min_size: int = 1024,
+    ) -> None:
+        if min_size < 0:
+            raise ValueError("min_size must not be negative")
+        self.codec = CODECS[codec]() if isinstance(codec, str) else codec
+        self.serde = serde or JsonPlusSerializer()
+        self.min_size = min_size
+        self._decoders: dict[str, Codec] = {self.codec.name: self.codec}
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.serde.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self.serde.loads(data)
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        """Serialize an object, compressing the bytes if they are large enough."""
+        typ, data = self.serde.dumps_typed(obj)
+        if len(data) < self.min_size:
+            return typ, data
+        compressed = self.codec.compress(data)
+        if len(compressed) >= len(data):
+            return typ, data
+        return f"{typ}+{self.codec.name}", compressed
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        typ, payload = data
+        inner, _, suffix = typ.rpartition("+")
+        if not inner or suffix not in CODECS:
+            return self.serde.loads_typed(data)
+        return self.serde.loads_typed(
+            (inner, self._decoder(suffix).decompress(payload))
+        )
+
+    def _decoder(self, name: str) -> Codec:
+        if name not in self._decoders:
+            self._decoders[name] = CODECS[name]()
+        return self._decoders[name]
+
+
+__all__ = [
+    "Codec",
+    "CompressedSerializer",
+    "lz4_codec",
+    "lzma_codec",
+    "zlib_codec",
+    "zstd_codec",
+]
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import threading
 from collections.abc import AsyncIterator, Iterator, Sequence
 from contextlib import asynccontextmanager, contextmanager
@@ -309,11 +308,15 @@ class BaseShallowSyncMySQLSaver(BaseMySQLSaver, Generic[_internal.C, _internal.R
             cur.execute(self.SELECT_SQL + where, args)
             values = cur.fetchall()
             for value in values:
-                pending_sends = deserialize_pending_sends(value["pending_sends"])
+                pending_sends = deserialize_pending_sends(
+                    value["pending_sends"], self.json_codec.loads
+                )
                 checkpoint: Checkpoint = {
-                    **json.loads(value["checkpoint"]),
+                    **self.json_codec.loads(value["checkpoint"]),
                     "channel_values": self._load_blobs(
-                        deserialize_channel_values(value["channel_values"])
+                        deserialize_channel_values(
+                            value["channel_values"], self.json_codec.loads
+                        )
                     ),
                     "pending_sends": [
                         self.serde.loads_typed((c, b)) for c, b in pending_sends
@@ -332,7 +335,9 @@ class BaseShallowSyncMySQLSaver(BaseMySQLSaver, Generic[_internal.C, _internal.R
                     checkpoint=checkpoint,
                     metadata=self._load_metadata(value["metadata"]),
                     pending_writes=self._load_writes(
-                        deserialize_pending_writes(value["pending_writes"])
+                        deserialize_pending_writes(
+                            value["pending_writes"], self.json_codec.loads
+                        )
                     ),
                 )
 
@@ -381,11 +386,15 @@ class BaseShallowSyncMySQLSaver(BaseMySQLSaver, Generic[_internal.C, _internal.R
             )
             values = cur.fetchall()
             for value in values:
-                pending_sends = deserialize_pending_sends(value["pending_sends"])
+                pending_sends = deserialize_pending_sends(
+                    value["pending_sends"], self.json_codec.loads
+                )
                 checkpoint: Checkpoint = {
-                    **json.loads(value["checkpoint"]),
+                    **self.json_codec.loads(value["checkpoint"]),
                     "channel_values": self._load_blobs(
-                        deserialize_channel_values(value["channel_values"])
+                        deserialize_channel_values(
+                            value["channel_values"], self.json_codec.loads
+                        )
                     ),
                     "pending_sends": [
                         self.serde.loads_typed((c, b)) for c, b in pending_sends
@@ -404,7 +413,9 @@ class BaseShallowSyncMySQLSaver(BaseMySQLSaver, Generic[_internal.C, _internal.R
                     checkpoint=checkpoint,
                     metadata=self._load_metadata(value["metadata"]),
                     pending_writes=self._load_writes(
-                        deserialize_pending_writes(value["pending_writes"])
+                        deserialize_pending_writes(
+                            value["pending_writes"], self.json_codec.loads
+                        )
                     ),
                 )
 
@@ -480,7 +491,7 @@ class BaseShallowSyncMySQLSaver(BaseMySQLSaver, Generic[_internal.C, _internal.R
                     thread_id,
                     checkpoint_ns,
                     checkpoint_ns,
-                    json.dumps(copy),
+                    self.json_codec.dumps(copy),
                     self._dump_metadata(get_checkpoint_metadata(config, metadata)),
                 ),
             )
@@ -619,11 +630,15 @@ class BaseShallowAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainterna
         async with self._cursor() as cur:
             await cur.execute(self.SELECT_SQL + where, args)
             async for value in cur:
-                pending_sends = deserialize_pending_sends(value["pending_sends"])
+                pending_sends = deserialize_pending_sends(
+                    value["pending_sends"], self.json_codec.loads
+                )
                 checkpoint: Checkpoint = {
-                    **json.loads(value["checkpoint"]),
+                    **self.json_codec.loads(value["checkpoint"]),
                     "channel_values": self._load_blobs(
-                        deserialize_channel_values(value["channel_values"])
+                        deserialize_channel_values(
+                            value["channel_values"], self.json_codec.loads
+                        )
                     ),
                     "pending_sends": [
                         self.serde.loads_typed((c, b)) for c, b in pending_sends
@@ -643,7 +658,9 @@ class BaseShallowAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainterna
                     metadata=self._load_metadata(value["metadata"]),
                     pending_writes=await asyncio.to_thread(
                         self._load_writes,
-                        deserialize_pending_writes(value["pending_writes"]),
+                        deserialize_pending_writes(
+                            value["pending_writes"], self.json_codec.loads
+                        ),
                     ),
                 )
 
@@ -668,11 +685,15 @@ class BaseShallowAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainterna
             )
 
             async for value in cur:
-                pending_sends = deserialize_pending_sends(value["pending_sends"])
+                pending_sends = deserialize_pending_sends(
+                    value["pending_sends"], self.json_codec.loads
+                )
                 checkpoint: Checkpoint = {
-                    **json.loads(value["checkpoint"]),
+                    **self.json_codec.loads(value["checkpoint"]),
                     "channel_values": self._load_blobs(
-                        deserialize_channel_values(value["channel_values"])
+                        deserialize_channel_values(
+                            value["channel_values"], self.json_codec.loads
+                        )
                     ),
                     "pending_sends": [
                         self.serde.loads_typed((c, b)) for c, b in pending_sends
@@ -692,7 +713,9 @@ class BaseShallowAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainterna
                     metadata=self._load_metadata(value["metadata"]),
                     pending_writes=await asyncio.to_thread(
                         self._load_writes,
-                        deserialize_pending_writes(value["pending_writes"]),
+                        deserialize_pending_writes(
+                            value["pending_writes"], self.json_codec.loads
+                        ),
                     ),
                 )
 
@@ -755,7 +778,7 @@ class BaseShallowAsyncMySQLSaver(BaseMySQLSaver, Generic[_ainternal.C, _ainterna
                     thread_id,
                     checkpoint_ns,
                     checkpoint_ns,
-                    json.dumps(copy),
+                    self.json_codec.dumps(copy),
                     self._dump_metadata(get_checkpoint_metadata(config, metadata)),
                 ),
             )
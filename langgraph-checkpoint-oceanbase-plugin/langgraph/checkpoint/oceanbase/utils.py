@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import base64
-import json
-from typing import NamedTuple
+from collections.abc import Callable, Sequence
+from typing import Any, NamedTuple
+
+from langgraph.checkpoint.oceanbase.jsoncodec import json_loads
 
 Base64Blob = str
 
@@ -26,11 +28,13 @@ class MySQLPendingWrite(NamedTuple):
     idx: int
 
 
-def deserialize_pending_writes(value: str) -> list[tuple[str, str, str, bytes]]:
+def deserialize_pending_writes(
+    value: str, loads: Callable[[str], Any] = json_loads
+) -> list[tuple[str, str, str, bytes]]:
     if not value:
         return []
 
-    values = (MySQLPendingWrite(*write) for write in json.loads(value))
+    values = (MySQLPendingWrite(*write) for write in loads(value))
 
     return [
         (db.task_id, db.channel, db.type_, decode_base64_blob(db.blob))
@@ -46,11 +50,13 @@ class MySQLPendingSend(NamedTuple):
     idx: int
 
 
-def deserialize_pending_sends(value: str) -> list[tuple[str, bytes]]:
+def deserialize_pending_sends(
+    value: str, loads: Callable[[str], Any] = json_loads
+) -> list[tuple[str, bytes]]:
     if not value:
         return []
 
-    values = (MySQLPendingSend(*send) for send in json.loads(value))
+    values = (MySQLPendingSend(*send) for send in loads(value))
 
     return [
         (db.type_, decode_base64_blob(db.blob))
@@ -64,11 +70,13 @@ class MySQLChannelValue(NamedTuple):
     blob: Base64Blob | None
 
 
-def deserialize_channel_values(value: str) -> list[tuple[str, str, bytes | None]]:
+def deserialize_channel_values(
+    value: str, loads: Callable[[str], Any] = json_loads
+) -> list[tuple[str, str, bytes | None]]:
     if not value:
         return []
 
-    values = (MySQLChannelValue(*channel_value) for channel_value in json.loads(value))
+    values = (MySQLChannelValue(*channel_value) for channel_value in loads(value))
 
     return [
         (
@@ -84,3 +92,49 @@ def mysql_mariadb_branch(mysql_fragment: str, mariadb_fragment: str) -> str:
     # MariaDB ignores MySQL conditional comments with version numbers between
     # 500700 and 999999. We can use this to our advantage.
     return f"/*!50700 {mysql_fragment}*//*M! {mariadb_fragment}*/"
+
+
+def keyset_predicate(columns: Sequence[str], op: str = ">") -> str:
+    """Build a predicate selecting rows strictly after a key in index order.
+
+    The row comparison `(c1, c2) > (%s, %s)` is expanded into
+    `c1 > %s OR (c1 = %s AND c2 > %s)`, which the range optimizer of every
+    MySQL flavor turns into an index range scan. Use `keyset_params` to build
+    the matching parameters. Pass `op="<"` to walk an index backwards.
+    """
+    first, *rest = columns
+    if not rest:
+        return f"{first} {op} %s"
+    return f"({first} {op} %s OR ({first} = %s AND {keyset_predicate(rest, op)}))"
+
+
+def keyset_params(values: Sequence[Any]) -> list[Any]:
+    """Parameters for a `keyset_predicate` over the same number of columns."""
+    *init, last = values
+    return [param for value in init for param in (value, value)] + [last]
+
+
+def approximate_size(value: Any, limit: int) -> int:
+    """Estimate the serialized size of `value` in bytes, walking it only until
+    the estimate reaches `limit`.
+
+    Strings and bytes count for their length and every other node for a few
+    bytes, which is enough to tell small values from large ones without
+    serializing them.
+    """
+    size = 0
+    stack = [value]
+    while stack and size < limit:
+        item = stack.pop()
+        if isinstance(item, (str, bytes, bytearray)):
+            size += len(item)
+            continue
+        size += 8
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif hasattr(item, "__dict__"):
+            stack.extend(vars(item).values())
+    return size
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from collections.abc import AsyncIterator, Iterable, Sequence
 from contextlib import asynccontextmanager
 from typing import Any, Callable, Generic, cast
@@ -9,6 +10,14 @@ from typing import Any, Callable, Generic, cast
 import orjson
 
 from langgraph.checkpoint.oceanbase import _ainternal
+from langgraph.checkpoint.oceanbase.instrumentation import (
+    SpanCallback,
+    current_span,
+    instrument_async_cursor,
+    instrumented,
+    timed_serde,
+)
+from langgraph.checkpoint.oceanbase.jsoncodec import DEFAULT_JSON_CODEC, JsonCodec
 from langgraph.store.base import (
     GetOp,
     ListNamespacesOp,
@@ -35,16 +44,20 @@ class BaseAsyncMySQLStore(
     BaseMySQLStore[_ainternal.Conn[_ainternal.C]],
     Generic[_ainternal.C, _ainternal.R],
 ):
-    __slots__ = ("_deserializer", "lock")
+    __slots__ = ("_deserializer", "instrument", "json_codec", "lock")
 
     def __init__(
         self,
         conn: _ainternal.Conn[_ainternal.C],
         *,
         deserializer: Callable[[bytes | orjson.Fragment], dict[str, Any]] | None = None,
+        instrument: SpanCallback | None = None,
+        json_codec: JsonCodec | None = None,
     ) -> None:
         super().__init__()
         self._deserializer = deserializer
+        self.instrument = instrument
+        self.json_codec = json_codec or DEFAULT_JSON_CODEC
         self.conn = conn
         self.lock = asyncio.Lock()
         self.loop = asyncio.get_running_loop()
@@ -53,11 +66,16 @@ class BaseAsyncMySQLStore(
     def _get_cursor_from_connection(conn: _ainternal.C) -> _ainternal.R:
         raise NotImplementedError
 
+    @instrumented
     async def abatch(self, ops: Iterable[Op]) -> list[Result]:
         grouped_ops, num_ops = _group_ops(ops)
         results: list[Result] = [None] * num_ops
 
+        span = current_span() if self.instrument is not None else None
+        started = time.perf_counter()
         async with _ainternal.get_connection(self.conn) as conn:
+            if span is not None:
+                span.lock_wait += time.perf_counter() - started
             await self._execute_batch(grouped_ops, results, conn)
 
         return results
@@ -144,21 +162,23 @@ class BaseAsyncMySQLStore(
             await cur.execute(query, params)
             rows = cast(list[Row], await cur.fetchall())
             key_to_row = {row["key"]: row for row in rows}
-            for idx, key in items:
-                row = key_to_row.get(key)
-                if row:
-                    results[idx] = _row_to_item(
-                        namespace, row, loader=self._deserializer
-                    )
-                else:
-                    results[idx] = None
+            with timed_serde():
+                for idx, key in items:
+                    row = key_to_row.get(key)
+                    if row:
+                        results[idx] = _row_to_item(
+                            namespace, row, loader=self._load_value
+                        )
+                    else:
+                        results[idx] = None
 
     async def _batch_put_ops(
         self,
         put_ops: Sequence[tuple[int, PutOp]],
         cur: _ainternal.R,
     ) -> None:
-        queries = self._prepare_batch_PUT_queries(put_ops)
+        with timed_serde():
+            queries = self._prepare_batch_PUT_queries(put_ops)
         for query, params in queries:
             await cur.execute(query, params)
 
@@ -172,12 +192,13 @@ class BaseAsyncMySQLStore(
         for (idx, _), (query, params) in zip(search_ops, queries):
             await cur.execute(query, params)
             rows = cast(list[Row], await cur.fetchall())
-            items = [
-                _row_to_search_item(
-                    _decode_ns_bytes(row["prefix"]), row, loader=self._deserializer
-                )
-                for row in rows
-            ]
+            with timed_serde():
+                items = [
+                    _row_to_search_item(
+                        _decode_ns_bytes(row["prefix"]), row, loader=self._load_value
+                    )
+                    for row in rows
+                ]
             results[idx] = items
 
     async def _batch_list_namespaces_ops(
@@ -202,18 +223,24 @@ class BaseAsyncMySQLStore(
             conn: The database connection to use
             pipeline: whether to use transaction context manager and handle concurrency
         """
+        span = current_span() if self.instrument is not None else None
+        started = time.perf_counter()
         if pipeline:
             # a connection can only be used by one
             # thread/coroutine at a time, so we acquire a lock
             async with self.lock:
+                if span is not None:
+                    span.lock_wait += time.perf_counter() - started
                 await conn.begin()
                 try:
                     async with self._get_cursor_from_connection(conn) as cur:
-                        yield cur
+                        yield instrument_async_cursor(cur, span)
                     await conn.commit()
                 except:
                     await conn.rollback()
                     raise
         else:
             async with self.lock, self._get_cursor_from_connection(conn) as cur:
-                yield cur
+                if span is not None:
+                    span.lock_wait += time.perf_counter() - started
+                yield instrument_async_cursor(cur, span)
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import threading
+import time
 from collections import defaultdict
 from collections.abc import Iterable, Iterator, Sequence
 from contextlib import contextmanager
@@ -22,6 +22,14 @@ from typing_extensions import TypedDict
 
 from langgraph.checkpoint.oceanbase import _ainternal as _ainternal
 from langgraph.checkpoint.oceanbase import _internal as _internal
+from langgraph.checkpoint.oceanbase.instrumentation import (
+    SpanCallback,
+    current_span,
+    instrument_cursor,
+    instrumented,
+    timed_serde,
+)
+from langgraph.checkpoint.oceanbase.jsoncodec import DEFAULT_JSON_CODEC, JsonCodec
 from langgraph.checkpoint.oceanbase.utils import mysql_mariadb_branch
 from langgraph.store.base import (
     BaseStore,
@@ -64,6 +72,14 @@ class BaseMySQLStore(Generic[C]):
     MIGRATIONS = MIGRATIONS
     conn: C
     _deserializer: Callable[[bytes | orjson.Fragment], dict[str, Any]] | None
+    json_codec: JsonCodec
+
+    def _load_value(self, content: bytes | orjson.Fragment) -> dict[str, Any]:
+        """Decode a stored value with the `deserializer`, or else the
+        `json_codec`."""
+        if self._deserializer is not None:
+            return self._deserializer(content)
+        return _json_loads(content, self.json_codec.loads)
 
     def _get_batch_GET_ops_queries(
         self,
@@ -124,7 +140,7 @@ class BaseMySQLStore(Generic[C]):
                     [
                         _namespace_to_text(op.namespace),
                         op.key,
-                        json.dumps(op.value),
+                        self.json_codec.dumps(op.value),
                     ]
                 )
             values_str = ",".join(values)
@@ -173,7 +189,7 @@ class BaseMySQLStore(Generic[C]):
                             + "%s"
                             + mysql_mariadb_branch(" AS JSON)", ", '$'))")
                         )
-                        filter_params.extend([key, json.dumps(value)])
+                        filter_params.extend([key, self.json_codec.dumps(value)])
 
             base_query = """
                 SELECT prefix, `key`, value, created_at, updated_at
@@ -248,7 +264,7 @@ class BaseMySQLStore(Generic[C]):
         if op == "$eq":
             return "json_extract(value, concat('$.', %s)) = CAST(%s AS JSON)", [
                 key,
-                json.dumps(value),
+                self.json_codec.dumps(value),
             ]
         elif op == "$gt":
             return "CAST(json_extract(value, concat('$.', %s)) AS CHAR) > %s", [
@@ -273,7 +289,7 @@ class BaseMySQLStore(Generic[C]):
         elif op == "$ne":
             return "json_extract(value, concat('$.', %s)) != CAST(%s AS JSON)", [
                 key,
-                json.dumps(value),
+                self.json_codec.dumps(value),
             ]
         else:
             raise ValueError(f"Unsupported operator: {op}")
@@ -284,16 +300,20 @@ class BaseSyncMySQLStore(
     BaseMySQLStore[_internal.Conn[_internal.C]],
     Generic[_internal.C, _internal.R],
 ):
-    __slots__ = ("_deserializer", "lock")
+    __slots__ = ("_deserializer", "instrument", "json_codec", "lock")
 
     def __init__(
         self,
         conn: _internal.Conn[_internal.C],
         *,
         deserializer: Callable[[bytes | orjson.Fragment], dict[str, Any]] | None = None,
+        instrument: SpanCallback | None = None,
+        json_codec: JsonCodec | None = None,
     ) -> None:
         super().__init__()
         self._deserializer = deserializer
+        self.instrument = instrument
+        self.json_codec = json_codec or DEFAULT_JSON_CODEC
         self.conn = conn
         self.lock = threading.Lock()
 
@@ -308,23 +328,30 @@ class BaseSyncMySQLStore(
         Args:
             pipeline: whether to use transaction context manager and handle concurrency
         """
+        span = current_span() if self.instrument is not None else None
+        started = time.perf_counter()
         with _internal.get_connection(self.conn) as conn:
             if pipeline:
                 # a connection can only be used by one
                 # thread/coroutine at a time, so we acquire a lock
                 with self.lock:
+                    if span is not None:
+                        span.lock_wait += time.perf_counter() - started
                     conn.begin()
                     try:
                         with self._get_cursor_from_connection(conn) as cur:
-                            yield cur
+                            yield instrument_cursor(cur, span)
                         conn.commit()
                     except:
                         conn.rollback()
                         raise
             else:
                 with self.lock, self._get_cursor_from_connection(conn) as cur:
-                    yield cur
+                    if span is not None:
+                        span.lock_wait += time.perf_counter() - started
+                    yield instrument_cursor(cur, span)
 
+    @instrumented
     def batch(self, ops: Iterable[Op]) -> list[Result]:
         grouped_ops, num_ops = _group_ops(ops)
         results: list[Result] = [None] * num_ops
@@ -368,21 +395,23 @@ class BaseSyncMySQLStore(
             cur.execute(query, params)
             rows = cast(list[Row], cur.fetchall())
             key_to_row = {row["key"]: row for row in rows}
-            for idx, key in items:
-                row = key_to_row.get(key)
-                if row:
-                    results[idx] = _row_to_item(
-                        namespace, row, loader=self._deserializer
-                    )
-                else:
-                    results[idx] = None
+            with timed_serde():
+                for idx, key in items:
+                    row = key_to_row.get(key)
+                    if row:
+                        results[idx] = _row_to_item(
+                            namespace, row, loader=self._load_value
+                        )
+                    else:
+                        results[idx] = None
 
     def _batch_put_ops(
         self,
         put_ops: Sequence[tuple[int, PutOp]],
         cur: _internal.R,
     ) -> None:
-        queries = self._prepare_batch_PUT_queries(put_ops)
+        with timed_serde():
+            queries = self._prepare_batch_PUT_queries(put_ops)
         for query, params in queries:
             cur.execute(query, params)
 
@@ -397,12 +426,13 @@ class BaseSyncMySQLStore(
         ):
             cur.execute(query, params)
             rows = cast(list[Row], cur.fetchall())
-            results[idx] = [
-                _row_to_search_item(
-                    _decode_ns_bytes(row["prefix"]), row, loader=self._deserializer
-                )
-                for row in rows
-            ]
+            with timed_serde():
+                results[idx] = [
+                    _row_to_search_item(
+                        _decode_ns_bytes(row["prefix"]), row, loader=self._load_value
+                    )
+                    for row in rows
+                ]
 
     def _batch_list_namespaces_ops(
         self,
@@ -521,7 +551,10 @@ def _group_ops(ops: Iterable[Op]) -> tuple[dict[type, list[tuple[int, Op]]], int
     return grouped_ops, tot
 
 
-def _json_loads(content: bytes | orjson.Fragment) -> Any:
+def _json_loads(
+    content: bytes | orjson.Fragment,
+    loads: Callable[[bytes], Any] = DEFAULT_JSON_CODEC.loads,
+) -> Any:
     if isinstance(content, orjson.Fragment):
         if hasattr(content, "buf"):
             content = content.buf
@@ -530,7 +563,7 @@ def _json_loads(content: bytes | orjson.Fragment) -> Any:
                 content = content.contents
             else:
                 content = content.contents.encode()
-    return orjson.loads(cast(bytes, content))
+    return loads(cast(bytes, content))
 
 
 def _decode_ns_bytes(namespace: str | bytes | list) -> tuple[str, ...]:
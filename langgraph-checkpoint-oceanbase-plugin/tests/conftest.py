@@ -32,21 +32,22 @@ async def conn(anyio_backend: str) -> AsyncIterator[aiomysql.Connection]:
 @pytest.fixture(scope="function", autouse=True)
 async def clear_test_db(conn: aiomysql.Connection) -> None:
     """Delete all tables before each test."""
-    try:
-        async with conn.cursor() as cursor:
-            await cursor.execute("DELETE FROM checkpoints")
-            await cursor.execute("DELETE FROM checkpoint_blobs")
-            await cursor.execute("DELETE FROM checkpoint_writes")
-    except pymysql.ProgrammingError as e:
-        if e.args[0] != pymysql.constants.ER.NO_SUCH_TABLE:
-            raise
-
-    try:
-        async with conn.cursor() as cursor:
-            await cursor.execute("DELETE FROM store")
-    except pymysql.ProgrammingError as e:
-        if e.args[0] != pymysql.constants.ER.NO_SUCH_TABLE:
-            raise
+    for table in (
+        "checkpoints",
+        "checkpoint_blobs",
+        "checkpoint_writes",
+        "checkpoint_channel_versions",
+        "checkpoint_heads",
+        "checkpoint_blob_contents",
+        "checkpoint_blob_chunks",
+        "store",
+    ):
+        try:
+            async with conn.cursor() as cursor:
+                await cursor.execute(f"DELETE FROM {table}")
+        except pymysql.ProgrammingError as e:
+            if e.args[0] != pymysql.constants.ER.NO_SUCH_TABLE:
+                raise
 
 
 def get_pymysql_sqlalchemy_engine(uri: str) -> Engine:
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from copy import deepcopy
 from typing import Any
@@ -23,6 +24,9 @@ from langgraph.checkpoint.base import (
 from langgraph.checkpoint.oceanbase.aio import AIOMySQLSaver, ShallowAIOMySQLSaver
 from langgraph.checkpoint.oceanbase.aio_base import BaseAsyncMySQLSaver
 from langgraph.checkpoint.oceanbase.asyncmy import AsyncMySaver, ShallowAsyncMySaver
+from langgraph.checkpoint.oceanbase.base import CopyResult
+from langgraph.checkpoint.oceanbase.cache import CheckpointCache
+from langgraph.checkpoint.oceanbase.retention import PruneResult, RetentionPolicy
 from langgraph.checkpoint.oceanbase.shallow import BaseShallowAsyncMySQLSaver
 from langgraph.checkpoint.serde.types import TASKS
 from langgraph.graph import END, START, MessagesState, StateGraph
@@ -210,6 +214,37 @@ async def _asyncmy_shallow_saver() -> AsyncIterator[ShallowAsyncMySaver]:
                 await cursor.execute(f"DROP DATABASE {database}")
 
 
+@asynccontextmanager
+async def _saver_with_options(
+    driver: str, **kwargs: Any
+) -> AsyncIterator[BaseAsyncMySQLSaver]:
+    """Fixture for testing a non-shallow saver constructed with extra options."""
+    saver_cls: type[BaseAsyncMySQLSaver] = (
+        AIOMySQLSaver if driver == "aiomysql" else AsyncMySaver
+    )
+    database = f"test_{uuid4().hex[:16]}"
+    # create unique db
+    async with await aiomysql.connect(
+        **AIOMySQLSaver.parse_conn_string(DEFAULT_BASE_URI),
+        autocommit=True,
+    ) as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute(f"CREATE DATABASE {database}")
+    try:
+        async with saver_cls.from_conn_string(  # type: ignore[attr-defined]
+            DEFAULT_BASE_URI + database, **kwargs
+        ) as checkpointer:
+            await checkpointer.setup()
+            yield checkpointer
+    finally:
+        # drop unique db
+        async with await aiomysql.connect(
+            **AIOMySQLSaver.parse_conn_string(DEFAULT_BASE_URI), autocommit=True
+        ) as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(f"DROP DATABASE {database}")
+
+
 @asynccontextmanager
 async def _saver(
     name: str,
@@ -592,3 +627,473 @@ async def test_pending_sends_migration(saver_name: str) -> None:
             TASKS: ["send-1", "send-2", "send-3"]
         }
         assert TASKS in search_results[0].checkpoint["channel_versions"]
+
+
+@pytest.mark.parametrize("driver", ["aiomysql", "asyncmy"])
+async def test_binary_read_engine(driver: str) -> None:
+    async with _saver_with_options(driver, read_engine="binary") as saver:
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {"messages": ["a", "b"], "count": 1}
+        checkpoint["channel_versions"] = {"messages": 1, "count": 1}
+        config = await saver.aput(config, checkpoint, {"step": 0}, {"messages": 1})
+        await saver.aput_writes(config, [("w1", "v1"), ("w2", b"\x00")], "task")
+
+        saved = await saver.aget_tuple(config)
+        assert saved
+        assert saved.checkpoint["channel_values"] == {
+            "messages": ["a", "b"],
+            "count": 1,
+        }
+        assert saved.pending_writes == [("task", "w1", "v1"), ("task", "w2", b"\x00")]
+
+        latest = await saver.aget_tuple(
+            {"configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}}
+        )
+        assert latest == saved
+        assert [c async for c in saver.alist(None)] == [saved]
+
+
+@pytest.mark.parametrize("driver", ["aiomysql", "asyncmy"])
+async def test_channel_version_index(driver: str) -> None:
+    async with _saver_with_options(driver, channel_version_index="read") as saver:
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {"messages": ["a"], "count": 1}
+        checkpoint["channel_versions"] = {"messages": 1, "count": 1}
+        first = await saver.aput(config, checkpoint, {"step": 0}, {"messages": 1})
+
+        child = create_checkpoint(checkpoint, {}, 1)
+        child["channel_values"] = {"messages": ["a", "b"], "count": 1}
+        child["channel_versions"] = {"messages": 2, "count": 1}
+        second = await saver.aput(first, child, {"step": 1}, {"messages": 2})
+
+        saved_first = await saver.aget_tuple(first)
+        saved_second = await saver.aget_tuple(second)
+        assert saved_first and saved_second
+        assert saved_first.checkpoint["channel_values"] == {
+            "messages": ["a"],
+            "count": 1,
+        }
+        assert saved_second.checkpoint["channel_values"] == {
+            "messages": ["a", "b"],
+            "count": 1,
+        }
+        assert [c async for c in saver.alist(None)] == [saved_second, saved_first]
+
+        # everything is already indexed
+        assert await saver.abackfill_channel_versions(batch_size=1) == 2
+
+        await saver.adelete_thread("thread-1")
+        assert await saver.aget_tuple(first) is None
+
+
+@pytest.mark.parametrize("driver", ["aiomysql", "asyncmy"])
+async def test_checkpoint_heads(driver: str) -> None:
+    async with _saver_with_options(driver, checkpoint_heads=True) as saver:
+        latest: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+        assert await saver.aget_tuple(latest) is None
+
+        first = empty_checkpoint()
+        config = await saver.aput(latest, first, {"step": 0}, {})
+        second = create_checkpoint(first, {}, 1)
+        config = await saver.aput(config, second, {"step": 1}, {})
+        # re-saving an older checkpoint does not move the head backwards
+        await saver.aput(latest, first, {"step": 0}, {})
+
+        saved = await saver.aget_tuple(latest)
+        assert saved
+        assert saved.config == config
+
+        await saver.arebuild_checkpoint_heads()
+        assert await saver.aget_tuple(latest) == saved
+
+
+@pytest.mark.parametrize("driver", ["aiomysql", "asyncmy"])
+async def test_write_batching(driver: str) -> None:
+    async with _saver_with_options(driver, write_batch_window=0.05) as saver:
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+        config = await saver.aput(config, empty_checkpoint(), {}, {})
+
+        flushes: list[int] = []
+        flush = saver._flush_writes
+
+        async def counting_flush(batches: Any) -> None:
+            flushes.append(len(batches))
+            await flush(batches)
+
+        saver.write_coalescer.flush = counting_flush  # type: ignore[union-attr]
+
+        await asyncio.gather(
+            *(saver.aput_writes(config, [("value", n)], f"task-{n}") for n in range(20))
+        )
+        assert sum(flushes) == 20
+        assert len(flushes) < 20
+
+        saved = await saver.aget_tuple(config)
+        assert saved
+        assert sorted(saved.pending_writes) == sorted(
+            (f"task-{n}", "value", n) for n in range(20)
+        )
+
+
+@pytest.mark.parametrize("driver", ["aiomysql", "asyncmy"])
+async def test_content_addressed_blobs(driver: str) -> None:
+    async with _saver_with_options(driver, content_addressed_blobs=True) as saver:
+        document = ["lorem ipsum"] * 100
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+        checkpoint = empty_checkpoint()
+        for step in range(3):
+            checkpoint = create_checkpoint(checkpoint, {}, step)
+            checkpoint["channel_values"] = {"document": document}
+            checkpoint["channel_versions"] = {"document": step + 1}
+            config = await saver.aput(
+                config, checkpoint, {"step": step}, {"document": step + 1}
+            )
+            saved = await saver.aget_tuple(config)
+            assert saved
+            assert saved.checkpoint["channel_values"] == {"document": document}
+
+        async with saver._cursor() as cur:
+            await cur.execute("SELECT count(*) AS n FROM checkpoint_blob_contents")
+            assert (await cur.fetchone())["n"] == 1
+
+
+@pytest.mark.parametrize("driver", ["aiomysql", "asyncmy"])
+async def test_stream_list(driver: str) -> None:
+    async with _saver_with_options(driver, stream_list=True) as saver:
+        saver.STREAM_FETCH_SIZE = 2
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+        checkpoint = empty_checkpoint()
+        configs = []
+        for step in range(5):
+            checkpoint = create_checkpoint(checkpoint, {}, step)
+            checkpoint["channel_values"] = {"messages": ["m"] * step}
+            checkpoint["channel_versions"] = {"messages": step + 1}
+            config = await saver.aput(
+                config, checkpoint, {"step": step}, {"messages": step + 1}
+            )
+            configs.append(config)
+
+        streamed = [c async for c in saver.alist(None)]
+        assert [c.config for c in streamed] == configs[::-1]
+        for saved in streamed:
+            assert saved == await saver.aget_tuple(saved.config)
+
+        stream = saver.alist(None, limit=3)
+        assert (await stream.__anext__()).config == configs[-1]
+        await stream.aclose()
+        assert len([c async for c in saver.alist(None, limit=3)]) == 3
+
+
+@pytest.mark.parametrize("driver", ["aiomysql", "asyncmy"])
+async def test_lazy_load(driver: str) -> None:
+    async with _saver_with_options(driver, lazy_load=True) as saver:
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {"messages": ["m"], "context": {"a": 1}}
+        checkpoint["channel_versions"] = {"messages": 1, "context": 1}
+        config = await saver.aput(
+            config, checkpoint, {"step": 0}, {"messages": 1, "context": 1}
+        )
+        await saver.aput_writes(config, [("messages", ["w"])], "task")
+
+        saved = await saver.aget_tuple(config)
+        assert saved
+        assert saved.checkpoint["channel_values"] == {
+            "messages": ["m"],
+            "context": {"a": 1},
+        }
+        assert saved.pending_writes == [("task", "messages", ["w"])]
+        assert [c async for c in saver.alist(None)] == [saved]
+
+
+@pytest.mark.parametrize("driver", ["aiomysql", "asyncmy"])
+async def test_prune(driver: str) -> None:
+    async with _saver_with_options(driver) as saver:
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+        checkpoint = empty_checkpoint()
+        for step in range(4):
+            checkpoint = create_checkpoint(checkpoint, {}, step)
+            checkpoint["channel_values"] = {"messages": ["m"] * (step + 1)}
+            checkpoint["channel_versions"] = {"messages": step + 1}
+            config = await saver.aput(
+                config, checkpoint, {"step": step}, {"messages": step + 1}
+            )
+            await saver.aput_writes(config, [("messages", ["w"])], "task")
+
+        result = await saver.aprune(RetentionPolicy(keep_last=1), batch_size=2)
+        assert result == PruneResult(checkpoints=3, writes=3, blobs=3)
+
+        remaining = [c async for c in saver.alist(None)]
+        assert len(remaining) == 1
+        assert remaining[0].config == config
+        assert remaining[0].checkpoint["channel_values"] == {"messages": ["m"] * 4}
+        assert await saver.aprune(RetentionPolicy(keep_last=1)) == PruneResult()
+
+
+@pytest.mark.parametrize("driver", ["aiomysql", "asyncmy"])
+async def test_delete_threads_in_chunks(driver: str) -> None:
+    async with _saver_with_options(driver, delete_batch_size=2) as saver:
+        for thread_id in ("thread-1", "thread-2"):
+            config: RunnableConfig = {
+                "configurable": {"thread_id": thread_id, "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            for step in range(5):
+                checkpoint = create_checkpoint(checkpoint, {}, step)
+                checkpoint["channel_values"] = {"messages": ["m"] * step}
+                checkpoint["channel_versions"] = {"messages": step + 1}
+                config = await saver.aput(
+                    config, checkpoint, {"step": step}, {"messages": step + 1}
+                )
+
+        await saver.adelete_threads(["thread-1"])
+        remaining = [c async for c in saver.alist(None)]
+        assert len(remaining) == 5
+        assert all(
+            c.config["configurable"]["thread_id"] == "thread-2" for c in remaining
+        )
+
+        await saver.adelete_thread("thread-2")
+        assert [c async for c in saver.alist(None)] == []
+
+
+@pytest.mark.parametrize("driver", ["aiomysql", "asyncmy"])
+async def test_checkpoint_cache(driver: str) -> None:
+    cache = CheckpointCache()
+    async with _saver_with_options(driver, cache=cache) as saver:
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {"messages": ["m"]}
+        checkpoint["channel_versions"] = {"messages": 1}
+        config = await saver.aput(config, checkpoint, {"step": 0}, {"messages": 1})
+        await saver.aput_writes(config, [("messages", ["w"])], "task")
+
+        cached = await saver.aget_tuple(config)
+        assert cache.stats().hits == 1
+        assert cached
+        assert cached.checkpoint["channel_values"] == {"messages": ["m"]}
+        assert cached.pending_writes == [("task", "messages", ["w"])]
+
+        cache.clear()
+        assert await saver.aget_tuple(config) == cached
+        assert cache.stats().misses == 1
+
+        await saver.adelete_thread("thread-1")
+        assert await saver.aget_tuple(config) is None
+
+
+@pytest.mark.parametrize("driver", ["aiomysql", "asyncmy"])
+async def test_decode_executor(driver: str) -> None:
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        async with _saver_with_options(driver, decode_executor=executor) as saver:
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            for step in range(6):
+                checkpoint = create_checkpoint(checkpoint, {}, step)
+                checkpoint["channel_values"] = {"messages": ["m"] * step}
+                checkpoint["channel_versions"] = {"messages": step + 1}
+                config = await saver.aput(
+                    config, checkpoint, {"step": step}, {"messages": step + 1}
+                )
+                await saver.aput_writes(config, [("messages", [step])], "task")
+
+            listed = [c async for c in saver.alist(None)]
+            assert [c.metadata["step"] for c in listed] == [5, 4, 3, 2, 1, 0]
+            for c in listed:
+                step = c.metadata["step"]
+                assert c.checkpoint["channel_values"] == {"messages": ["m"] * step}
+                assert c.pending_writes == [("task", "messages", [step])]
+            assert await saver.aget_tuple(config) == listed[0]
+
+
+@pytest.mark.parametrize("driver", ["aiomysql", "asyncmy"])
+async def test_copy_thread(driver: str) -> None:
+    async with _saver_with_options(driver, checkpoint_heads=True) as saver:
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "source", "checkpoint_ns": ""}
+        }
+        checkpoint = empty_checkpoint()
+        for step in range(4):
+            checkpoint = create_checkpoint(checkpoint, {}, step)
+            checkpoint["channel_values"] = {"messages": ["m"] * (step + 1)}
+            checkpoint["channel_versions"] = {"messages": step + 1}
+            config = await saver.aput(
+                config, checkpoint, {"step": step}, {"messages": step + 1}
+            )
+            await saver.aput_writes(config, [("messages", [step])], "task")
+
+        result = await saver.acopy_thread("source", "copy", batch_size=3)
+        assert result == CopyResult(checkpoints=4, writes=4, blobs=4)
+        source = await saver.aget_tuple(config)
+        copied = await saver.aget_tuple(
+            {"configurable": {"thread_id": "copy", "checkpoint_ns": ""}}
+        )
+        assert source and copied
+        assert copied.checkpoint == source.checkpoint
+        assert copied.metadata == source.metadata
+        assert copied.pending_writes == [("task", "messages", [3])]
+
+
+@pytest.mark.parametrize("driver", ["aiomysql", "asyncmy"])
+async def test_get_tuples(driver: str) -> None:
+    async with _saver_with_options(driver) as saver:
+        saver.GET_TUPLES_WINDOW = 2
+        configs: list[RunnableConfig] = []
+        for thread_id in ("thread-1", "thread-2", "thread-3"):
+            config: RunnableConfig = {
+                "configurable": {"thread_id": thread_id, "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            for step in range(2):
+                checkpoint = create_checkpoint(checkpoint, {}, step)
+                checkpoint["channel_values"] = {"messages": [thread_id] * step}
+                checkpoint["channel_versions"] = {"messages": step + 1}
+                config = await saver.aput(
+                    config, checkpoint, {"step": step}, {"messages": step + 1}
+                )
+                await saver.aput_writes(config, [("messages", [step])], "task")
+                configs.append(config)
+
+        requested: list[RunnableConfig] = [
+            {"configurable": {"thread_id": "thread-3", "checkpoint_ns": ""}},
+            configs[0],
+            {"configurable": {"thread_id": "missing", "checkpoint_ns": ""}},
+            {"configurable": {"thread_id": "thread-2", "checkpoint_ns": ""}},
+        ]
+        expected = [await saver.aget_tuple(config) for config in requested]
+        assert expected[2] is None
+        assert await saver.aget_tuples(requested) == expected
+
+
+@pytest.mark.parametrize("driver", ["aiomysql", "asyncmy"])
+async def test_blob_chunks(driver: str) -> None:
+    async with _saver_with_options(driver, blob_chunk_size=64) as saver:
+        document = ["lorem ipsum"] * 100
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+        checkpoint = empty_checkpoint()
+        for step in range(3):
+            checkpoint = create_checkpoint(checkpoint, {}, step)
+            checkpoint["channel_values"] = {
+                "document": document + [str(step)],
+                "messages": ["hi"] * (step + 1),
+            }
+            checkpoint["channel_versions"] = {"document": step + 1, "messages": 1}
+            config = await saver.aput(
+                config, checkpoint, {"step": step}, checkpoint["channel_versions"]
+            )
+
+        latest = await saver.aget_tuple(config)
+        assert latest
+        assert latest.checkpoint["channel_values"] == {
+            "document": document + ["2"],
+            "messages": ["hi"],
+        }
+        thread: RunnableConfig = {"configurable": {"thread_id": "thread-1"}}
+        listed = [c async for c in saver.alist(thread)]
+        assert [c.checkpoint["channel_values"]["document"][-1] for c in listed] == [
+            "2",
+            "1",
+            "0",
+        ]
+
+        saver.stream_list = True
+        assert [c async for c in saver.alist(thread)] == listed
+        result = await saver.aprune(RetentionPolicy(keep_last=1))
+        assert result.blob_chunks > 0
+        assert await saver.aget_tuple(config) == latest
+
+
+@pytest.mark.parametrize("driver", ["aiomysql", "asyncmy"])
+async def test_list_page(driver: str) -> None:
+    async with _saver_with_options(driver) as saver:
+        for thread_id in ("thread-1", "thread-2"):
+            config: RunnableConfig = {
+                "configurable": {"thread_id": thread_id, "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            for step in range(3):
+                checkpoint = create_checkpoint(checkpoint, {}, step)
+                checkpoint["channel_values"] = {"messages": ["m"] * step}
+                checkpoint["channel_versions"] = {"messages": step + 1}
+                config = await saver.aput(
+                    config, checkpoint, {"step": step}, {"messages": step + 1}
+                )
+
+        listed = []
+        cursor = None
+        while True:
+            page = await saver.alist_page(None, limit=2, cursor=cursor)
+            listed.extend(page.checkpoints)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+        assert [
+            (c.config["configurable"]["thread_id"], c.metadata["step"]) for c in listed
+        ] == [(f"thread-{n}", step) for n in (2, 1) for step in (2, 1, 0)]
+        thread: RunnableConfig = {"configurable": {"thread_id": "thread-1"}}
+        assert [c async for c in saver.alist(thread)] == listed[3:]
+
+
+@pytest.mark.parametrize("driver", ["aiomysql", "asyncmy"])
+@pytest.mark.parametrize("offload_threshold", [0, 1024])
+async def test_offload_threshold(driver: str, offload_threshold: int) -> None:
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        async with _saver_with_options(
+            driver,
+            encode_executor=executor,
+            decode_executor=executor,
+            offload_threshold=offload_threshold,
+        ) as saver:
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            # values from a few bytes to above the threshold
+            for step in range(6):
+                checkpoint = create_checkpoint(checkpoint, {}, step)
+                checkpoint["channel_values"] = {"messages": ["m" * 256] * step}
+                checkpoint["channel_versions"] = {"messages": step + 1}
+                config = await saver.aput(
+                    config, checkpoint, {"step": step}, {"messages": step + 1}
+                )
+                await saver.aput_writes(
+                    config, [("messages", ["w" * 256] * step)], "task"
+                )
+
+            listed = [c async for c in saver.alist(None)]
+            assert [c.metadata["step"] for c in listed] == [5, 4, 3, 2, 1, 0]
+            for c in listed:
+                step = c.metadata["step"]
+                assert c.checkpoint["channel_values"] == {
+                    "messages": ["m" * 256] * step
+                }
+                assert c.pending_writes == [("task", "messages", ["w" * 256] * step)]
+            assert await saver.aget_tuple(config) == listed[0]
+
+    with pytest.raises(ValueError):
+        async with _saver_with_options(driver, offload_threshold=-1):
+            pass
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import json
+import math
 import re
+import threading
+import time
+import warnings
 from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import contextmanager
 from copy import deepcopy
+from datetime import timedelta
+from enum import Enum
 from typing import Any
 from uuid import uuid4
 
@@ -19,8 +27,21 @@ from langgraph.checkpoint.base import (
     create_checkpoint,
     empty_checkpoint,
 )
+from langgraph.checkpoint.oceanbase.base import (
+    CheckpointPage,
+    CopyResult,
+    UpgradeResult,
+    forget_schema_state,
+)
+from langgraph.checkpoint.oceanbase.cache import CheckpointCache
+from langgraph.checkpoint.oceanbase.instrumentation import Span, SpanAggregator
+from langgraph.checkpoint.oceanbase.jsoncodec import orjson_codec, stdlib_codec
 from langgraph.checkpoint.oceanbase.pyoceanbase import PyOceanBaseSaver, ShallowPyMySQLSaver
-from langgraph.checkpoint.serde.types import TASKS
+from langgraph.checkpoint.oceanbase.retention import PruneResult, RetentionPolicy
+from langgraph.checkpoint.oceanbase.serde import CompressedSerializer
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.serde.types import ERROR, TASKS
+from langgraph.store.oceanbase import PyOceanBaseStore
 from tests.conftest import (
     DEFAULT_BASE_URI,
     get_pymysql_sqlalchemy_engine,
@@ -462,3 +483,1204 @@ def test_pending_sends_migration(saver_name: str) -> None:
             TASKS: ["send-1", "send-2", "send-3"]
         }
         assert TASKS in search_results[0].checkpoint["channel_versions"]
+
+
+def test_pool_concurrency_runs_in_parallel() -> None:
+    with _database() as database:
+        pool = get_pymysql_sqlalchemy_pool(DEFAULT_BASE_URI + database)
+        try:
+            saver = PyOceanBaseSaver(pool.connect, concurrency="pool", max_inflight=4)
+            saver.setup()
+
+            # record the peak number of queries running at the same time,
+            # holding each cursor long enough for the others to overlap it
+            cursor = saver._cursor
+            counter = threading.Lock()
+            inflight = peak = 0
+
+            @contextmanager
+            def counting_cursor(**kwargs: Any) -> Iterator[Any]:
+                nonlocal inflight, peak
+                with cursor(**kwargs) as cur:
+                    with counter:
+                        inflight += 1
+                        peak = max(peak, inflight)
+                    try:
+                        time.sleep(0.05)
+                        yield cur
+                    finally:
+                        with counter:
+                            inflight -= 1
+
+            saver._cursor = counting_cursor  # type: ignore[method-assign]
+
+            def work(n: int) -> None:
+                config: RunnableConfig = {
+                    "configurable": {"thread_id": f"thread-{n}", "checkpoint_ns": ""}
+                }
+                checkpoint = create_checkpoint(empty_checkpoint(), {}, 1)
+                config = saver.put(config, checkpoint, {"n": n}, {})
+                saved = saver.get_tuple(config)
+                assert saved
+                assert saved.metadata["n"] == n
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(work, range(16)))
+
+            # queries overlap, up to max_inflight of them
+            assert 1 < peak <= 4
+            # the shared lock is never taken for pooled connections
+            assert not saver.lock.locked()
+            assert len(list(saver.list(None))) == 16
+        finally:
+            pool.dispose()
+
+
+def test_pool_concurrency_keeps_lock_for_shared_connection() -> None:
+    with _database() as database:
+        with PyOceanBaseSaver.from_conn_string(DEFAULT_BASE_URI + database) as saver:
+            saver.concurrency = "pool"
+            assert saver._guard() is saver.lock
+
+
+def test_binary_read_engine_matches_json() -> None:
+    with _database() as database:
+        with (
+            PyOceanBaseSaver.from_conn_string(DEFAULT_BASE_URI + database) as saver,
+            PyOceanBaseSaver.from_conn_string(
+                DEFAULT_BASE_URI + database, read_engine="binary"
+            ) as binary_saver,
+        ):
+            saver.setup()
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            checkpoint["channel_values"] = {"messages": ["a", "b"], "count": 1}
+            checkpoint["channel_versions"] = {"messages": 1, "count": 1}
+            config = saver.put(config, checkpoint, {"step": 0}, {"messages": 1})
+            saver.put_writes(config, [("messages", ["c"]), ("other", b"\x00")], "t1")
+            saver.put_writes(config, [(TASKS, "send")], "t0")
+
+            child = create_checkpoint(checkpoint, {}, 1)
+            child["channel_values"] = {"messages": ["a", "b", "c"]}
+            child["channel_versions"] = {"messages": 2, "count": 1}
+            child_config = saver.put(config, child, {"step": 1}, {"messages": 2})
+
+            for target in (config, child_config):
+                expected = saver.get_tuple(target)
+                actual = binary_saver.get_tuple(target)
+                assert expected and actual
+                assert actual.checkpoint == expected.checkpoint
+                assert actual.pending_writes == expected.pending_writes
+            assert binary_saver.get_tuple(
+                {"configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}}
+            ) == saver.get_tuple(child_config)
+            assert list(binary_saver.list(None)) == list(saver.list(None))
+            assert list(binary_saver.list(None, limit=1)) == list(
+                saver.list(None, limit=1)
+            )
+
+
+def test_channel_version_index_backfill() -> None:
+    with _database() as database:
+        uri = DEFAULT_BASE_URI + database
+        with (
+            PyOceanBaseSaver.from_conn_string(uri) as saver,
+            PyOceanBaseSaver.from_conn_string(
+                uri, channel_version_index="read"
+            ) as indexed_saver,
+        ):
+            saver.setup()
+            # checkpoints saved before the index was enabled
+            configs = []
+            checkpoint = empty_checkpoint()
+            for step in range(5):
+                checkpoint = create_checkpoint(checkpoint, {}, step)
+                checkpoint["channel_values"] = {"messages": ["m"] * step}
+                checkpoint["channel_versions"] = {"messages": step + 1}
+                config: RunnableConfig = {
+                    "configurable": {
+                        "thread_id": f"thread-{step % 2}",
+                        "checkpoint_ns": "",
+                    }
+                }
+                configs.append(
+                    saver.put(
+                        config, checkpoint, {"step": step}, {"messages": step + 1}
+                    )
+                )
+            assert saver.backfill_channel_versions(batch_size=2) == 5
+            # re-running the backfill is a no-op
+            assert saver.backfill_channel_versions(batch_size=2) == 5
+
+            for config in configs:
+                expected = saver.get_tuple(config)
+                actual = indexed_saver.get_tuple(config)
+                assert expected and actual
+                assert actual.checkpoint == expected.checkpoint
+
+            # new checkpoints are indexed on write
+            child = create_checkpoint(checkpoint, {}, 5)
+            child["channel_values"] = {"messages": ["m"] * 5}
+            child["channel_versions"] = {"messages": 6}
+            child_config = indexed_saver.put(
+                configs[-1], child, {"step": 5}, {"messages": 6}
+            )
+            child_tuple = indexed_saver.get_tuple(child_config)
+            assert child_tuple
+            assert child_tuple.checkpoint["channel_values"] == {"messages": ["m"] * 5}
+            assert list(indexed_saver.list(None)) == list(saver.list(None))
+
+            indexed_saver.delete_thread("thread-0")
+            with indexed_saver._cursor() as cur:
+                cur.execute(
+                    "SELECT count(*) AS n FROM checkpoint_channel_versions "
+                    "WHERE thread_id = %s",
+                    ("thread-0",),
+                )
+                assert cur.fetchone()["n"] == 0
+
+
+def test_checkpoint_heads() -> None:
+    with _database() as database:
+        uri = DEFAULT_BASE_URI + database
+        with (
+            PyOceanBaseSaver.from_conn_string(uri) as saver,
+            PyOceanBaseSaver.from_conn_string(
+                uri, checkpoint_heads=True
+            ) as heads_saver,
+        ):
+            saver.setup()
+            latest: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+            # a thread written without heads falls back to the newest checkpoint
+            first = empty_checkpoint()
+            config = saver.put(latest, first, {"step": 0}, {})
+            assert heads_saver.get_tuple(latest) == saver.get_tuple(config)
+
+            checkpoint = first
+
+            for step in range(1, 4):
+                checkpoint = create_checkpoint(checkpoint, {}, step)
+                config = heads_saver.put(config, checkpoint, {"step": step}, {})
+                assert heads_saver.get_tuple(latest) == saver.get_tuple(config)
+
+            # re-saving an older checkpoint does not move the head backwards
+            heads_saver.put(latest, first, {"step": 0}, {})
+            assert heads_saver.get_tuple(latest) == saver.get_tuple(config)
+
+            # writes that bypass the heads are picked up by a rebuild
+            checkpoint = create_checkpoint(checkpoint, {}, 4)
+            config = saver.put(config, checkpoint, {"step": 4}, {})
+            heads_saver.rebuild_checkpoint_heads()
+            assert heads_saver.get_tuple(latest) == saver.get_tuple(config)
+
+            heads_saver.delete_thread("thread-1")
+            assert heads_saver.get_tuple(latest) is None
+
+
+def test_write_batching() -> None:
+    with _database() as database:
+        pool = get_pymysql_sqlalchemy_pool(DEFAULT_BASE_URI + database)
+        try:
+            saver = PyOceanBaseSaver(
+                pool.connect,
+                concurrency="pool",
+                write_batch_window=0.05,
+                write_batch_max_rows=8,
+            )
+            saver.setup()
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+            config = saver.put(config, empty_checkpoint(), {}, {})
+
+            flushes: list[int] = []
+            flush = saver._flush_writes
+
+            def counting_flush(batches: Any) -> None:
+                flushes.append(len(batches))
+                flush(batches)
+
+            saver.write_coalescer.flush = counting_flush  # type: ignore[union-attr]
+
+            def task(n: int) -> None:
+                saver.put_writes(config, [("value", n), ("other", -n)], f"task-{n}")
+                # durable once put_writes returns
+                saved = saver.get_tuple(config)
+                assert saved
+                assert (f"task-{n}", "value", n) in saved.pending_writes
+
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                list(executor.map(task, range(16)))
+            # special channels keep their upsert semantics
+            saver.put_writes(config, [(ERROR, "first")], "task-0")
+            saver.put_writes(config, [(ERROR, "second")], "task-0")
+
+            assert len(flushes) < 18
+            saved = saver.get_tuple(config)
+            assert saved
+            assert len(saved.pending_writes) == 33
+            assert ("task-0", ERROR, "second") in saved.pending_writes
+        finally:
+            pool.dispose()
+
+
+def test_content_addressed_blobs() -> None:
+    with _database() as database:
+        uri = DEFAULT_BASE_URI + database
+        with (
+            PyOceanBaseSaver.from_conn_string(uri) as saver,
+            PyOceanBaseSaver.from_conn_string(
+                uri, content_addressed_blobs=True
+            ) as dedup_saver,
+        ):
+            saver.setup()
+            document = ["lorem ipsum"] * 100
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            configs = []
+            for step in range(3):
+                checkpoint = create_checkpoint(checkpoint, {}, step)
+                checkpoint["channel_values"] = {
+                    "document": document,
+                    "messages": ["hi"] * (step + 1),
+                }
+                checkpoint["channel_versions"] = {
+                    "document": step + 1,
+                    "messages": step + 1,
+                }
+                config = dedup_saver.put(
+                    config,
+                    checkpoint,
+                    {"step": step},
+                    {"document": step + 1, "messages": step + 1},
+                )
+                configs.append(config)
+
+            with dedup_saver._cursor() as cur:
+                cur.execute("SELECT count(*) AS n FROM checkpoint_blob_contents")
+                # one document plus three distinct message lists
+                assert cur.fetchone()["n"] == 4
+                cur.execute(
+                    "SELECT count(*) AS n FROM checkpoint_blobs WHERE `blob` IS NULL"
+                )
+                assert cur.fetchone()["n"] == 6
+
+            # both layouts are readable by any saver, whatever its options
+            child = create_checkpoint(checkpoint, {}, 3)
+            child["channel_values"] = {"document": document, "messages": ["bye"]}
+            child["channel_versions"] = {"document": 4, "messages": 4}
+            configs.append(
+                saver.put(config, child, {"step": 3}, {"document": 4, "messages": 4})
+            )
+            for config in configs:
+                expected = dedup_saver.get_tuple(config)
+                actual = saver.get_tuple(config)
+                assert expected and actual
+                assert actual.checkpoint == expected.checkpoint
+                assert actual.checkpoint["channel_values"]["document"] == document
+
+
+def test_compressed_serializer() -> None:
+    with _database() as database:
+        uri = DEFAULT_BASE_URI + database
+        with (
+            PyOceanBaseSaver.from_conn_string(uri) as saver,
+            PyOceanBaseSaver.from_conn_string(
+                uri, serde=CompressedSerializer("zlib", min_size=64)
+            ) as compressed_saver,
+        ):
+            saver.setup()
+            messages = ["a fairly repetitive message"] * 200
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            checkpoint["channel_values"] = {"messages": messages}
+            checkpoint["channel_versions"] = {"messages": 1}
+            config = saver.put(config, checkpoint, {}, {"messages": 1})
+            child = create_checkpoint(checkpoint, {}, 1)
+            child["channel_versions"] = {"messages": 2}
+            child_config = compressed_saver.put(config, child, {}, {"messages": 2})
+            compressed_saver.put_writes(
+                child_config, [("messages", messages), ("small", "x")], "task"
+            )
+
+            with saver._cursor() as cur:
+                cur.execute("SELECT version, type FROM checkpoint_blobs")
+                types = {row["version"]: row["type"] for row in cur.fetchall()}
+                assert types == {"1": "msgpack", "2": "msgpack+zlib"}
+                cur.execute("SELECT channel, type FROM checkpoint_writes")
+                types = {row["channel"]: row["type"] for row in cur.fetchall()}
+                assert types == {"messages": "msgpack+zlib", "small": "msgpack"}
+
+            # rows written without compression stay readable
+            saved = compressed_saver.get_tuple(config)
+            assert saved
+            assert saved.checkpoint["channel_values"] == {"messages": messages}
+            saved = compressed_saver.get_tuple(child_config)
+            assert saved
+            assert saved.checkpoint["channel_values"] == {"messages": messages}
+            assert saved.pending_writes == [
+                ("task", "messages", messages),
+                ("task", "small", "x"),
+            ]
+
+
+def test_stream_list() -> None:
+    with _database() as database:
+        uri = DEFAULT_BASE_URI + database
+        with (
+            PyOceanBaseSaver.from_conn_string(uri) as saver,
+            PyOceanBaseSaver.from_conn_string(uri, stream_list=True) as stream_saver,
+        ):
+            saver.setup()
+            stream_saver.STREAM_FETCH_SIZE = 2
+            stream_saver.PENDING_SENDS_WINDOW = 2
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            for step in range(7):
+                checkpoint = create_checkpoint(checkpoint, {}, step)
+                checkpoint["channel_values"] = {"messages": ["m"] * step}
+                checkpoint["channel_versions"] = {"messages": step + 1}
+                config = saver.put(
+                    config, checkpoint, {"step": step}, {"messages": step + 1}
+                )
+                # pending sends are migrated into the next legacy checkpoint
+                saver.put_writes(config, [(TASKS, f"send-{step}")], "task")
+
+            assert list(stream_saver.list(None)) == list(saver.list(None))
+            assert list(stream_saver.list(None, limit=3)) == list(
+                saver.list(None, limit=3)
+            )
+            assert list(stream_saver.list(None, filter={"step": 4})) == list(
+                saver.list(None, filter={"step": 4})
+            )
+
+            # closing a stream early releases the connection
+            stream = stream_saver.list(None)
+            assert next(stream).metadata["step"] == 6
+            stream.close()
+            assert stream_saver.get_tuple(config) == saver.get_tuple(config)
+
+
+class _CountingSerializer(JsonPlusSerializer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.decoded = 0
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        self.decoded += 1
+        return super().loads_typed(data)
+
+
+def test_lazy_load() -> None:
+    serde = _CountingSerializer()
+    with _database() as database:
+        uri = DEFAULT_BASE_URI + database
+        with (
+            PyOceanBaseSaver.from_conn_string(uri) as saver,
+            PyOceanBaseSaver.from_conn_string(
+                uri, serde=serde, lazy_load=True
+            ) as lazy_saver,
+        ):
+            saver.setup()
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            for step in range(3):
+                checkpoint = create_checkpoint(checkpoint, {}, step)
+                checkpoint["channel_values"] = {
+                    "messages": ["m"] * step,
+                    "context": {"step": step},
+                }
+                checkpoint["channel_versions"] = {"messages": step + 1, "context": 1}
+                config = saver.put(
+                    config,
+                    checkpoint,
+                    {"step": step},
+                    {"messages": step + 1, "context": 1},
+                )
+                saver.put_writes(config, [("messages", ["w"]), ("context", {})], "t")
+
+            listed = list(lazy_saver.list(None))
+            assert [c.metadata["step"] for c in listed] == [2, 1, 0]
+            assert serde.decoded == 0
+
+            latest = listed[0]
+            assert latest.checkpoint["channel_values"]["messages"] == ["m", "m"]
+            assert latest.pending_writes
+            assert latest.pending_writes[0] == ("t", "messages", ["w"])
+            assert serde.decoded == 2
+
+            assert listed == list(saver.list(None))
+            saved = saver.get_tuple(config)
+            assert saved
+            assert lazy_saver.get_tuple(config) == saved
+            assert deepcopy(latest.checkpoint) == saved.checkpoint
+
+
+def test_prune() -> None:
+    with _base_saver() as saver:
+        saver.setup()
+        for thread_id in ("thread-1", "thread-2"):
+            config: RunnableConfig = {
+                "configurable": {"thread_id": thread_id, "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            for step in range(5):
+                checkpoint = create_checkpoint(checkpoint, {}, step)
+                checkpoint["channel_values"] = {"messages": ["m"] * (step + 1)}
+                checkpoint["channel_versions"] = {"messages": step + 1}
+                source = "input" if step == 0 else "loop"
+                config = saver.put(
+                    config,
+                    checkpoint,
+                    {"step": step, "source": source},
+                    {"messages": step + 1},
+                )
+                saver.put_writes(config, [("messages", ["w"])], "task")
+
+        policy = RetentionPolicy(keep_last=2, keep_metadata={"source": "input"})
+        result = saver.prune(policy, batch_size=3)
+        assert result == PruneResult(checkpoints=4, writes=4, blobs=4)
+
+        for thread_id in ("thread-1", "thread-2"):
+            config = {"configurable": {"thread_id": thread_id}}
+            remaining = list(saver.list(config))
+            assert [c.metadata["step"] for c in remaining] == [4, 3, 0]
+            assert remaining[0].checkpoint["channel_values"] == {"messages": ["m"] * 5}
+            assert remaining[2].checkpoint["channel_values"] == {"messages": ["m"]}
+            assert len(remaining[2].pending_writes or []) == 1
+
+        # pruning is idempotent
+        assert saver.prune(policy) == PruneResult()
+        assert saver.prune(RetentionPolicy(ttl=timedelta(days=1))) == PruneResult()
+
+        with pytest.raises(ValueError):
+            RetentionPolicy(keep_metadata={"source": "input"})
+        with pytest.raises(ValueError):
+            RetentionPolicy(keep_last=0)
+
+
+def test_delete_threads_in_chunks() -> None:
+    with _database() as database:
+        uri = DEFAULT_BASE_URI + database
+        with PyOceanBaseSaver.from_conn_string(uri, delete_batch_size=2) as saver:
+            saver.setup()
+            saver.DELETE_THREADS_WINDOW = 2
+            for thread_id in ("thread-1", "thread-2", "thread-3"):
+                config: RunnableConfig = {
+                    "configurable": {"thread_id": thread_id, "checkpoint_ns": ""}
+                }
+                checkpoint = empty_checkpoint()
+                for step in range(5):
+                    checkpoint = create_checkpoint(checkpoint, {}, step)
+                    checkpoint["channel_values"] = {"messages": ["m"] * step}
+                    checkpoint["channel_versions"] = {"messages": step + 1}
+                    config = saver.put(
+                        config, checkpoint, {"step": step}, {"messages": step + 1}
+                    )
+                    saver.put_writes(config, [("messages", ["w"])], "task")
+
+            saver.delete_threads(["thread-1", "thread-3", "thread-1"])
+
+            remaining = list(saver.list(None))
+            assert {c.config["configurable"]["thread_id"] for c in remaining} == {
+                "thread-2"
+            }
+            assert len(remaining) == 5
+            with saver._cursor() as cur:
+                for table in ("checkpoint_blobs", "checkpoint_writes"):
+                    cur.execute(
+                        f"SELECT count(*) AS n FROM {table} WHERE thread_id != %s",
+                        ("thread-2",),
+                    )
+                    assert cur.fetchone() == {"n": 0}
+
+            saver.delete_thread("thread-2")
+            assert list(saver.list(None)) == []
+
+
+def test_partitions() -> None:
+    def partition_counts(saver: PyOceanBaseSaver) -> set[int]:
+        counts = set()
+        with saver._cursor() as cur:
+            for table in saver.PARTITIONED_TABLES:
+                cur.execute(saver.SELECT_PARTITION_COUNT_SQL, (table,))
+                row = cur.fetchone()
+                assert row
+                counts.add(row["n"])
+        return counts
+
+    with _database() as database:
+        uri = DEFAULT_BASE_URI + database
+        with PyOceanBaseSaver.from_conn_string(uri) as saver:
+            saver.setup()
+            assert partition_counts(saver) == {0}
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            checkpoint["channel_values"] = {"messages": ["m"]}
+            checkpoint["channel_versions"] = {"messages": 1}
+            config = saver.put(config, checkpoint, {"step": 0}, {"messages": 1})
+            saver.put_writes(config, [("messages", ["w"])], "task")
+            saved = saver.get_tuple(config)
+
+        with PyOceanBaseSaver.from_conn_string(uri, partitions=4) as partitioned_saver:
+            # setup only warns about existing tables
+            with pytest.warns(UserWarning, match="repartition"):
+                partitioned_saver.setup()
+            assert partition_counts(partitioned_saver) == {0}
+
+            # migrating an unpartitioned schema, then changing the partition count
+            tables = list(partitioned_saver.PARTITIONED_TABLES)
+            assert partitioned_saver.repartition() == tables
+            assert partition_counts(partitioned_saver) == {4}
+            assert partitioned_saver.repartition(2) == tables
+            assert partitioned_saver.repartition(2) == []
+            assert partition_counts(partitioned_saver) == {2}
+            assert partitioned_saver.get_tuple(config) == saved
+            with pytest.raises(ValueError):
+                partitioned_saver.repartition(0)
+
+    # tables created by setup are partitioned right away
+    with _database() as database:
+        with PyOceanBaseSaver.from_conn_string(
+            DEFAULT_BASE_URI + database, partitions=3
+        ) as saver:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                saver.setup()
+            assert partition_counts(saver) == {3}
+
+
+def test_checkpoint_cache() -> None:
+    with pytest.raises(ValueError):
+        CheckpointCache(consistency="eventual")
+    with pytest.raises(ValueError):
+        CheckpointCache(ttl=10)
+
+    # latest slots go with the entries they point to
+    cache = CheckpointCache(max_entries=2)
+    for thread in range(10):
+        row = {
+            "thread_id": f"thread-{thread}",
+            "checkpoint_ns": "",
+            "checkpoint_id": "1",
+            "parent_checkpoint_id": None,
+            "checkpoint": {},
+            "metadata": "{}",
+            "channel_values": [],
+            "pending_writes": [],
+        }
+        cache.add_row(row, latest=True)
+    assert len(cache._latest) == cache.stats().entries == 2
+    assert cache.get("thread-9", "") is not None
+    assert cache.get("thread-0", "") is None
+
+    cache = CheckpointCache(max_entries=2)
+    with _database() as database:
+        uri = DEFAULT_BASE_URI + database
+        with PyOceanBaseSaver.from_conn_string(uri, cache=cache) as saver:
+            saver.setup()
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            configs = []
+            for step in range(3):
+                checkpoint = create_checkpoint(checkpoint, {}, step)
+                checkpoint["channel_values"] = {"messages": ["m"] * step}
+                checkpoint["channel_versions"] = {"messages": step + 1}
+                config = saver.put(
+                    config, checkpoint, {"step": step}, {"messages": step + 1}
+                )
+                saver.put_writes(config, [("messages", ["w"])], "task")
+                configs.append(config)
+
+            stats = cache.stats()
+            assert stats.entries == 2
+            assert stats.evictions == 1
+            latest_config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+            cached = saver.get_tuple(latest_config)
+            assert cache.stats().hits == 1
+            assert cached
+            assert cached.config == configs[-1]
+            assert cached.pending_writes == [("task", "messages", ["w"])]
+
+            # the evicted checkpoint is read from the database, and cached
+            saved = saver.get_tuple(configs[0])
+            assert cache.stats().misses == 1
+            assert saved == saver.get_tuple(configs[0])
+            assert cache.stats().hits == 2
+
+            cache.clear()
+            assert saver.get_tuple(latest_config) == cached
+            assert cache.stats().hit_ratio == 0.5
+
+            saver.delete_thread("thread-1")
+            assert cache.stats().entries == 0
+            assert saver.get_tuple(latest_config) is None
+
+
+def test_concurrent_setup() -> None:
+    with _database() as database:
+        uri = DEFAULT_BASE_URI + database
+
+        def setup() -> None:
+            with PyOceanBaseSaver.from_conn_string(uri) as saver:
+                saver.setup()
+
+        with PyOceanBaseSaver.from_conn_string(uri) as saver:
+            with pytest.raises(RuntimeError):
+                saver.assert_schema_current()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for future in [executor.submit(setup) for _ in range(4)]:
+                future.result()
+
+        with PyOceanBaseSaver.from_conn_string(uri) as saver:
+            saver.assert_schema_current()
+            with saver._cursor() as cur:
+                cur.execute("SELECT v FROM checkpoint_migrations ORDER BY v")
+                assert [row["v"] for row in cur.fetchall()] == list(
+                    range(len(saver.MIGRATIONS))
+                )
+
+        # later savers trust the schema state of the process and query nothing
+        with PyOceanBaseSaver.from_conn_string(uri) as saver:
+            with saver._cursor() as cur:
+                cur.execute("DROP TABLE checkpoint_migrations")
+            saver.assert_schema_current()
+            saver.setup()
+
+        # a database recreated under the same name is migrated again once
+        # the schema state is forgotten
+        with pymysql.connect(
+            **PyOceanBaseSaver.parse_conn_string(DEFAULT_BASE_URI), autocommit=True
+        ) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(f"DROP DATABASE {database}")
+                cursor.execute(f"CREATE DATABASE {database}")
+        forget_schema_state()
+        setup()
+        with PyOceanBaseSaver.from_conn_string(uri) as saver:
+            saver.assert_schema_current()
+
+
+def test_indexed_metadata() -> None:
+    with pytest.raises(ValueError):
+        PyOceanBaseSaver(None, indexed_metadata=["run-id"])  # type: ignore[arg-type]
+
+    with _database() as database:
+        uri = DEFAULT_BASE_URI + database
+        with PyOceanBaseSaver.from_conn_string(
+            uri, indexed_metadata=["source", "step"]
+        ) as saver:
+            saver.setup()
+            saver.setup()
+            with saver._cursor() as cur:
+                cur.execute(saver.SELECT_METADATA_COLUMNS_SQL)
+                assert {row["name"] for row in cur.fetchall()} == {
+                    "metadata_source",
+                    "metadata_step",
+                }
+
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            for step, source in enumerate(["input", "loop", "loop", "input"]):
+                checkpoint = create_checkpoint(checkpoint, {}, step)
+                config = saver.put(
+                    config, checkpoint, {"source": source, "step": step}, {}
+                )
+            saver.put(
+                config,
+                create_checkpoint(checkpoint, {}, 4),
+                {"source": "loop", "step": "1"},
+                {},
+            )
+
+            def steps(filter: dict[str, Any]) -> list[Any]:
+                return [c.metadata["step"] for c in saver.list(None, filter=filter)]
+
+            where, args = saver._search_where(None, {"source": "input", "x": 1})
+            assert "metadata_source = %(metadata_source)s" in where
+            assert "metadata_x" not in where
+            assert steps({"source": "input"}) == [3, 0]
+            assert steps({"source": "loop", "step": 1}) == [1]
+            assert steps({"step": "1"}) == ["1"]
+            assert steps({"source": "loop", "step": {"a": 1}}) == []
+
+
+def test_instrumentation() -> None:
+    spans: list[Span] = []
+    aggregator = SpanAggregator()
+
+    def callback(span: Span) -> None:
+        spans.append(span)
+        aggregator(span)
+
+    with _database() as database:
+        with PyOceanBaseSaver.from_conn_string(
+            DEFAULT_BASE_URI + database, instrument=callback
+        ) as saver:
+            saver.setup()
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+            checkpoint = create_checkpoint(empty_checkpoint(), {"a": "x" * 100}, 1)
+            config = saver.put(config, checkpoint, {"step": 1}, {"a": "1"})
+            saver.put_writes(config, [("a", "y" * 100)], "task-1")
+            assert saver.get_tuple(config) is not None
+            assert len(list(saver.list(None))) == 1
+
+    assert [span.operation for span in spans] == [
+        "put",
+        "put_writes",
+        "get_tuple",
+        "list",
+    ]
+    put, put_writes, get_tuple, list_ = spans
+    assert put.statements["INSERT"] >= 2
+    assert put.payload_bytes > 200
+    assert put.serde_time > 0
+    assert put_writes.rows == 1
+    assert get_tuple.statements == {"SELECT": get_tuple.round_trips}
+    assert get_tuple.rows >= 1
+    assert get_tuple.payload_bytes > 200
+    assert list_.rows >= 1
+    assert all(span.error is None and span.duration > 0 for span in spans)
+
+    report = aggregator.report()
+    assert list(report) == ["get_tuple", "list", "put", "put_writes"]
+    assert report["put"].calls == 1
+    assert 0 < report["put"].p50_ms <= report["put"].p99_ms
+
+
+def test_upgrade_legacy_checkpoints() -> None:
+    with _database() as database:
+        uri = DEFAULT_BASE_URI + database
+        with PyOceanBaseSaver.from_conn_string(uri) as saver:
+            saver.setup()
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            for step in range(5):
+                checkpoint = create_checkpoint(checkpoint, {}, step)
+                # only version 3 checkpoints are bumped to version 4
+                checkpoint["v"] = 3 if step != 2 else 2
+                checkpoint["channel_values"] = {"messages": ["m"] * step}
+                checkpoint["channel_versions"] = {"messages": step + 1}
+                config = saver.put(
+                    config, checkpoint, {"step": step}, {"messages": step + 1}
+                )
+                saver.put_writes(config, [(TASKS, f"send-{step}")], "task")
+            expected = list(saver.list(None))
+
+            progress: list[UpgradeResult] = []
+            result = saver.upgrade_legacy_checkpoints(
+                batch_size=2, progress=progress.append
+            )
+            assert result == UpgradeResult(visited=5, upgraded=5, skipped=0)
+            assert [p.visited for p in progress] == [2, 4, 5]
+            assert saver.upgrade_legacy_checkpoints() == UpgradeResult(visited=5)
+
+        with PyOceanBaseSaver.from_conn_string(uri, legacy_checkpoints=False) as saver:
+            upgraded = list(saver.list(None))
+            assert [c.checkpoint["v"] for c in upgraded] == [4, 4, 2, 4, 4]
+            for before, after in zip(expected, upgraded):
+                assert after.checkpoint == {
+                    **before.checkpoint,
+                    "v": after.checkpoint["v"],
+                }
+            assert upgraded[0].checkpoint["channel_values"][TASKS] == ["send-3"]
+            assert saver.get_tuple(config) == upgraded[0]
+
+
+@pytest.mark.parametrize("executor_cls", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_decode_executor(executor_cls: type) -> None:
+    with _database() as database, executor_cls(max_workers=2) as executor:
+        uri = DEFAULT_BASE_URI + database
+        with (
+            PyOceanBaseSaver.from_conn_string(uri) as saver,
+            PyOceanBaseSaver.from_conn_string(
+                uri, decode_executor=executor
+            ) as parallel_saver,
+            PyOceanBaseSaver.from_conn_string(
+                uri, decode_executor=executor, stream_list=True
+            ) as stream_saver,
+        ):
+            saver.setup()
+            stream_saver.STREAM_FETCH_SIZE = 4
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            for step in range(10):
+                checkpoint = create_checkpoint(checkpoint, {}, step)
+                checkpoint["channel_values"] = {"messages": ["m"] * step}
+                checkpoint["channel_versions"] = {"messages": step + 1}
+                config = saver.put(
+                    config, checkpoint, {"step": step}, {"messages": step + 1}
+                )
+                saver.put_writes(config, [("messages", [step])], "task")
+
+            expected = list(saver.list(None))
+            assert [c.metadata["step"] for c in expected] == list(range(9, -1, -1))
+            assert list(parallel_saver.list(None)) == expected
+            assert list(parallel_saver.list(None, limit=3)) == expected[:3]
+            assert list(stream_saver.list(None)) == expected
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {
+            "channel_version_index": "read",
+            "checkpoint_heads": True,
+            "content_addressed_blobs": True,
+        },
+    ],
+)
+def test_copy_thread(options: dict[str, Any]) -> None:
+    with _database() as database:
+        with PyOceanBaseSaver.from_conn_string(
+            DEFAULT_BASE_URI + database, **options
+        ) as saver:
+            saver.setup()
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "source", "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            configs = []
+            for step in range(5):
+                checkpoint = create_checkpoint(checkpoint, {}, step)
+                checkpoint["channel_values"] = {"messages": ["m"] * (step + 1)}
+                checkpoint["channel_versions"] = {"messages": step + 1}
+                config = saver.put(
+                    config, checkpoint, {"step": step}, {"messages": step + 1}
+                )
+                saver.put_writes(config, [("messages", [step])], "task")
+                configs.append(config)
+
+            result = saver.copy_thread("source", "copy", batch_size=2)
+            assert result == CopyResult(checkpoints=5, writes=5, blobs=5)
+            source = list(saver.list({"configurable": {"thread_id": "source"}}))
+            copied = list(saver.list({"configurable": {"thread_id": "copy"}}))
+            assert [(c.checkpoint, c.metadata, c.pending_writes) for c in copied] == [
+                (c.checkpoint, c.metadata, c.pending_writes) for c in source
+            ]
+            assert all(c.config["configurable"]["thread_id"] == "copy" for c in copied)
+            # copying again only fills in missing rows
+            assert saver.copy_thread("source", "copy") == CopyResult(0, 0, 0)
+
+            up_to = configs[2]["configurable"]["checkpoint_id"]
+            result = saver.copy_thread("source", "fork", up_to_checkpoint_id=up_to)
+            assert result == CopyResult(checkpoints=3, writes=3, blobs=3)
+            forked = saver.get_tuple(
+                {"configurable": {"thread_id": "fork", "checkpoint_ns": ""}}
+            )
+            assert forked
+            assert forked.config["configurable"]["checkpoint_id"] == up_to
+            assert forked.checkpoint["channel_values"] == {"messages": ["m"] * 3}
+            assert forked.pending_writes == [("task", "messages", [2])]
+
+            with pytest.raises(ValueError):
+                saver.copy_thread("source", "source")
+
+
+@pytest.mark.parametrize("options", [{}, {"read_engine": "binary"}])
+def test_get_tuples(options: dict[str, Any]) -> None:
+    cache = CheckpointCache()
+    with _database() as database:
+        with PyOceanBaseSaver.from_conn_string(
+            DEFAULT_BASE_URI + database, cache=cache, **options
+        ) as saver:
+            saver.setup()
+            saver.GET_TUPLES_WINDOW = 2
+            configs: list[RunnableConfig] = []
+            for thread_id in ("thread-1", "thread-2", "thread-3"):
+                for checkpoint_ns in ("", "inner"):
+                    config: RunnableConfig = {
+                        "configurable": {
+                            "thread_id": thread_id,
+                            "checkpoint_ns": checkpoint_ns,
+                        }
+                    }
+                    checkpoint = empty_checkpoint()
+                    for step in range(3):
+                        checkpoint = create_checkpoint(checkpoint, {}, step)
+                        checkpoint["channel_values"] = {"messages": [thread_id] * step}
+                        checkpoint["channel_versions"] = {"messages": step + 1}
+                        config = saver.put(
+                            config, checkpoint, {"step": step}, {"messages": step + 1}
+                        )
+                        saver.put_writes(config, [("messages", [step])], "task")
+                        configs.append(config)
+
+            requested: list[RunnableConfig] = [
+                {"configurable": {"thread_id": "thread-2", "checkpoint_ns": "inner"}},
+                configs[0],
+                {"configurable": {"thread_id": "missing", "checkpoint_ns": ""}},
+                {"configurable": {"thread_id": "thread-1"}},
+                configs[13],
+                {"configurable": {"thread_id": "thread-3", "checkpoint_ns": ""}},
+                {"configurable": {"thread_id": "thread-1"}},
+            ]
+            expected = [saver.get_tuple(config) for config in requested]
+            assert expected[2] is None
+            assert expected[3] and expected[3].config == configs[2]
+            assert saver.get_tuples(requested) == expected
+            assert saver.get_tuples([]) == []
+
+            # served from the cache filled by the first call
+            cache.clear()
+            assert saver.get_tuples(requested) == expected
+            hits = cache.stats().hits
+            assert saver.get_tuples(requested) == expected
+            assert cache.stats().hits == hits + 5
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"read_engine": "binary"}, {"content_addressed_blobs": True}],
+)
+def test_blob_chunks(options: dict[str, Any]) -> None:
+    with _database() as database:
+        uri = DEFAULT_BASE_URI + database
+        with (
+            PyOceanBaseSaver.from_conn_string(
+                uri, blob_chunk_size=64, **options
+            ) as saver,
+            PyOceanBaseSaver.from_conn_string(uri) as plain_saver,
+            PyOceanBaseSaver.from_conn_string(uri, stream_list=True) as stream_saver,
+            PyOceanBaseSaver.from_conn_string(uri, lazy_load=True) as lazy_saver,
+        ):
+            saver.setup()
+            document = ["lorem ipsum"] * 100
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+            checkpoint = empty_checkpoint()
+            for step in range(3):
+                checkpoint = create_checkpoint(checkpoint, {}, step)
+                checkpoint["channel_values"] = {
+                    "document": document + [str(step)],
+                    "messages": ["hi"] * (step + 1),
+                }
+                checkpoint["channel_versions"] = {
+                    "document": step + 1,
+                    "messages": step + 1,
+                }
+                config = saver.put(
+                    config,
+                    checkpoint,
+                    {"step": step},
+                    {"document": step + 1, "messages": step + 1},
+                )
+                saver.put_writes(config, [("messages", ["w"])], "task")
+
+            with saver._cursor() as cur:
+                cur.execute("SELECT DISTINCT channel FROM checkpoint_blob_chunks")
+                # only the document is large enough to be chunked
+                assert [row["channel"] for row in cur.fetchall()] == ["document"]
+
+            latest = saver.get_tuple(config)
+            assert latest
+            assert latest.checkpoint["channel_values"] == {
+                "document": document + ["2"],
+                "messages": ["hi"] * 3,
+            }
+            thread: RunnableConfig = {"configurable": {"thread_id": "thread-1"}}
+            expected = list(saver.list(thread))
+            assert [c.metadata["step"] for c in expected] == [2, 1, 0]
+            for other in (plain_saver, stream_saver):
+                assert list(other.list(thread)) == expected
+            assert lazy_saver.get_tuple(config) == latest
+
+            assert saver.copy_thread("thread-1", "thread-2") == CopyResult(
+                checkpoints=3, writes=3, blobs=6
+            )
+            copied = list(saver.list({"configurable": {"thread_id": "thread-2"}}))
+            assert [c.checkpoint for c in copied] == [c.checkpoint for c in expected]
+
+            result = saver.prune(RetentionPolicy(keep_last=1))
+            assert result.blob_chunks > 0
+            assert saver.get_tuple(config) == latest
+            with saver._cursor() as cur:
+                cur.execute("DELETE FROM checkpoint_blob_chunks WHERE idx = 1")
+            with pytest.raises(ValueError, match="chunks"):
+                saver.get_tuple(config)
+            saver.delete_thread("thread-1")
+            saver.delete_thread("thread-2")
+            with saver._cursor() as cur:
+                cur.execute("SELECT count(*) AS n FROM checkpoint_blob_chunks")
+                assert cur.fetchone()["n"] == 0
+
+            with pytest.raises(ValueError):
+                PyOceanBaseSaver(saver.conn, blob_chunk_size=0)
+
+
+class Color(Enum):
+    RED = "red"
+
+
+def test_json_codec() -> None:
+    codec = orjson_codec()
+    for document in (
+        {"step": 1, "writes": None, "source": "loop", "parents": {}},
+        {"text": "caf\u00e9 \U0001f600", "nested": [1.5, True, {"k": [None]}]},
+        {1: "non-string key", "big": 2**70},
+    ):
+        assert codec.loads(codec.dumps(document)) == stdlib_codec().loads(
+            stdlib_codec().dumps(document)
+        )
+    assert math.isnan(codec.loads("[NaN]")[0])
+    # integers beyond 64 bits are read exactly, from text and bytes
+    for big in (2**70 + 1, -(2**63) - 1):
+        assert codec.loads(f'{{"a": {big}}}') == {"a": big}
+        assert codec.loads(f"[{big}]".encode()) == [big]
+    # NaN and infinities are written like json does, not as null
+    for value in ({"x": math.nan}, [math.inf, -math.inf]):
+        assert codec.dumps(value) == json.dumps(value)
+    # UUIDs and enums are rejected like json does, leaving them to the
+    # JsonPlus fallback of metadata
+    for unsupported in (uuid4(), Color.RED):
+        with pytest.raises(TypeError):
+            codec.dumps({"value": unsupported})
+        with pytest.raises(TypeError):
+            stdlib_codec().dumps({"value": unsupported})
+    # stores decode values with their own codec too
+    value = b'{"n": 18446744073709551616}'
+    store = PyOceanBaseStore(None, json_codec=stdlib_codec())  # type: ignore[arg-type]
+    assert store._load_value(value) == {"n": 2**64}
+
+    with _database() as database:
+        uri = DEFAULT_BASE_URI + database
+        with (
+            PyOceanBaseSaver.from_conn_string(uri) as saver,
+            PyOceanBaseSaver.from_conn_string(
+                uri, json_codec=stdlib_codec()
+            ) as stdlib_saver,
+        ):
+            saver.setup()
+            metadata = {"source": "input", "text": "caf\u00e9", "null": "\x00abc"}
+            configs = []
+            for writer in (saver, stdlib_saver):
+                config: RunnableConfig = {
+                    "configurable": {
+                        "thread_id": f"thread-{len(configs)}",
+                        "checkpoint_ns": "",
+                    }
+                }
+                checkpoint = empty_checkpoint()
+                checkpoint["channel_values"] = {"messages": ["hi"]}
+                checkpoint["channel_versions"] = {"messages": 1}
+                config = writer.put(config, checkpoint, metadata, {"messages": 1})
+                writer.put_writes(config, [("messages", ["w"])], "task")
+                configs.append(config)
+
+            # documents written by either codec read the same with both
+            for config in configs:
+                expected = stdlib_saver.get_tuple(config)
+                assert expected
+                assert expected.metadata["text"] == "caf\u00e9"
+                assert expected.metadata["null"] == "abc"
+                assert saver.get_tuple(config) == expected
+            filtered = list(saver.list(None, filter={"text": "caf\u00e9"}))
+            assert len(filtered) == 2
+
+
+@pytest.mark.parametrize("options", [{}, {"read_engine": "binary"}])
+def test_list_page(options: dict[str, Any]) -> None:
+    with _database() as database:
+        with PyOceanBaseSaver.from_conn_string(
+            DEFAULT_BASE_URI + database, **options
+        ) as saver:
+            saver.setup()
+            for thread_id in ("thread-1", "thread-2"):
+                for checkpoint_ns in ("", "inner"):
+                    config: RunnableConfig = {
+                        "configurable": {
+                            "thread_id": thread_id,
+                            "checkpoint_ns": checkpoint_ns,
+                        }
+                    }
+                    checkpoint = empty_checkpoint()
+                    for step in range(5):
+                        checkpoint = create_checkpoint(checkpoint, {}, step)
+                        checkpoint["channel_values"] = {"messages": ["m"] * step}
+                        checkpoint["channel_versions"] = {"messages": step + 1}
+                        source = "input" if step == 0 else "loop"
+                        config = saver.put(
+                            config,
+                            checkpoint,
+                            {"step": step, "source": source},
+                            {"messages": step + 1},
+                        )
+                        saver.put_writes(config, [("messages", [step])], "task")
+
+            def pages(config: RunnableConfig | None, **kwargs: Any) -> list[list]:
+                result: list[list] = []
+                cursor = None
+                while True:
+                    page = saver.list_page(config, cursor=cursor, **kwargs)
+                    result.append(list(page.checkpoints))
+                    if page.next_cursor is None:
+                        return result
+                    cursor = page.next_cursor
+
+            # a namespace reads like list, newest first
+            config = {"configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}}
+            paged = pages(config, limit=2)
+            assert [len(page) for page in paged] == [2, 2, 1]
+            assert sum(paged, []) == list(saver.list(config))
+
+            # a thread walks its namespaces one after the other
+            thread: RunnableConfig = {"configurable": {"thread_id": "thread-2"}}
+            listed = sum(pages(thread, limit=3), [])
+            assert len(listed) == 10
+            ids = [c.config["configurable"]["checkpoint_id"] for c in listed]
+            expected = [
+                c.config["configurable"]["checkpoint_id"] for c in saver.list(thread)
+            ]
+            assert sorted(ids) == sorted(expected)
+            for checkpoint_ns in ("", "inner"):
+                steps = [
+                    c.metadata["step"]
+                    for c in listed
+                    if c.config["configurable"]["checkpoint_ns"] == checkpoint_ns
+                ]
+                assert steps == [4, 3, 2, 1, 0]
+
+            # every thread, with a metadata filter
+            listed = sum(pages(None, limit=3, filter={"source": "loop"}), [])
+            assert len(listed) == 16
+            assert [c.config["configurable"]["thread_id"] for c in listed] == (
+                ["thread-2"] * 8 + ["thread-1"] * 8
+            )
+            assert listed[0].pending_writes == [("task", "messages", [4])]
+            assert saver.list_page(None, limit=16, filter={"source": "loop"}) == (
+                CheckpointPage(listed, None)
+            )
+
+            with pytest.raises(ValueError):
+                saver.list_page(None, limit=0)
+            with pytest.raises(ValueError):
+                saver.list_page(None, cursor="not a cursor")